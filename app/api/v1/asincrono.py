@@ -0,0 +1,87 @@
+"""
+Lecturas asíncronas (modo DB_ASYNC) para los routers de recursos
+"""
+import re
+from typing import Optional, Type
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Response
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.paginacion import DESCRIPCION_CURSOR, con_cursor
+from app.config import get_settings
+from app.database import Base, get_async_db
+from app.repositories.base_repository import AsyncBaseRepository
+from app.services.base_service import AsyncBaseService
+from app.services.catalogo import CacheCatalogo
+
+
+def _reemplazar_ruta(router: APIRouter, ruta: APIRoute, endpoint):
+    """
+    Registra `endpoint` con la misma ruta, nombre y esquema de respuesta que `ruta` y lo pone
+    en su lugar, para que el orden de las rutas (y con él la resolución de /{id}) no cambie
+    """
+    posicion = router.routes.index(ruta)
+    router.add_api_route(
+        ruta.path[len(router.prefix):],
+        endpoint,
+        response_model=ruta.response_model,
+        methods=["GET"],
+        name=ruta.name,
+        summary=ruta.summary,
+        dependencies=ruta.dependencies[len(router.dependencies):]
+    )
+    router.routes[posicion] = router.routes.pop()
+
+
+def usar_lectura_async(
+        router: APIRouter,
+        modelo: Type[Base],
+        esquema: Type[BaseModel],
+        no_encontrado: str,
+        cache: Optional[CacheCatalogo] = None
+):
+    """
+    Con DB_ASYNC=true sustituye GET / y GET /{id} del router por versiones async que esperan
+    a la base de datos en el event loop (asyncpg) en lugar de ocupar un hilo del threadpool.
+    Conservan ruta, parámetros, paginación por cursor y respuesta; las escrituras siguen
+    siendo síncronas porque dependen del índice de ocupación y de las validaciones de cada
+    servicio. En las tablas de catálogo se pasa la caché del servicio síncrono para que ambos
+    caminos la compartan. Debe llamarse al final del módulo del router, ya declaradas sus rutas.
+    """
+    if not get_settings().db_async:
+        return
+
+    def get_service(db: AsyncSession = Depends(get_async_db)) -> AsyncBaseService:
+        return AsyncBaseService(AsyncBaseRepository(modelo, db).con_esquema(esquema), cache)
+
+    rutas = {
+        ruta.path[len(router.prefix):]: ruta
+        for ruta in router.routes
+        if isinstance(ruta, APIRoute) and "GET" in ruta.methods
+    }
+    # La ruta de detalle es la única de la forma /{parámetro}; su nombre no siempre es la llave
+    ruta_detalle = next(ruta for sub, ruta in rutas.items() if re.fullmatch(r"/\{\w+\}", sub))
+    parametro = ruta_detalle.dependant.path_params[0].name
+
+    async def listar(
+        response: Response,
+        skip: int = Query(0, ge=0),
+        limit: int = Query(100, ge=1, le=100),
+        cursor: Optional[str] = Query(None, description=DESCRIPCION_CURSOR),
+        service: AsyncBaseService = Depends(get_service)
+    ):
+        return con_cursor(response, await service.get_all(skip=skip, limit=limit, cursor=cursor))
+
+    async def leer(
+        id: str = Path(..., alias=parametro),
+        service: AsyncBaseService = Depends(get_service)
+    ):
+        obj = await service.get(id)
+        if obj is None:
+            raise HTTPException(status_code=404, detail=no_encontrado)
+        return obj
+
+    _reemplazar_ruta(router, rutas["/"], listar)
+    _reemplazar_ruta(router, ruta_detalle, leer)
\ No newline at end of file
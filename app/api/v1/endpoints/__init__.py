@@ -1,7 +1,8 @@
 from fastapi import APIRouter
 
 from app.api.v1.endpoints import carreras, periodos, evaluaciones, materias, profesores, aulas, grupos, horarios, \
-    permisos, ventanas, solicitudes, grupos_examen, asignaciones_aulas, asignaciones_sinodales, auth, usuarios
+    permisos, ventanas, solicitudes, grupos_examen, asignaciones_aulas, asignaciones_sinodales, auth, usuarios, \
+    calendarizacion, cache, estadisticas, diagnostico, examenes, disponibilidad
 
 api_router = APIRouter()
 
@@ -20,4 +21,10 @@ api_router.include_router(ventanas.router)
 api_router.include_router(solicitudes.router)
 api_router.include_router(grupos_examen.router)
 api_router.include_router(asignaciones_aulas.router)
-api_router.include_router(asignaciones_sinodales.router)
\ No newline at end of file
+api_router.include_router(asignaciones_sinodales.router)
+api_router.include_router(examenes.router)
+api_router.include_router(calendarizacion.router)
+api_router.include_router(disponibilidad.router)
+api_router.include_router(cache.router)
+api_router.include_router(estadisticas.router)
+api_router.include_router(diagnostico.router)
\ No newline at end of file
@@ -1,26 +1,54 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
+from app.api.v1.asincrono import usar_lectura_async
+from app.api.v1.exportacion import registrar_exportacion
+from app.api.v1.lotes import registrar_lote
+from app.api.v1.paginacion import DESCRIPCION_CURSOR, con_cursor
 from app.database import get_db
+from app.models.AsignacionAula import AsignacionAula as AsignacionAulaModelo
 from app.repositories.AsignacionAulaRepository import AsignacionAulaRepository
-from app.schemas.AsignacionAulaSchema import AsignacionAula, AsignacionAulaCreate, AsignacionAulaUpdate
+from app.repositories.AulaRepository import AulaRepository
+from app.repositories.GrupoExamenRepository import GrupoExamenRepository
+from app.repositories.ProfesorRepository import ProfesorRepository
+from app.repositories.SolicitudRepository import SolicitudRepository
+from app.schemas.AsignacionAulaSchema import AsignacionAula, AsignacionAulaCreate, AsignacionAulaUpdate, \
+    ResultadoAsignacionAulas
 from app.services.AsignacionAulaService import AsignacionAulaService
+from app.services.AsignadorAulasService import AsignadorAulasService
+from app.services.ocupacion import ConflictoHorarioError
 
 router = APIRouter(prefix="/asignaciones-aulas", tags=["asignaciones-aulas"])
 
 
 def get_asignacion_aula_service(db: Session = Depends(get_db)) -> AsignacionAulaService:
-    repository = AsignacionAulaRepository(db)
+    repository = AsignacionAulaRepository(db).con_esquema(AsignacionAula)
     return AsignacionAulaService(repository)
 
 
+def get_asignador_aulas_service(db: Session = Depends(get_db)) -> AsignadorAulasService:
+    return AsignadorAulasService(
+        AsignacionAulaRepository(db),
+        SolicitudRepository(db),
+        GrupoExamenRepository(db),
+        AulaRepository(db),
+        ProfesorRepository(db)
+    )
+
+
+registrar_lote(router, get_asignacion_aula_service, AsignacionAulaCreate, AsignacionAulaUpdate, "id_examen_aula")
+registrar_exportacion(router, AsignacionAulaModelo, AsignacionAula)
+
+
 @router.get("/", response_model=List[AsignacionAula])
 def read_asignaciones_aulas(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description=DESCRIPCION_CURSOR),
     service: AsignacionAulaService = Depends(get_asignacion_aula_service)
 ):
-    return service.get_all(skip=skip, limit=limit)
+    return con_cursor(response, service.get_all(skip=skip, limit=limit, cursor=cursor))
 
 
 @router.get("/{id_examen_aula}", response_model=AsignacionAula)
@@ -63,7 +91,26 @@ def create_asignacion_aula(
     asignacion: AsignacionAulaCreate,
     service: AsignacionAulaService = Depends(get_asignacion_aula_service)
 ):
-    return service.create(asignacion)
+    try:
+        return service.create(asignacion)
+    except ConflictoHorarioError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.post("/resolver/periodo/{id_periodo}", response_model=ResultadoAsignacionAulas)
+def resolver_asignaciones_aulas(
+    id_periodo: str,
+    aplicar: bool = Query(False, description="Guardar las asignaciones calculadas"),
+    service: AsignadorAulasService = Depends(get_asignador_aulas_service)
+):
+    """
+    Asigna aula(s) y aplicador a cada solicitud aprobada del periodo que aún no tiene aula,
+    respetando la capacidad de las aulas y sin choques de horario
+    """
+    try:
+        return service.asignar(id_periodo, aplicar=aplicar)
+    except ConflictoHorarioError as e:
+        raise HTTPException(status_code=409, detail=str(e))
 
 
 @router.put("/{id_examen_aula}", response_model=AsignacionAula)
@@ -72,7 +119,10 @@ def update_asignacion_aula(
     asignacion_update: AsignacionAulaUpdate,
     service: AsignacionAulaService = Depends(get_asignacion_aula_service)
 ):
-    asignacion = service.update(id_examen_aula, asignacion_update)
+    try:
+        asignacion = service.update(id_examen_aula, asignacion_update)
+    except ConflictoHorarioError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     if asignacion is None:
         raise HTTPException(status_code=404, detail="Asignación de aula no encontrada")
     return asignacion
@@ -86,4 +136,7 @@ def delete_asignacion_aula(
     asignacion = service.delete(id_examen_aula)
     if asignacion is None:
         raise HTTPException(status_code=404, detail="Asignación de aula no encontrada")
-    return asignacion
\ No newline at end of file
+    return asignacion
+
+
+usar_lectura_async(router, AsignacionAulaModelo, AsignacionAula, "Asignación de aula no encontrada")
\ No newline at end of file
@@ -1,26 +1,52 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
+from app.api.v1.asincrono import usar_lectura_async
+from app.api.v1.exportacion import registrar_exportacion
+from app.api.v1.lotes import registrar_lote
+from app.api.v1.paginacion import DESCRIPCION_CURSOR, con_cursor
 from app.database import get_db
+from app.models.AsignacionSinodal import AsignacionSinodal as AsignacionSinodalModelo
 from app.repositories.AsignacionSinodalRepository import AsignacionSinodalRepository
-from app.schemas.AsignacionSinodalSchema import AsignacionSinodal, AsignacionSinodalCreate, AsignacionSinodalUpdate
+from app.repositories.PermisoRepository import PermisoRepository
+from app.repositories.ProfesorRepository import ProfesorRepository
+from app.repositories.SolicitudRepository import SolicitudRepository
+from app.schemas.AsignacionSinodalSchema import AsignacionSinodal, AsignacionSinodalCreate, AsignacionSinodalUpdate, \
+    ResultadoAsignacionSinodales
 from app.services.AsignacionSinodalService import AsignacionSinodalService
+from app.services.AsignadorSinodalesService import AsignadorSinodalesService
+from app.services.ocupacion import ConflictoHorarioError
 
 router = APIRouter(prefix="/asignaciones-sinodales", tags=["asignaciones-sinodales"])
 
 
 def get_asignacion_sinodal_service(db: Session = Depends(get_db)) -> AsignacionSinodalService:
-    repository = AsignacionSinodalRepository(db)
+    repository = AsignacionSinodalRepository(db).con_esquema(AsignacionSinodal)
     return AsignacionSinodalService(repository)
 
 
+def get_asignador_sinodales_service(db: Session = Depends(get_db)) -> AsignadorSinodalesService:
+    return AsignadorSinodalesService(
+        AsignacionSinodalRepository(db),
+        SolicitudRepository(db),
+        PermisoRepository(db),
+        ProfesorRepository(db)
+    )
+
+
+registrar_lote(router, get_asignacion_sinodal_service, AsignacionSinodalCreate, AsignacionSinodalUpdate, "id_examen_sinodal")
+registrar_exportacion(router, AsignacionSinodalModelo, AsignacionSinodal)
+
+
 @router.get("/", response_model=List[AsignacionSinodal])
 def read_asignaciones_sinodales(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description=DESCRIPCION_CURSOR),
     service: AsignacionSinodalService = Depends(get_asignacion_sinodal_service)
 ):
-    return service.get_all(skip=skip, limit=limit)
+    return con_cursor(response, service.get_all(skip=skip, limit=limit, cursor=cursor))
 
 
 @router.get("/{id_examen_sinodal}", response_model=AsignacionSinodal)
@@ -55,7 +81,33 @@ def create_asignacion_sinodal(
     asignacion: AsignacionSinodalCreate,
     service: AsignacionSinodalService = Depends(get_asignacion_sinodal_service)
 ):
-    return service.create(asignacion)
+    try:
+        return service.create(asignacion)
+    except ConflictoHorarioError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.post("/resolver/periodo/{id_periodo}", response_model=ResultadoAsignacionSinodales)
+def resolver_asignaciones_sinodales(
+    id_periodo: str,
+    sinodales_por_examen: int = Query(2, ge=1, le=5, description="Sinodales requeridos por examen"),
+    max_por_profesor: Optional[int] = Query(None, ge=1, description="Máximo de comisiones por profesor en el periodo"),
+    aplicar: bool = Query(False, description="Guardar las asignaciones calculadas"),
+    service: AsignadorSinodalesService = Depends(get_asignador_sinodales_service)
+):
+    """
+    Completa los sinodales de cada solicitud aprobada del periodo con profesores que tienen
+    permiso en la materia y están libres en el horario del examen
+    """
+    try:
+        return service.asignar(
+            id_periodo,
+            sinodales_por_examen=sinodales_por_examen,
+            max_por_profesor=max_por_profesor,
+            aplicar=aplicar
+        )
+    except ConflictoHorarioError as e:
+        raise HTTPException(status_code=409, detail=str(e))
 
 
 @router.put("/{id_examen_sinodal}", response_model=AsignacionSinodal)
@@ -64,7 +116,10 @@ def update_asignacion_sinodal(
     asignacion_update: AsignacionSinodalUpdate,
     service: AsignacionSinodalService = Depends(get_asignacion_sinodal_service)
 ):
-    asignacion = service.update(id_examen_sinodal, asignacion_update)
+    try:
+        asignacion = service.update(id_examen_sinodal, asignacion_update)
+    except ConflictoHorarioError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     if asignacion is None:
         raise HTTPException(status_code=404, detail="Asignación de sinodal no encontrada")
     return asignacion
@@ -78,4 +133,7 @@ def delete_asignacion_sinodal(
     asignacion = service.delete(id_examen_sinodal)
     if asignacion is None:
         raise HTTPException(status_code=404, detail="Asignación de sinodal no encontrada")
-    return asignacion
\ No newline at end of file
+    return asignacion
+
+
+usar_lectura_async(router, AsignacionSinodalModelo, AsignacionSinodal, "Asignación de sinodal no encontrada")
\ No newline at end of file
@@ -1,8 +1,15 @@
+from datetime import date, time
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
+from app.api.v1.asincrono import usar_lectura_async
+from app.api.v1.exportacion import registrar_exportacion
+from app.api.v1.lotes import registrar_lote
+from app.api.v1.paginacion import DESCRIPCION_CURSOR, con_cursor
 from app.database import get_db
+from app.models.Aula import Aula as AulaModelo
 from app.repositories.AulaRepository import AulaRepository
+from app.repositories.VentanaRepository import VentanaRepository
 from app.schemas.AulaSchema import Aula, AulaCreate, AulaUpdate
 from app.services.AulaService import AulaService
 
@@ -11,26 +18,57 @@ router = APIRouter(prefix="/aulas", tags=["aulas"])
 
 def get_aula_service(db: Session = Depends(get_db)) -> AulaService:
     repository = AulaRepository(db)
-    return AulaService(repository)
+    return AulaService(repository, VentanaRepository(db))
+
+
+registrar_lote(router, get_aula_service, AulaCreate, AulaUpdate, "id_aula")
+registrar_exportacion(router, AulaModelo, Aula)
 
 
 @router.get("/", response_model=List[Aula])
 def read_aulas(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description=DESCRIPCION_CURSOR),
     service: AulaService = Depends(get_aula_service)
 ):
-    return service.get_all(skip=skip, limit=limit)
+    return con_cursor(response, service.get_all(skip=skip, limit=limit, cursor=cursor))
 
 
 @router.get("/disponibles", response_model=List[Aula])
 def read_aulas_disponibles(
+    response: Response,
     capacidad_minima: Optional[int] = Query(None, ge=1),
+    fecha: Optional[date] = Query(None, description="Con hora_inicio y hora_fin: solo aulas libres en ese horario"),
+    hora_inicio: Optional[time] = Query(None),
+    hora_fin: Optional[time] = Query(None),
+    periodo: Optional[str] = Query(None, description="Periodo cuyas clases se revisan (por omisión, el de la ventana "
+                                                     "de aplicación que incluye la fecha)"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description=DESCRIPCION_CURSOR),
     service: AulaService = Depends(get_aula_service)
 ):
-    return service.get_disponibles(capacidad_minima, skip=skip, limit=limit)
+    """
+    Aulas habilitadas con al menos capacidad_minima lugares
+    Con fecha, hora_inicio y hora_fin solo se incluyen las que no tienen clase ni examen en ese horario,
+    ordenadas de la capacidad más ajustada a la más holgada (sin cursor; se pagina con skip y limit)
+    """
+    horario = (fecha, hora_inicio, hora_fin)
+    if all(valor is None for valor in horario):
+        return con_cursor(response, service.get_disponibles(capacidad_minima, skip=skip, limit=limit, cursor=cursor))
+    if any(valor is None for valor in horario):
+        raise HTTPException(status_code=400, detail="fecha, hora_inicio y hora_fin se indican juntas")
+    if cursor:
+        raise HTTPException(status_code=400, detail="La búsqueda por horario se pagina con skip y limit")
+    try:
+        aulas = service.get_libres(fecha, hora_inicio, hora_fin, capacidad_minima, periodo, skip=skip, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if aulas is None:
+        raise HTTPException(status_code=404, detail="Periodo no encontrado")
+    return aulas
 
 
 @router.get("/{id_aula}", response_model=Aula)
@@ -72,4 +110,7 @@ def delete_aula(
     aula = service.delete(id_aula)
     if aula is None:
         raise HTTPException(status_code=404, detail="Aula no encontrada")
-    return aula
\ No newline at end of file
+    return aula
+
+
+usar_lectura_async(router, AulaModelo, Aula, "Aula no encontrada", cache=AulaService.cache)
\ No newline at end of file
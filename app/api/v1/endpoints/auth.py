@@ -1,6 +1,8 @@
+import logging
 from datetime import datetime, timedelta
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
@@ -8,12 +10,14 @@ from sqlalchemy.orm import Session
 from app.database import get_db
 from app.repositories.UsuarioRepository import UsuarioRepository
 from app.schemas.UsuarioSchema import UsuarioLogin, TokenResponse, UsuarioResponse
-from app.services.UsuarioService import UsuarioService
+from app.services import ultimo_login
+from app.services.UsuarioService import UsuarioService, version_autorizacion
 from app.config import get_settings
 
 router = APIRouter(prefix="/auth", tags=["autenticación"])
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
 # Configuración JWT
 SECRET_KEY = settings.secret_key
@@ -46,6 +50,11 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
 def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> UsuarioResponse:
     """
     Obtiene el usuario actual desde el token JWT
+
+    El usuario sale de la caché de usuarios autenticados, así que normalmente no se consulta
+    la base de datos. El token se rechaza si su claim "ver" ya no coincide con el rol, la
+    carrera o el estado actual del usuario (p. ej. lo desactivaron después del login).
+    Los tokens anteriores, sin "ver", se siguen aceptando hasta que venzan.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -62,34 +71,36 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
         raise credentials_exception
     
     service = get_usuario_service(db)
-    usuario = service.get(username)
+    usuario = service.get_autenticado(username)
     if usuario is None:
         raise credentials_exception
+    if "ver" in payload and payload["ver"] != version_autorizacion(usuario):
+        raise credentials_exception
     
-    return UsuarioResponse.model_validate(usuario)
+    return usuario
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(
+async def login(
     login_data: UsuarioLogin,
     service: UsuarioService = Depends(get_usuario_service)
 ):
     """
     Endpoint de login que autentica al usuario y retorna un token JWT
+
+    Se busca al usuario una sola vez, bcrypt corre en su pool acotado y last_login se anota en
+    el buffer de escritura diferida, así que el login no abre una transacción de escritura
     """
     try:
-        # Verificar primero si el usuario existe
-        usuario_temp = service.repository.get_by_username_or_id(login_data.user)
-        if not usuario_temp:
+        usuario = await run_in_threadpool(service.repository.get_by_username_or_id, login_data.user)
+        if not usuario:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Usuario no encontrado",
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
-        usuario = service.authenticate_user(login_data.user, login_data.password)
-        
-        if not usuario:
+        if not await service.verificar_credenciales(usuario, login_data.password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Usuario o contraseña incorrectos",
@@ -99,20 +110,22 @@ def login(
         # Crear token de acceso
         access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = create_access_token(
-            data={"sub": usuario.id_usuario, "rol": usuario.rol},
+            data=service.claims_token(usuario),
             expires_delta=access_token_expires
         )
         
+        # La fecha de último login se guarda por lotes en segundo plano
+        ahora = datetime.utcnow()
+        ultimo_login.registrar(usuario.id_usuario, ahora)
+        
         # Preparar respuesta del usuario (sin contraseña)
-        user_response = UsuarioResponse.from_orm(usuario)
+        user_response = UsuarioResponse.model_validate(usuario).model_copy(update={"last_login": ahora})
         
         return TokenResponse(token=access_token, user=user_response)
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error en login: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error en login")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error interno del servidor: {str(e)}"
@@ -0,0 +1,25 @@
+from typing import List
+
+from fastapi import APIRouter
+
+from app.schemas.CacheSchema import EstadisticasCache
+from app.services import catalogo
+
+router = APIRouter(prefix="/cache", tags=["cache"])
+
+
+@router.get("/catalogos", response_model=List[EstadisticasCache])
+def read_estadisticas_catalogos():
+    """
+    Aciertos, fallos y tamaño de la caché de cada tabla de catálogo en este proceso
+    """
+    return catalogo.estadisticas()
+
+
+@router.delete("/catalogos", response_model=List[EstadisticasCache])
+def invalidar_catalogos():
+    """
+    Vacía las cachés de catálogo de este proceso (p. ej. tras editar la base de datos a mano)
+    """
+    catalogo.invalidar_todo()
+    return catalogo.estadisticas()
\ No newline at end of file
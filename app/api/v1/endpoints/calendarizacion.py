@@ -0,0 +1,37 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from app.database import get_db
+from app.repositories.GrupoExamenRepository import GrupoExamenRepository
+from app.repositories.HorarioRepository import HorarioRepository
+from app.repositories.SolicitudRepository import SolicitudRepository
+from app.repositories.VentanaRepository import VentanaRepository
+from app.schemas.CalendarizacionSchema import ResultadoCalendarizacion
+from app.services.CalendarizacionService import CalendarizacionService
+
+router = APIRouter(prefix="/calendarizacion", tags=["calendarizacion"])
+
+
+def get_calendarizacion_service(db: Session = Depends(get_db)) -> CalendarizacionService:
+    return CalendarizacionService(
+        SolicitudRepository(db),
+        GrupoExamenRepository(db),
+        HorarioRepository(db),
+        VentanaRepository(db)
+    )
+
+
+@router.post("/periodo/{id_periodo}/evaluacion/{id_evaluacion}", response_model=ResultadoCalendarizacion)
+def calendarizar_solicitudes(
+        id_periodo: str,
+        id_evaluacion: str,
+        aplicar: bool = Query(False, description="Guardar las propuestas en las solicitudes"),
+        service: CalendarizacionService = Depends(get_calendarizacion_service)
+):
+    """
+    Propone fecha y horario sin choques de grupos para las solicitudes pendientes
+    Las solicitudes editadas manualmente no se mueven
+    """
+    try:
+        return service.calendarizar(id_periodo, id_evaluacion, aplicar=aplicar)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
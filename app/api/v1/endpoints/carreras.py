@@ -1,7 +1,12 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
+from app.api.v1.asincrono import usar_lectura_async
+from app.api.v1.exportacion import registrar_exportacion
+from app.api.v1.lotes import registrar_lote
+from app.api.v1.paginacion import DESCRIPCION_CURSOR, con_cursor
 from app.database import get_db
+from app.models.Carrera import Carrera as CarreraModelo
 from app.repositories.CarreraRepository import CarreraRepository
 from app.schemas.CarreraSchema import Carrera, CarreraCreate, CarreraUpdate
 from app.services.CarreraService import CarreraService
@@ -14,13 +19,19 @@ def get_carrera_service(db: Session = Depends(get_db)) -> CarreraService:
     return CarreraService(repository)
 
 
+registrar_lote(router, get_carrera_service, CarreraCreate, CarreraUpdate, "id_carrera")
+registrar_exportacion(router, CarreraModelo, Carrera)
+
+
 @router.get("/", response_model=List[Carrera])
 def read_carreras(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description=DESCRIPCION_CURSOR),
     service: CarreraService = Depends(get_carrera_service)
 ):
-    return service.get_all(skip=skip, limit=limit)
+    return con_cursor(response, service.get_all(skip=skip, limit=limit, cursor=cursor))
 
 
 @router.get("/{id_carrera}", response_model=Carrera)
@@ -71,9 +82,14 @@ def delete_carrera(
 
 @router.get("/search/", response_model=List[Carrera])
 def search_carreras(
+    response: Response,
     nombre: str = Query(..., min_length=1),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description=DESCRIPCION_CURSOR),
     service: CarreraService = Depends(get_carrera_service)
 ):
-    return service.search_by_nombre(nombre, skip=skip, limit=limit)
\ No newline at end of file
+    return con_cursor(response, service.search_by_nombre(nombre, skip=skip, limit=limit, cursor=cursor))
+
+
+usar_lectura_async(router, CarreraModelo, Carrera, "Carrera no encontrada", cache=CarreraService.cache)
\ No newline at end of file
@@ -0,0 +1,26 @@
+from typing import List
+
+from fastapi import APIRouter
+
+from app import instrumentacion
+from app.schemas.DiagnosticoSchema import ResumenRuta
+
+router = APIRouter(prefix="/diagnostico", tags=["diagnostico"])
+
+
+@router.get("/sql", response_model=List[ResumenRuta])
+def read_resumen_sql():
+    """
+    Sentencias SQL y tiempos por ruta en las últimas peticiones de este proceso, empezando por
+    las rutas que más sentencias acumulan
+    """
+    return instrumentacion.resumen.resumen()
+
+
+@router.delete("/sql", response_model=List[ResumenRuta])
+def reiniciar_resumen_sql():
+    """
+    Borra el resumen de este proceso (p. ej. para medir de nuevo tras un cambio)
+    """
+    instrumentacion.resumen.reiniciar()
+    return instrumentacion.resumen.resumen()
\ No newline at end of file
@@ -0,0 +1,39 @@
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from app.database import get_db
+from app.repositories.GrupoRepository import GrupoRepository
+from app.repositories.VentanaRepository import VentanaRepository
+from app.schemas.DisponibilidadSchema import Disponibilidad
+from app.services.DisponibilidadService import MAX_GRUPOS_DISPONIBILIDAD, DisponibilidadService
+
+router = APIRouter(prefix="/disponibilidad", tags=["disponibilidad"])
+
+
+def get_disponibilidad_service(db: Session = Depends(get_db)) -> DisponibilidadService:
+    return DisponibilidadService(GrupoRepository(db), VentanaRepository(db))
+
+
+@router.get("/", response_model=Disponibilidad)
+def read_disponibilidad(
+        grupos: List[str] = Query(..., description="Ids de grupo, repitiendo el parámetro o separados por comas"),
+        ventana: str = Query(..., description="Ventana de aplicación donde buscar"),
+        duracion: int = Query(120, ge=1, le=24 * 60, description="Minutos que debe durar la franja libre"),
+        service: DisponibilidadService = Depends(get_disponibilidad_service)
+):
+    """
+    Franjas de la ventana en que ninguno de los grupos tiene clase ni otro examen, por fecha
+    Solo se consideran los días hábiles dentro de la jornada de exámenes
+    """
+    id_grupos = [id_grupo.strip() for valor in grupos for id_grupo in valor.split(",") if id_grupo.strip()]
+    if not id_grupos:
+        raise HTTPException(status_code=400, detail="Se requiere al menos un grupo")
+    if len(id_grupos) > MAX_GRUPOS_DISPONIBILIDAD:
+        raise HTTPException(status_code=400, detail=f"Se admiten a lo más {MAX_GRUPOS_DISPONIBILIDAD} grupos")
+    try:
+        disponibilidad = service.buscar(id_grupos, ventana, duracion)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    if disponibilidad is None:
+        raise HTTPException(status_code=404, detail="Ventana no encontrada")
+    return disponibilidad
\ No newline at end of file
@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from app.config import get_settings
+from app.database import get_db_reportes
+from app.repositories.EstadisticaRepository import EstadisticaRepository
+from app.repositories.PeriodoRepository import PeriodoRepository
+from app.schemas.EstadisticaSchema import EstadisticasPeriodo
+from app.services.EstadisticaService import EstadisticaService
+from app.services.PeriodoService import PeriodoService
+
+router = APIRouter(prefix="/estadisticas", tags=["estadisticas"])
+
+
+def get_estadistica_service(db: Session = Depends(get_db_reportes)) -> EstadisticaService:
+    return EstadisticaService(
+        EstadisticaRepository(db, materializadas=get_settings().estadisticas_materializadas),
+        PeriodoService(PeriodoRepository(db))
+    )
+
+
+@router.get("/periodo/{id_periodo}", response_model=EstadisticasPeriodo)
+def read_estadisticas_periodo(
+        id_periodo: str,
+        service: EstadisticaService = Depends(get_estadistica_service)
+):
+    """
+    Solicitudes por estado, carrera y tipo de evaluación, uso de aulas y carga de sinodales
+    del periodo, calculados con consultas agregadas
+    """
+    estadisticas = service.get_periodo(id_periodo)
+    if estadisticas is None:
+        raise HTTPException(status_code=404, detail="Periodo no encontrado")
+    return estadisticas
\ No newline at end of file
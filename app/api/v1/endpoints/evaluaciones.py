@@ -1,7 +1,12 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
+from app.api.v1.asincrono import usar_lectura_async
+from app.api.v1.exportacion import registrar_exportacion
+from app.api.v1.lotes import registrar_lote
+from app.api.v1.paginacion import DESCRIPCION_CURSOR, con_cursor
 from app.database import get_db
+from app.models.TipoEvaluacion import TipoEvaluacion as TipoEvaluacionModelo
 from app.repositories.EvaluacionRepository import EvaluacionRepository
 from app.schemas.TipoEvaluacionSchema import TipoEvaluacion, TipoEvaluacionCreate, TipoEvaluacionUpdate
 from app.services.EvaluacionService import EvaluacionService
@@ -14,13 +19,19 @@ def get_evaluacion_service(db: Session = Depends(get_db)) -> EvaluacionService:
     return EvaluacionService(repository)
 
 
+registrar_lote(router, get_evaluacion_service, TipoEvaluacionCreate, TipoEvaluacionUpdate, "id_evaluacion")
+registrar_exportacion(router, TipoEvaluacionModelo, TipoEvaluacion)
+
+
 @router.get("/", response_model=List[TipoEvaluacion])
 def read_evaluaciones(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description=DESCRIPCION_CURSOR),
     service: EvaluacionService = Depends(get_evaluacion_service)
 ):
-    return service.get_all(skip=skip, limit=limit)
+    return con_cursor(response, service.get_all(skip=skip, limit=limit, cursor=cursor))
 
 
 @router.get("/{id_evaluacion}", response_model=TipoEvaluacion)
@@ -62,4 +73,7 @@ def delete_evaluacion(
     evaluacion = service.delete(id_evaluacion)
     if evaluacion is None:
         raise HTTPException(status_code=404, detail="Tipo de evaluación no encontrado")
-    return evaluacion
\ No newline at end of file
+    return evaluacion
+
+
+usar_lectura_async(router, TipoEvaluacionModelo, TipoEvaluacion, "Tipo de evaluación no encontrado", cache=EvaluacionService.cache)
\ No newline at end of file
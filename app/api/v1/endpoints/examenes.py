@@ -0,0 +1,70 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.api.v1.paginacion import DESCRIPCION_CURSOR, con_cursor
+from app.database import get_db
+from app.repositories.AsignacionAulaRepository import AsignacionAulaRepository
+from app.repositories.AsignacionSinodalRepository import AsignacionSinodalRepository
+from app.repositories.ExamenRepository import ExamenRepository
+from app.repositories.GrupoExamenRepository import GrupoExamenRepository
+from app.repositories.SolicitudRepository import SolicitudRepository
+from app.schemas.ExamenSchema import Examen, ExamenCreate, ExamenDetalle
+from app.services.ExamenService import ExamenInvalidoError, ExamenService
+
+router = APIRouter(prefix="/examenes", tags=["examenes"])
+
+
+def get_examen_service(db: Session = Depends(get_db)) -> ExamenService:
+    return ExamenService(
+        ExamenRepository(db),
+        SolicitudRepository(db),
+        GrupoExamenRepository(db),
+        AsignacionAulaRepository(db),
+        AsignacionSinodalRepository(db)
+    )
+
+
+@router.get("/", response_model=List[ExamenDetalle])
+def read_examenes(
+        response: Response,
+        periodo: Optional[str] = Query(None, description="Solo los exámenes de este periodo"),
+        skip: int = Query(0, ge=0),
+        limit: int = Query(100, ge=1, le=100),
+        cursor: Optional[str] = Query(None, description=DESCRIPCION_CURSOR),
+        service: ExamenService = Depends(get_examen_service)
+):
+    """
+    Exámenes con sus grupos, aulas, aplicadores y sinodales ya expandidos
+    La página completa se arma con cuatro consultas sin importar su tamaño
+    """
+    return con_cursor(response, service.get_all(periodo, skip=skip, limit=limit, cursor=cursor))
+
+
+@router.get("/{id_horario}", response_model=ExamenDetalle)
+def read_examen(
+        id_horario: str,
+        service: ExamenService = Depends(get_examen_service)
+):
+    examen = service.get(id_horario)
+    if examen is None:
+        raise HTTPException(status_code=404, detail="Examen no encontrado")
+    return examen
+
+
+@router.post("/", response_model=Examen)
+def create_examen(
+        examen: ExamenCreate,
+        service: ExamenService = Depends(get_examen_service)
+):
+    """
+    Crea la solicitud con sus grupos, aulas y sinodales en una sola transacción
+    Responde 422 si algún elemento es inválido y 409 si hay choques de horario; en ambos casos
+    `detail` trae un mensaje por elemento y no se guarda nada
+    """
+    try:
+        return service.create(examen)
+    except ExamenInvalidoError as e:
+        raise HTTPException(status_code=409 if e.conflicto else 422, detail=e.errores)
+    except IntegrityError as e:
+        raise HTTPException(status_code=409, detail=f"La base de datos rechazó el examen: {e.orig}")
\ No newline at end of file
@@ -1,7 +1,12 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
+from app.api.v1.asincrono import usar_lectura_async
+from app.api.v1.exportacion import registrar_exportacion
+from app.api.v1.lotes import registrar_lote
+from app.api.v1.paginacion import DESCRIPCION_CURSOR, con_cursor
 from app.database import get_db
+from app.models.GrupoEscolar import GrupoEscolar as GrupoEscolarModelo
 from app.repositories.GrupoRepository import GrupoRepository
 from app.schemas.GrupoEscolarSchema import GrupoEscolar, GrupoEscolarCreate, GrupoEscolarUpdate
 from app.services.GrupoService import GrupoService
@@ -10,17 +15,23 @@ router = APIRouter(prefix="/grupos", tags=["grupos"])
 
 
 def get_grupo_service(db: Session = Depends(get_db)) -> GrupoService:
-    repository = GrupoRepository(db)
+    repository = GrupoRepository(db).con_esquema(GrupoEscolar)
     return GrupoService(repository)
 
 
+registrar_lote(router, get_grupo_service, GrupoEscolarCreate, GrupoEscolarUpdate, "id_grupo")
+registrar_exportacion(router, GrupoEscolarModelo, GrupoEscolar)
+
+
 @router.get("/", response_model=List[GrupoEscolar])
 def read_grupos(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description=DESCRIPCION_CURSOR),
     service: GrupoService = Depends(get_grupo_service)
 ):
-    return service.get_all(skip=skip, limit=limit)
+    return con_cursor(response, service.get_all(skip=skip, limit=limit, cursor=cursor))
 
 
 @router.get("/{id_grupo}", response_model=GrupoEscolar)
@@ -48,11 +59,13 @@ def read_grupo_completo(
 @router.get("/carrera/{id_carrera}", response_model=List[GrupoEscolar])
 def read_grupos_por_carrera(
     id_carrera: str,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description=DESCRIPCION_CURSOR),
     service: GrupoService = Depends(get_grupo_service)
 ):
-    return service.get_by_carrera(id_carrera, skip=skip, limit=limit)
+    return con_cursor(response, service.get_by_carrera(id_carrera, skip=skip, limit=limit, cursor=cursor))
 
 
 @router.post("/", response_model=GrupoEscolar)
@@ -83,4 +96,7 @@ def delete_grupo(
     grupo = service.delete(id_grupo)
     if grupo is None:
         raise HTTPException(status_code=404, detail="Grupo no encontrado")
-    return grupo
\ No newline at end of file
+    return grupo
+
+
+usar_lectura_async(router, GrupoEscolarModelo, GrupoEscolar, "Grupo no encontrado")
\ No newline at end of file
@@ -1,26 +1,38 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
+from app.api.v1.asincrono import usar_lectura_async
+from app.api.v1.exportacion import registrar_exportacion
+from app.api.v1.lotes import registrar_lote
+from app.api.v1.paginacion import DESCRIPCION_CURSOR, con_cursor
 from app.database import get_db
+from app.models.GrupoExamen import GrupoExamen as GrupoExamenModelo
 from app.repositories.GrupoExamenRepository import GrupoExamenRepository
 from app.schemas.GrupoExamenSchema import GrupoExamen, GrupoExamenCreate, GrupoExamenUpdate
 from app.services.GrupoExamenService import GrupoExamenService
+from app.services.ocupacion import ConflictoHorarioError
 
 router = APIRouter(prefix="/grupos-examen", tags=["grupos-examen"])
 
 
 def get_grupo_examen_service(db: Session = Depends(get_db)) -> GrupoExamenService:
-    repository = GrupoExamenRepository(db)
+    repository = GrupoExamenRepository(db).con_esquema(GrupoExamen)
     return GrupoExamenService(repository)
 
 
+registrar_lote(router, get_grupo_examen_service, GrupoExamenCreate, GrupoExamenUpdate, "id_examen_grupo")
+registrar_exportacion(router, GrupoExamenModelo, GrupoExamen)
+
+
 @router.get("/", response_model=List[GrupoExamen])
 def read_grupos_examen(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description=DESCRIPCION_CURSOR),
     service: GrupoExamenService = Depends(get_grupo_examen_service)
 ):
-    return service.get_all(skip=skip, limit=limit)
+    return con_cursor(response, service.get_all(skip=skip, limit=limit, cursor=cursor))
 
 
 @router.get("/{id_examen_grupo}", response_model=GrupoExamen)
@@ -55,7 +67,10 @@ def create_grupo_examen(
     grupo: GrupoExamenCreate,
     service: GrupoExamenService = Depends(get_grupo_examen_service)
 ):
-    return service.create(grupo)
+    try:
+        return service.create(grupo)
+    except ConflictoHorarioError as e:
+        raise HTTPException(status_code=409, detail=str(e))
 
 
 @router.put("/{id_examen_grupo}", response_model=GrupoExamen)
@@ -64,7 +79,10 @@ def update_grupo_examen(
     grupo_update: GrupoExamenUpdate,
     service: GrupoExamenService = Depends(get_grupo_examen_service)
 ):
-    grupo = service.update(id_examen_grupo, grupo_update)
+    try:
+        grupo = service.update(id_examen_grupo, grupo_update)
+    except ConflictoHorarioError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     if grupo is None:
         raise HTTPException(status_code=404, detail="Grupo de examen no encontrado")
     return grupo
@@ -78,4 +96,7 @@ def delete_grupo_examen(
     grupo = service.delete(id_examen_grupo)
     if grupo is None:
         raise HTTPException(status_code=404, detail="Grupo de examen no encontrado")
-    return grupo
\ No newline at end of file
+    return grupo
+
+
+usar_lectura_async(router, GrupoExamenModelo, GrupoExamen, "Grupo de examen no encontrado")
\ No newline at end of file
@@ -1,26 +1,63 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
+import io
+from typing import List, Optional
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from app.api.v1.asincrono import usar_lectura_async
+from app.api.v1.exportacion import registrar_exportacion
+from app.api.v1.lotes import DESCRIPCION_PARCIAL, registrar_lote
+from app.api.v1.paginacion import DESCRIPCION_CURSOR, con_cursor
 from app.database import get_db
+from app.models.HorarioClase import HorarioClase as HorarioClaseModelo
 from app.repositories.HorarioRepository import HorarioRepository
 from app.schemas.HorarioClaseSchema import HorarioClase, HorarioClaseCreate, HorarioClaseUpdate
+from app.schemas.ImportacionSchema import ResultadoImportacion
 from app.services.HorarioService import HorarioService
+from app.services.ocupacion import ConflictoHorarioError
 
 router = APIRouter(prefix="/horarios", tags=["horarios"])
 
 
 def get_horario_service(db: Session = Depends(get_db)) -> HorarioService:
-    repository = HorarioRepository(db)
+    repository = HorarioRepository(db).con_esquema(HorarioClase)
     return HorarioService(repository)
 
 
+registrar_lote(router, get_horario_service, HorarioClaseCreate, HorarioClaseUpdate, "id_horario_clase")
+registrar_exportacion(router, HorarioClaseModelo, HorarioClase)
+
+
+@router.post("/import", response_model=ResultadoImportacion)
+def import_horarios(
+    response: Response,
+    archivo: UploadFile = File(..., description="CSV con las columnas de GET /horarios/export"),
+    parcial: bool = Query(False, description=DESCRIPCION_PARCIAL),
+    service: HorarioService = Depends(get_horario_service)
+):
+    # El archivo ya está en disco (o en memoria si es chico); se lee como texto conforme se valida
+    texto = io.TextIOWrapper(archivo.file, encoding="utf-8-sig", newline="")
+    try:
+        resultado = service.importar_csv(texto, parcial=parcial)
+    except IntegrityError as e:
+        raise HTTPException(status_code=409, detail=f"La base de datos rechazó la importación: {e.orig}")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        texto.detach()
+    if not resultado.aplicado:
+        response.status_code = 422
+    return resultado
+
+
 @router.get("/", response_model=List[HorarioClase])
 def read_horarios(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description=DESCRIPCION_CURSOR),
     service: HorarioService = Depends(get_horario_service)
 ):
-    return service.get_all(skip=skip, limit=limit)
+    return con_cursor(response, service.get_all(skip=skip, limit=limit, cursor=cursor))
 
 
 @router.get("/{id_horario}", response_model=HorarioClase)
@@ -48,21 +85,25 @@ def read_horario_completo(
 @router.get("/profesor/{id_profesor}", response_model=List[HorarioClase])
 def read_horarios_por_profesor(
     id_profesor: str,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description=DESCRIPCION_CURSOR),
     service: HorarioService = Depends(get_horario_service)
 ):
-    return service.get_by_profesor(id_profesor, skip=skip, limit=limit)
+    return con_cursor(response, service.get_by_profesor(id_profesor, skip=skip, limit=limit, cursor=cursor))
 
 
 @router.get("/grupo/{id_grupo}", response_model=List[HorarioClase])
 def read_horarios_por_grupo(
     id_grupo: str,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description=DESCRIPCION_CURSOR),
     service: HorarioService = Depends(get_horario_service)
 ):
-    return service.get_by_grupo(id_grupo, skip=skip, limit=limit)
+    return con_cursor(response, service.get_by_grupo(id_grupo, skip=skip, limit=limit, cursor=cursor))
 
 
 @router.post("/", response_model=HorarioClase)
@@ -70,7 +111,10 @@ def create_horario(
     horario: HorarioClaseCreate,
     service: HorarioService = Depends(get_horario_service)
 ):
-    return service.create(horario)
+    try:
+        return service.create(horario)
+    except ConflictoHorarioError as e:
+        raise HTTPException(status_code=409, detail=str(e))
 
 
 @router.put("/{id_horario}", response_model=HorarioClase)
@@ -79,7 +123,10 @@ def update_horario(
     horario_update: HorarioClaseUpdate,
     service: HorarioService = Depends(get_horario_service)
 ):
-    horario = service.update(id_horario, horario_update)
+    try:
+        horario = service.update(id_horario, horario_update)
+    except ConflictoHorarioError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     if horario is None:
         raise HTTPException(status_code=404, detail="Horario no encontrado")
     return horario
@@ -93,4 +140,7 @@ def delete_horario(
     horario = service.delete(id_horario)
     if horario is None:
         raise HTTPException(status_code=404, detail="Horario no encontrado")
-    return horario
\ No newline at end of file
+    return horario
+
+
+usar_lectura_async(router, HorarioClaseModelo, HorarioClase, "Horario no encontrado")
\ No newline at end of file
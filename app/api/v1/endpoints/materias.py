@@ -1,7 +1,12 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
+from app.api.v1.asincrono import usar_lectura_async
+from app.api.v1.exportacion import registrar_exportacion
+from app.api.v1.lotes import registrar_lote
+from app.api.v1.paginacion import DESCRIPCION_CURSOR, con_cursor
 from app.database import get_db
+from app.models.Materia import Materia as MateriaModelo
 from app.repositories.MateriaRepository import MateriaRepository
 from app.schemas.MateriaSchema import Materia, MateriaCreate, MateriaUpdate
 from app.services.MateriaService import MateriaService
@@ -14,13 +19,19 @@ def get_materia_service(db: Session = Depends(get_db)) -> MateriaService:
     return MateriaService(repository)
 
 
+registrar_lote(router, get_materia_service, MateriaCreate, MateriaUpdate, "id_materia")
+registrar_exportacion(router, MateriaModelo, Materia)
+
+
 @router.get("/", response_model=List[Materia])
 def read_materias(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description=DESCRIPCION_CURSOR),
     service: MateriaService = Depends(get_materia_service)
 ):
-    return service.get_all(skip=skip, limit=limit)
+    return con_cursor(response, service.get_all(skip=skip, limit=limit, cursor=cursor))
 
 
 @router.get("/{id_materia}", response_model=Materia)
@@ -62,4 +73,7 @@ def delete_materia(
     materia = service.delete(id_materia)
     if materia is None:
         raise HTTPException(status_code=404, detail="Materia no encontrada")
-    return materia
\ No newline at end of file
+    return materia
+
+
+usar_lectura_async(router, MateriaModelo, Materia, "Materia no encontrada", cache=MateriaService.cache)
\ No newline at end of file
@@ -1,7 +1,12 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
+from app.api.v1.asincrono import usar_lectura_async
+from app.api.v1.exportacion import registrar_exportacion
+from app.api.v1.lotes import registrar_lote
+from app.api.v1.paginacion import DESCRIPCION_CURSOR, con_cursor
 from app.database import get_db
+from app.models.PeriodoAcademico import PeriodoAcademico as PeriodoAcademicoModelo
 from app.repositories.PeriodoRepository import PeriodoRepository
 from app.schemas.PeriodoAcademicoSchema import PeriodoAcademico, PeriodoAcademicoCreate, PeriodoAcademicoUpdate
 from app.services.PeriodoService import PeriodoService
@@ -14,13 +19,19 @@ def get_periodo_service(db: Session = Depends(get_db)) -> PeriodoService:
     return PeriodoService(repository)
 
 
+registrar_lote(router, get_periodo_service, PeriodoAcademicoCreate, PeriodoAcademicoUpdate, "id_periodo")
+registrar_exportacion(router, PeriodoAcademicoModelo, PeriodoAcademico)
+
+
 @router.get("/", response_model=List[PeriodoAcademico])
 def read_periodos(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description=DESCRIPCION_CURSOR),
     service: PeriodoService = Depends(get_periodo_service)
 ):
-    return service.get_all(skip=skip, limit=limit)
+    return con_cursor(response, service.get_all(skip=skip, limit=limit, cursor=cursor))
 
 
 @router.get("/{id_periodo}", response_model=PeriodoAcademico)
@@ -62,4 +73,7 @@ def delete_periodo(
     periodo = service.delete(id_periodo)
     if periodo is None:
         raise HTTPException(status_code=404, detail="Periodo no encontrado")
-    return periodo
\ No newline at end of file
+    return periodo
+
+
+usar_lectura_async(router, PeriodoAcademicoModelo, PeriodoAcademico, "Periodo no encontrado", cache=PeriodoService.cache)
\ No newline at end of file
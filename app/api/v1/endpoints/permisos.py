@@ -1,7 +1,12 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
+from app.api.v1.asincrono import usar_lectura_async
+from app.api.v1.exportacion import registrar_exportacion
+from app.api.v1.lotes import registrar_lote
+from app.api.v1.paginacion import DESCRIPCION_CURSOR, con_cursor
 from app.database import get_db
+from app.models.PermisoSinodal import PermisoSinodal as PermisoSinodalModelo
 from app.repositories.PermisoRepository import PermisoRepository
 from app.schemas.PermisoSinodalSchema import PermisoSinodal, PermisoSinodalCreate, PermisoSinodalUpdate
 from app.services.PermisoService import PermisoService
@@ -10,17 +15,23 @@ router = APIRouter(prefix="/permisos", tags=["permisos"])
 
 
 def get_permiso_service(db: Session = Depends(get_db)) -> PermisoService:
-    repository = PermisoRepository(db)
+    repository = PermisoRepository(db).con_esquema(PermisoSinodal)
     return PermisoService(repository)
 
 
+registrar_lote(router, get_permiso_service, PermisoSinodalCreate, PermisoSinodalUpdate, "id_regla")
+registrar_exportacion(router, PermisoSinodalModelo, PermisoSinodal)
+
+
 @router.get("/", response_model=List[PermisoSinodal])
 def read_permisos(
+        response: Response,
         skip: int = Query(0, ge=0),
         limit: int = Query(100, ge=1, le=100),
+        cursor: Optional[str] = Query(None, description=DESCRIPCION_CURSOR),
         service: PermisoService = Depends(get_permiso_service)
 ):
-    return service.get_all(skip=skip, limit=limit)
+    return con_cursor(response, service.get_all(skip=skip, limit=limit, cursor=cursor))
 
 
 @router.get("/{id_regla}", response_model=PermisoSinodal)
@@ -82,4 +93,7 @@ def delete_permiso(
     permiso = service.delete(id_regla)
     if permiso is None:
         raise HTTPException(status_code=404, detail="Permiso no encontrado")
-    return permiso
\ No newline at end of file
+    return permiso
+
+
+usar_lectura_async(router, PermisoSinodalModelo, PermisoSinodal, "Permiso no encontrado")
\ No newline at end of file
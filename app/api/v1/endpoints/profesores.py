@@ -1,9 +1,17 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from datetime import date
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
+from app.api.v1.asincrono import usar_lectura_async
+from app.api.v1.exportacion import registrar_exportacion
+from app.api.v1.lotes import registrar_lote
+from app.api.v1.paginacion import DESCRIPCION_CURSOR, con_cursor
 from app.database import get_db
+from app.models.Profesor import Profesor as ProfesorModelo
 from app.repositories.ProfesorRepository import ProfesorRepository
+from app.schemas.AgendaSchema import Agenda
 from app.schemas.ProfesorSchema import Profesor, ProfesorCreate, ProfesorUpdate
+from app.services.AgendaService import AgendaService
 from app.services.ProfesorService import ProfesorService
 
 router = APIRouter(prefix="/profesores", tags=["profesores"])
@@ -14,22 +22,34 @@ def get_profesor_service(db: Session = Depends(get_db)) -> ProfesorService:
     return ProfesorService(repository)
 
 
+def get_agenda_service(db: Session = Depends(get_db)) -> AgendaService:
+    return AgendaService(ProfesorRepository(db))
+
+
+registrar_lote(router, get_profesor_service, ProfesorCreate, ProfesorUpdate, "id_profesor")
+registrar_exportacion(router, ProfesorModelo, Profesor)
+
+
 @router.get("/", response_model=List[Profesor])
 def read_profesores(
+        response: Response,
         skip: int = Query(0, ge=0),
         limit: int = Query(100, ge=1, le=100),
+        cursor: Optional[str] = Query(None, description=DESCRIPCION_CURSOR),
         service: ProfesorService = Depends(get_profesor_service)
 ):
-    return service.get_all(skip=skip, limit=limit)
+    return con_cursor(response, service.get_all(skip=skip, limit=limit, cursor=cursor))
 
 
 @router.get("/activos", response_model=List[Profesor])
 def read_profesores_activos(
+        response: Response,
         skip: int = Query(0, ge=0),
         limit: int = Query(100, ge=1, le=100),
+        cursor: Optional[str] = Query(None, description=DESCRIPCION_CURSOR),
         service: ProfesorService = Depends(get_profesor_service)
 ):
-    return service.get_activos(skip=skip, limit=limit)
+    return con_cursor(response, service.get_activos(skip=skip, limit=limit, cursor=cursor))
 
 
 @router.get("/{id_profesor}", response_model=Profesor)
@@ -43,6 +63,27 @@ def read_profesor(
     return profesor
 
 
+@router.get("/{id_profesor}/agenda", response_model=Agenda)
+def read_agenda_profesor(
+        id_profesor: str,
+        desde: date = Query(..., description="Primera fecha (inclusive)"),
+        hasta: date = Query(..., description="Última fecha (inclusive)"),
+        periodo: Optional[str] = Query(None, description="Tomar solo las clases de este periodo"),
+        service: AgendaService = Depends(get_agenda_service)
+):
+    """
+    Clases, aplicaciones de examen y sinodalías del profesor en orden cronológico
+    Las clases semanales se repiten en cada fecha del rango que cae en su día
+    """
+    try:
+        agenda = service.get_agenda(id_profesor, desde, hasta, periodo)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if agenda is None:
+        raise HTTPException(status_code=404, detail="Profesor no encontrado")
+    return agenda
+
+
 @router.post("/", response_model=Profesor)
 def create_profesor(
         profesor: ProfesorCreate,
@@ -71,4 +112,7 @@ def delete_profesor(
     profesor = service.delete(id_profesor)
     if profesor is None:
         raise HTTPException(status_code=404, detail="Profesor no encontrado")
-    return profesor
\ No newline at end of file
+    return profesor
+
+
+usar_lectura_async(router, ProfesorModelo, Profesor, "Profesor no encontrado", cache=ProfesorService.cache)
\ No newline at end of file
@@ -1,8 +1,13 @@
-from typing import List
+from typing import List, Optional
 from datetime import date
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
+from app.api.v1.asincrono import usar_lectura_async
+from app.api.v1.exportacion import registrar_exportacion
+from app.api.v1.lotes import registrar_lote
+from app.api.v1.paginacion import DESCRIPCION_CURSOR, con_cursor
 from app.database import get_db
+from app.models.SolicitudExamen import SolicitudExamen as SolicitudExamenModelo
 from app.repositories.SolicitudRepository import SolicitudRepository
 from app.schemas.EstadoSolicitudSchema import EstadoSolicitud
 from app.schemas.SolicitudExamenSchema import SolicitudExamen, SolicitudExamenCreate, SolicitudExamenUpdate
@@ -12,17 +17,23 @@ router = APIRouter(prefix="/solicitudes", tags=["solicitudes"])
 
 
 def get_solicitud_service(db: Session = Depends(get_db)) -> SolicitudService:
-    repository = SolicitudRepository(db)
+    repository = SolicitudRepository(db).con_esquema(SolicitudExamen)
     return SolicitudService(repository)
 
 
+registrar_lote(router, get_solicitud_service, SolicitudExamenCreate, SolicitudExamenUpdate, "id_horario")
+registrar_exportacion(router, SolicitudExamenModelo, SolicitudExamen)
+
+
 @router.get("/", response_model=List[SolicitudExamen])
 def read_solicitudes(
+        response: Response,
         skip: int = Query(0, ge=0),
         limit: int = Query(100, ge=1, le=100),
+        cursor: Optional[str] = Query(None, description=DESCRIPCION_CURSOR),
         service: SolicitudService = Depends(get_solicitud_service)
 ):
-    return service.get_all(skip=skip, limit=limit)
+    return con_cursor(response, service.get_all(skip=skip, limit=limit, cursor=cursor))
 
 
 @router.get("/{id_horario}", response_model=SolicitudExamen)
@@ -39,31 +50,37 @@ def read_solicitud(
 @router.get("/estado/{estado}", response_model=List[SolicitudExamen])
 def read_solicitudes_por_estado(
         estado: EstadoSolicitud,
+        response: Response,
         skip: int = Query(0, ge=0),
         limit: int = Query(100, ge=1, le=100),
+        cursor: Optional[str] = Query(None, description=DESCRIPCION_CURSOR),
         service: SolicitudService = Depends(get_solicitud_service)
 ):
-    return service.get_by_estado(estado, skip=skip, limit=limit)
+    return con_cursor(response, service.get_by_estado(estado, skip=skip, limit=limit, cursor=cursor))
 
 
 @router.get("/fecha/{fecha}", response_model=List[SolicitudExamen])
 def read_solicitudes_por_fecha(
         fecha: date,
+        response: Response,
         skip: int = Query(0, ge=0),
         limit: int = Query(100, ge=1, le=100),
+        cursor: Optional[str] = Query(None, description=DESCRIPCION_CURSOR),
         service: SolicitudService = Depends(get_solicitud_service)
 ):
-    return service.get_by_fecha(fecha, skip=skip, limit=limit)
+    return con_cursor(response, service.get_by_fecha(fecha, skip=skip, limit=limit, cursor=cursor))
 
 
 @router.get("/periodo/{id_periodo}", response_model=List[SolicitudExamen])
 def read_solicitudes_por_periodo(
         id_periodo: str,
+        response: Response,
         skip: int = Query(0, ge=0),
         limit: int = Query(100, ge=1, le=100),
+        cursor: Optional[str] = Query(None, description=DESCRIPCION_CURSOR),
         service: SolicitudService = Depends(get_solicitud_service)
 ):
-    return service.get_by_periodo(id_periodo, skip=skip, limit=limit)
+    return con_cursor(response, service.get_by_periodo(id_periodo, skip=skip, limit=limit, cursor=cursor))
 
 
 @router.post("/", response_model=SolicitudExamen)
@@ -102,12 +119,11 @@ def aprobar_solicitud(
         id_horario: str,
         service: SolicitudService = Depends(get_solicitud_service)
 ):
-    solicitud = service.get(id_horario)
+    update_data = SolicitudExamenUpdate(estado=EstadoSolicitud.APROBADO, motivo_rechazo=None)
+    solicitud = service.update(id_horario, update_data)
     if solicitud is None:
         raise HTTPException(status_code=404, detail="Solicitud no encontrada")
-
-    update_data = SolicitudExamenUpdate(estado=EstadoSolicitud.APROBADO, motivo_rechazo=None)
-    return service.update(id_horario, update_data)
+    return solicitud
 
 
 @router.post("/{id_horario}/rechazar", response_model=SolicitudExamen)
@@ -116,9 +132,11 @@ def rechazar_solicitud(
         motivo: str = Query(..., description="Motivo del rechazo"),
         service: SolicitudService = Depends(get_solicitud_service)
 ):
-    solicitud = service.get(id_horario)
+    update_data = SolicitudExamenUpdate(estado=EstadoSolicitud.RECHAZADO, motivo_rechazo=motivo)
+    solicitud = service.update(id_horario, update_data)
     if solicitud is None:
         raise HTTPException(status_code=404, detail="Solicitud no encontrada")
+    return solicitud
 
-    update_data = SolicitudExamenUpdate(estado=EstadoSolicitud.RECHAZADO, motivo_rechazo=motivo)
-    return service.update(id_horario, update_data)
\ No newline at end of file
+
+usar_lectura_async(router, SolicitudExamenModelo, SolicitudExamen, "Solicitud no encontrada")
\ No newline at end of file
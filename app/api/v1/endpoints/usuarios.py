@@ -1,8 +1,13 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
+from app.api.v1.asincrono import usar_lectura_async
+from app.api.v1.exportacion import registrar_exportacion
+from app.api.v1.lotes import registrar_lote
+from app.api.v1.paginacion import DESCRIPCION_CURSOR, con_cursor
 from app.database import get_db
+from app.models.Usuario import Usuario as UsuarioModelo
 from app.repositories.UsuarioRepository import UsuarioRepository
 from app.schemas.UsuarioSchema import Usuario, UsuarioCreate, UsuarioUpdate, UsuarioResponse
 from app.services.UsuarioService import UsuarioService
@@ -15,13 +20,19 @@ def get_usuario_service(db: Session = Depends(get_db)) -> UsuarioService:
     return UsuarioService(repository)
 
 
+registrar_lote(router, get_usuario_service, UsuarioCreate, UsuarioUpdate, "id_usuario")
+registrar_exportacion(router, UsuarioModelo, UsuarioResponse)
+
+
 @router.get("/", response_model=List[UsuarioResponse])
 def read_usuarios(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description=DESCRIPCION_CURSOR),
     service: UsuarioService = Depends(get_usuario_service)
 ):
-    usuarios = service.get_all(skip=skip, limit=limit)
+    usuarios = con_cursor(response, service.get_all(skip=skip, limit=limit, cursor=cursor))
     return [UsuarioResponse.model_validate(u) for u in usuarios]
 
 
@@ -74,9 +85,14 @@ def delete_usuario(
 @router.get("/rol/{rol}", response_model=List[UsuarioResponse])
 def get_usuarios_by_rol(
     rol: str,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description=DESCRIPCION_CURSOR),
     service: UsuarioService = Depends(get_usuario_service)
 ):
-    usuarios = service.get_by_rol(rol, skip=skip, limit=limit)
+    usuarios = con_cursor(response, service.get_by_rol(rol, skip=skip, limit=limit, cursor=cursor))
     return [UsuarioResponse.model_validate(u) for u in usuarios]
+
+
+usar_lectura_async(router, UsuarioModelo, UsuarioResponse, "Usuario no encontrado")
\ No newline at end of file
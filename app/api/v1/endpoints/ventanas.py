@@ -1,7 +1,12 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
+from app.api.v1.asincrono import usar_lectura_async
+from app.api.v1.exportacion import registrar_exportacion
+from app.api.v1.lotes import registrar_lote
+from app.api.v1.paginacion import DESCRIPCION_CURSOR, con_cursor
 from app.database import get_db
+from app.models.VentanaAplicacion import VentanaAplicacion as VentanaAplicacionModelo
 from app.repositories.VentanaRepository import VentanaRepository
 from app.schemas.VentanaAplicacionSchema import VentanaAplicacion, VentanaAplicacionCreate, VentanaAplicacionUpdate
 from app.services.VentanaService import VentanaService
@@ -10,17 +15,23 @@ router = APIRouter(prefix="/ventanas", tags=["ventanas"])
 
 
 def get_ventana_service(db: Session = Depends(get_db)) -> VentanaService:
-    repository = VentanaRepository(db)
+    repository = VentanaRepository(db).con_esquema(VentanaAplicacion)
     return VentanaService(repository)
 
 
+registrar_lote(router, get_ventana_service, VentanaAplicacionCreate, VentanaAplicacionUpdate, "id_ventana")
+registrar_exportacion(router, VentanaAplicacionModelo, VentanaAplicacion)
+
+
 @router.get("/", response_model=List[VentanaAplicacion])
 def read_ventanas(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description=DESCRIPCION_CURSOR),
     service: VentanaService = Depends(get_ventana_service)
 ):
-    return service.get_all(skip=skip, limit=limit)
+    return con_cursor(response, service.get_all(skip=skip, limit=limit, cursor=cursor))
 
 
 @router.get("/{id_ventana}", response_model=VentanaAplicacion)
@@ -74,4 +85,7 @@ def delete_ventana(
     ventana = service.delete(id_ventana)
     if ventana is None:
         raise HTTPException(status_code=404, detail="Ventana no encontrada")
-    return ventana
\ No newline at end of file
+    return ventana
+
+
+usar_lectura_async(router, VentanaAplicacionModelo, VentanaAplicacion, "Ventana no encontrada")
\ No newline at end of file
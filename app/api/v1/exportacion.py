@@ -0,0 +1,98 @@
+"""
+Exportación completa de una tabla en NDJSON o CSV (GET /export) para los routers de recursos
+"""
+import csv
+import io
+import json
+from datetime import date, datetime, time
+from typing import Any, Dict, Iterable, List, Literal, Sequence, Type
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app.database import Base, get_db_reportes
+from app.repositories.base_repository import BaseRepository
+
+TAMANO_LOTE_EXPORTACION = 1000
+
+TIPOS_CONTENIDO = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+
+def _texto(valor: Any) -> Any:
+    if isinstance(valor, (date, time)):
+        return valor.isoformat()
+    return valor
+
+
+def _ndjson(columnas: Sequence[str], lotes: Iterable[Sequence[Sequence[Any]]]) -> Iterable[str]:
+    for lote in lotes:
+        yield "".join(
+            json.dumps({columna: _texto(valor) for columna, valor in zip(columnas, fila)}, ensure_ascii=False) + "\n"
+            for fila in lote
+        )
+
+
+def _csv(columnas: Sequence[str], lotes: Iterable[Sequence[Sequence[Any]]]) -> Iterable[str]:
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    escritor.writerow(columnas)
+    for lote in lotes:
+        escritor.writerows([_texto(valor) for valor in fila] for fila in lote)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _convertir(columna, valor: str) -> Any:
+    tipo = columna.type.python_type
+    if tipo is bool:
+        if valor.lower() not in ("true", "false", "1", "0"):
+            raise ValueError(valor)
+        return valor.lower() in ("true", "1")
+    if tipo in (date, time, datetime):
+        return tipo.fromisoformat(valor)
+    return tipo(valor)
+
+
+def registrar_exportacion(router: APIRouter, modelo: Type[Base], esquema: Type[BaseModel]):
+    """
+    Agrega GET /export al router. Entrega todas las filas de la tabla (solo las columnas del
+    esquema de respuesta, así que nunca sale la contraseña de un usuario) en NDJSON o CSV,
+    leyendo con un cursor del lado del servidor en lotes de TAMANO_LOTE_EXPORTACION y
+    escribiendo cada lote en la respuesta conforme llega: la memoria no depende del número
+    de filas. Cualquier otro parámetro de la consulta con el nombre de una columna filtra
+    por igualdad (p. ej. ?id_periodo=2024-1). Usa el pool de reportes.
+    Debe llamarse antes de declarar las rutas /{id} para que "export" no se tome como id.
+    """
+    tabla = modelo.__table__
+    columnas: List[str] = [nombre for nombre in esquema.model_fields if nombre in tabla.c]
+    nombre = router.prefix.strip("/").replace("-", "_")
+
+    @router.get("/export", response_class=StreamingResponse, name=f"export_{nombre}")
+    def exportar(
+        request: Request,
+        formato: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+        db: Session = Depends(get_db_reportes)
+    ):
+        filtros: Dict[str, Any] = {}
+        for parametro, valor in request.query_params.items():
+            if parametro == "format":
+                continue
+            if parametro not in columnas:
+                raise HTTPException(status_code=400, detail=f"No se puede filtrar por {parametro}")
+            try:
+                filtros[parametro] = _convertir(tabla.c[parametro], valor)
+            except ValueError:
+                raise HTTPException(status_code=400, detail=f"Valor inválido para {parametro}: {valor}")
+
+        lotes = BaseRepository(modelo, db).stream(columnas, filtros, TAMANO_LOTE_EXPORTACION)
+        cuerpo = _csv(columnas, lotes) if formato == "csv" else _ndjson(columnas, lotes)
+        return StreamingResponse(
+            cuerpo,
+            media_type=TIPOS_CONTENIDO[formato],
+            headers={"Content-Disposition": f'attachment; filename="{nombre}.{formato}"'}
+        )
\ No newline at end of file
@@ -0,0 +1,66 @@
+"""
+Endpoints por lotes (POST, PATCH y DELETE /bulk) comunes a los routers de recursos
+"""
+from typing import Callable, List, Type
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response
+from pydantic import BaseModel
+from sqlalchemy.exc import IntegrityError
+
+from app.schemas.LoteSchema import MAX_FILAS_LOTE, EliminacionLote, ResultadoLote, esquema_actualizacion_lote
+
+DESCRIPCION_PARCIAL = "Escribir solo las filas válidas en lugar de rechazar todo el lote"
+
+
+def _responder(response: Response, operacion: Callable[[], ResultadoLote]) -> ResultadoLote:
+    try:
+        resultado = operacion()
+    except IntegrityError as e:
+        raise HTTPException(status_code=409, detail=f"La base de datos rechazó el lote: {e.orig}")
+    if not resultado.aplicado:
+        response.status_code = 422
+    return resultado
+
+
+def registrar_lote(
+        router: APIRouter,
+        get_service: Callable,
+        esquema_creacion: Type[BaseModel],
+        esquema_actualizacion: Type[BaseModel],
+        llave: str
+):
+    """
+    Agrega POST, PATCH y DELETE /bulk al router, validando todo el lote y escribiéndolo con una
+    sola sentencia de múltiples filas (ver BaseService.create_many/update_many/delete_many).
+    Responde 200 si el lote se escribió y 422 si se rechazó; el cuerpo trae el resultado por fila.
+    Debe llamarse antes de declarar las rutas /{id} para que "bulk" no se tome como id.
+    """
+    esquema_fila = esquema_actualizacion_lote(esquema_actualizacion, llave)
+    nombre = router.prefix.strip("/").replace("-", "_")
+
+    @router.post("/bulk", response_model=ResultadoLote, name=f"create_{nombre}_bulk")
+    def create_lote(
+        response: Response,
+        filas: List[esquema_creacion] = Body(..., min_length=1, max_length=MAX_FILAS_LOTE),
+        parcial: bool = Query(False, description=DESCRIPCION_PARCIAL),
+        service=Depends(get_service)
+    ):
+        return _responder(response, lambda: service.create_many(filas, parcial=parcial))
+
+    @router.patch("/bulk", response_model=ResultadoLote, name=f"update_{nombre}_bulk")
+    def update_lote(
+        response: Response,
+        filas: List[esquema_fila] = Body(..., min_length=1, max_length=MAX_FILAS_LOTE),
+        parcial: bool = Query(False, description=DESCRIPCION_PARCIAL),
+        service=Depends(get_service)
+    ):
+        return _responder(response, lambda: service.update_many(filas, parcial=parcial))
+
+    @router.delete("/bulk", response_model=ResultadoLote, name=f"delete_{nombre}_bulk")
+    def delete_lote(
+        response: Response,
+        lote: EliminacionLote,
+        parcial: bool = Query(False, description=DESCRIPCION_PARCIAL),
+        service=Depends(get_service)
+    ):
+        return _responder(response, lambda: service.delete_many(lote.ids, parcial=parcial))
\ No newline at end of file
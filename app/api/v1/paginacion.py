@@ -0,0 +1,22 @@
+"""
+Utilidades de paginación por cursor para los endpoints de listado
+"""
+from typing import List, TypeVar
+
+from fastapi import Response
+
+HEADER_CURSOR = "X-Next-Cursor"
+DESCRIPCION_CURSOR = f"Cursor opaco de la página siguiente, tomado del encabezado {HEADER_CURSOR}"
+
+T = TypeVar("T")
+
+
+def con_cursor(response: Response, pagina: List[T]) -> List[T]:
+    """
+    Publica en el encabezado X-Next-Cursor el cursor de la página siguiente
+    El cuerpo sigue siendo la misma lista; si no hay más resultados el encabezado se omite
+    """
+    next_cursor = getattr(pagina, "next_cursor", None)
+    if next_cursor:
+        response.headers[HEADER_CURSOR] = next_cursor
+    return pagina
\ No newline at end of file
@@ -16,6 +16,40 @@ class Settings(BaseSettings):
     # Configuración de la Aplicación
     app_env: str = "development"
     secret_key: str = "tu-clave-secreta-muy-segura-cambiar-en-produccion"
+
+    # Modo asíncrono: las lecturas de los listados usan asyncpg en el event loop en lugar
+    # de ocupar un hilo del threadpool mientras esperan a la base de datos
+    db_async: bool = False
+
+    # Verificaciones de contraseña (bcrypt) que pueden correr a la vez durante el login
+    bcrypt_workers: int = 4
+
+    # Leer GET /estadisticas de vistas materializadas refrescadas tras cada escritura
+    # en lugar de agregarlas en cada petición
+    estadisticas_materializadas: bool = False
+
+    # Directorio local donde los workers dejan sus métricas para que /metrics las sume;
+    # vacío = cada worker expone solo las suyas
+    metricas_dir: str = ""
+
+    # Pool de conexiones de las peticiones interactivas (por worker)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    # Segundos que una petición espera una conexión libre antes de fallar con 503
+    db_pool_timeout: float = 10
+    # Segundos de vida de una conexión antes de reemplazarla (-1 = sin límite)
+    db_pool_recycle: int = 1800
+    # true: probar cada conexión al sacarla del pool (una ida y vuelta más por petición);
+    # false: optimista, una conexión caída falla una petición y se descarta todo el pool
+    db_pool_pre_ping: bool = True
+    # Milisegundos máximos por sentencia en las peticiones interactivas (0 = sin límite)
+    db_statement_timeout: int = 5000
+
+    # Pool aparte para reportes (exportaciones, estadísticas): una consulta larga ocupa una de
+    # estas conexiones y nunca una de las que usan el login y los listados
+    db_reportes_pool_size: int = 2
+    db_reportes_max_overflow: int = 2
+    db_reportes_statement_timeout: int = 120000
     
     @property
     def database_url(self) -> str:
@@ -23,6 +57,13 @@ class Settings(BaseSettings):
         Construye la URL de conexión a PostgreSQL
         """
         return f"postgresql://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
+
+    @property
+    def async_database_url(self) -> str:
+        """
+        URL de conexión a PostgreSQL con el driver asyncpg
+        """
+        return f"postgresql+asyncpg://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
     
     class Config:
         env_file = ".env"
@@ -6,16 +6,65 @@ from app.config import get_settings
 # Obtener configuración
 settings = get_settings()
 
+
+def opciones_pool(tamano: int, desbordamiento: int) -> dict:
+    """
+    Tamaño, espera, reciclaje y verificación del pool según la configuración
+    """
+    return {
+        "pool_size": tamano,
+        "max_overflow": desbordamiento,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def opciones_timeout(milisegundos: int) -> dict:
+    """
+    statement_timeout de PostgreSQL para cada sesión, enviado al conectar (sin sentencias extra)
+    """
+    if not milisegundos:
+        return {}
+    return {"options": f"-c statement_timeout={milisegundos}"}
+
+
 # Engine de SQLAlchemy
 engine = create_engine(
     settings.database_url,
-    pool_pre_ping=True,  # Verifica la conexión antes de usarla
+    **opciones_pool(settings.db_pool_size, settings.db_max_overflow),
+    connect_args=opciones_timeout(settings.db_statement_timeout),
     echo=True if settings.app_env == "development" else False  # Log de SQL en desarrollo
 )
 
 # SessionLocal
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Engine de reportes: su propio pool (pequeño) y un statement_timeout más largo, para que las
+# consultas largas no dejen sin conexiones al resto de la aplicación
+engine_reportes = create_engine(
+    settings.database_url,
+    **opciones_pool(settings.db_reportes_pool_size, settings.db_reportes_max_overflow),
+    connect_args=opciones_timeout(settings.db_reportes_statement_timeout),
+    echo=True if settings.app_env == "development" else False
+)
+SessionReportes = sessionmaker(autocommit=False, autoflush=False, bind=engine_reportes)
+
+# Engine y sesiones asíncronas (asyncpg), solo con DB_ASYNC=true
+async_engine = None
+AsyncSessionLocal = None
+if settings.db_async:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    async_engine = create_async_engine(
+        settings.async_database_url,
+        **opciones_pool(settings.db_pool_size, settings.db_max_overflow),
+        connect_args={"server_settings": {"statement_timeout": str(settings.db_statement_timeout)}},
+        echo=True if settings.app_env == "development" else False
+    )
+    # Sin expirar al hacer commit: una sesión asíncrona no puede recargar atributos perezosamente
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # Base para los modelos
 Base = declarative_base()
 
@@ -32,6 +81,29 @@ def get_db():
         db.close()
 
 
+def get_db_reportes():
+    """
+    Como get_db, pero con una sesión del pool de reportes
+    Uso en FastAPI: db: Session = Depends(get_db_reportes)
+    """
+    db = SessionReportes()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    """
+    Generador de dependencia para obtener una sesión asíncrona de base de datos
+    Uso en FastAPI: db: AsyncSession = Depends(get_async_db)
+    """
+    if AsyncSessionLocal is None:
+        raise RuntimeError("El modo asíncrono no está activo (DB_ASYNC=false)")
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def init_db():
     """
     Inicializa la base de datos creando todas las tablas
@@ -0,0 +1,214 @@
+"""
+Instrumentación de SQL por petición
+
+Los eventos del engine cuentan cada sentencia y el tiempo que tarda en la base de datos, y lo
+suman a la medición de la petición en curso (una ContextVar que el middleware abre al entrar
+y que llega también a los endpoints síncronos que corren en el threadpool). Con eso:
+
+- cada respuesta trae `X-DB-Queries` y `Server-Timing` (db y total, visibles en las
+  herramientas de desarrollo del navegador);
+- se guarda un resumen móvil por ruta con las últimas VENTANA_RESUMEN peticiones
+  (GET /api/v1/diagnostico/sql);
+- las pruebas pueden fijar un máximo de sentencias con `presupuesto_consultas`.
+
+Solo cuesta dos lecturas del reloj por sentencia; a diferencia de echo=True no imprime nada.
+Las sentencias de hilos en segundo plano (fuera de una petición) no se atribuyen a ninguna ruta.
+"""
+import math
+import threading
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+
+HEADER_CONSULTAS = "X-DB-Queries"
+HEADER_TIEMPOS = "Server-Timing"
+VENTANA_RESUMEN = 200
+
+
+class MedicionSQL:
+    __slots__ = ("consultas", "tiempo_db")
+
+    def __init__(self):
+        self.consultas = 0
+        self.tiempo_db = 0.0
+
+
+_medicion_actual: ContextVar[Optional[MedicionSQL]] = ContextVar("medicion_sql", default=None)
+
+
+class ConsultasExcedidas(AssertionError):
+    pass
+
+
+class PresupuestoConsultas:
+    """
+    Sentencias ejecutadas dentro de un bloque `with presupuesto_consultas(...)`
+    """
+
+    def __init__(self, maximo: Optional[int]):
+        self.maximo = maximo
+        self.sentencias: List[str] = []
+
+    @property
+    def consultas(self) -> int:
+        return len(self.sentencias)
+
+
+_presupuestos: List[PresupuestoConsultas] = []
+_presupuestos_lock = threading.Lock()
+
+
+@contextmanager
+def presupuesto_consultas(maximo: Optional[int] = None) -> Iterator[PresupuestoConsultas]:
+    """
+    Para pruebas: cuenta las sentencias que se ejecutan en cualquier hilo mientras dura el
+    bloque y lanza ConsultasExcedidas (un AssertionError) si pasan de `maximo`. Así una
+    regresión N+1 falla en la prueba en lugar de notarse en producción:
+
+        with presupuesto_consultas(3):
+            client.get("/api/v1/horarios/")
+
+    Con maximo=None solo cuenta; las sentencias quedan en `.sentencias`.
+    """
+    presupuesto = PresupuestoConsultas(maximo)
+    with _presupuestos_lock:
+        _presupuestos.append(presupuesto)
+    try:
+        yield presupuesto
+    finally:
+        with _presupuestos_lock:
+            _presupuestos.remove(presupuesto)
+    if maximo is not None and presupuesto.consultas > maximo:
+        detalle = "\n".join(f"  {i}. {sentencia}" for i, sentencia in enumerate(presupuesto.sentencias, 1))
+        raise ConsultasExcedidas(f"Se ejecutaron {presupuesto.consultas} sentencias (máximo {maximo}):\n{detalle}")
+
+
+def _antes_de_ejecutar(conexion, cursor, sentencia, parametros, contexto, muchas):
+    if contexto is not None:
+        contexto._inicio_sql = perf_counter()
+
+
+def _despues_de_ejecutar(conexion, cursor, sentencia, parametros, contexto, muchas):
+    inicio = getattr(contexto, "_inicio_sql", None)
+    if inicio is None:
+        return
+    medicion = _medicion_actual.get()
+    if medicion is not None:
+        medicion.consultas += 1
+        medicion.tiempo_db += perf_counter() - inicio
+    if _presupuestos:
+        with _presupuestos_lock:
+            for presupuesto in _presupuestos:
+                presupuesto.sentencias.append(sentencia)
+
+
+def instalar(engine: Engine):
+    """
+    Empieza a medir las sentencias del engine (para uno asíncrono, pasar su sync_engine)
+    """
+    if not event.contains(engine, "before_cursor_execute", _antes_de_ejecutar):
+        event.listen(engine, "before_cursor_execute", _antes_de_ejecutar)
+        event.listen(engine, "after_cursor_execute", _despues_de_ejecutar)
+
+
+class ResumenRutas:
+    """
+    Últimas `ventana` peticiones de cada ruta: (sentencias, segundos en BD, segundos en total)
+    """
+
+    def __init__(self, ventana: int = VENTANA_RESUMEN):
+        self.ventana = ventana
+        self._rutas: Dict[Tuple[str, str], Deque[Tuple[int, float, float]]] = {}
+        self._totales: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def registrar(self, metodo: str, ruta: str, consultas: int, tiempo_db: float, duracion: float):
+        clave = (metodo, ruta)
+        with self._lock:
+            muestras = self._rutas.get(clave)
+            if muestras is None:
+                muestras = self._rutas[clave] = deque(maxlen=self.ventana)
+            muestras.append((consultas, tiempo_db, duracion))
+            self._totales[clave] = self._totales.get(clave, 0) + 1
+
+    def resumen(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            rutas = [(clave, list(muestras), self._totales[clave]) for clave, muestras in self._rutas.items()]
+        resultado = []
+        for (metodo, ruta), muestras, total in rutas:
+            consultas = [muestra[0] for muestra in muestras]
+            tiempos_db = [muestra[1] for muestra in muestras]
+            duraciones = sorted(muestra[2] for muestra in muestras)
+            n = len(muestras)
+            resultado.append({
+                "metodo": metodo,
+                "ruta": ruta,
+                "peticiones": total,
+                "muestras": n,
+                "consultas_promedio": round(sum(consultas) / n, 2),
+                "consultas_max": max(consultas),
+                "db_ms_promedio": round(1000 * sum(tiempos_db) / n, 2),
+                "total_ms_promedio": round(1000 * sum(duraciones) / n, 2),
+                "total_ms_p95": round(1000 * duraciones[math.ceil(0.95 * n) - 1], 2),
+            })
+        return sorted(resultado, key=lambda fila: -fila["consultas_promedio"] * fila["muestras"])
+
+    def reiniciar(self):
+        with self._lock:
+            self._rutas.clear()
+            self._totales.clear()
+
+
+resumen = ResumenRutas()
+
+
+def plantilla_ruta(scope) -> str:
+    """
+    Plantilla de la ruta (/horarios/{id_horario}) en lugar de la URL, para agrupar por endpoint
+    """
+    ruta = scope.get("route")
+    return getattr(ruta, "path", None) or "(sin ruta)"
+
+
+def _server_timing(medicion: MedicionSQL, duracion: float) -> str:
+    return (f'db;dur={1000 * medicion.tiempo_db:.1f};desc="{medicion.consultas} consultas", '
+            f'total;dur={1000 * duracion:.1f}')
+
+
+class MiddlewareSQL:
+    """
+    Middleware ASGI que abre la medición de cada petición, agrega los encabezados al iniciar la
+    respuesta y al terminar la registra en el resumen. En respuestas en streaming (exportaciones)
+    los encabezados cuentan lo ejecutado hasta el primer byte y el resumen, la petición completa.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        medicion = MedicionSQL()
+        token = _medicion_actual.set(medicion)
+        inicio = perf_counter()
+
+        async def enviar(mensaje):
+            if mensaje["type"] == "http.response.start":
+                encabezados = MutableHeaders(scope=mensaje)
+                encabezados.append(HEADER_CONSULTAS, str(medicion.consultas))
+                encabezados.append(HEADER_TIEMPOS, _server_timing(medicion, perf_counter() - inicio))
+            await send(mensaje)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            _medicion_actual.reset(token)
+            resumen.registrar(scope["method"], plantilla_ruta(scope), medicion.consultas, medicion.tiempo_db,
+                              perf_counter() - inicio)
\ No newline at end of file
@@ -1,16 +1,24 @@
-from fastapi import FastAPI, Depends
+import logging
+from fastapi import FastAPI, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import text
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolAgotadoError
 
+from app import instrumentacion, metricas
 from app.api.v1.endpoints import api_router
-from app.database import get_db, init_db
+from app.api.v1.paginacion import HEADER_CURSOR
+from app.database import async_engine, engine, engine_reportes, get_db, init_db
 from app.config import get_settings
+from app.repositories.base_repository import CursorInvalidoError
+from app.services import ultimo_login, vistas_estadisticas
 # Importar modelos para que se registren en SQLAlchemy al inicializar la base de datos
 from app.models import Usuario, Carrera  # noqa: F401
 
 # Obtener configuración
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
 app = FastAPI(
     title="Mi App FastAPI",
@@ -18,6 +26,22 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Sentencias SQL y tiempo en la base de datos de cada petición (X-DB-Queries, Server-Timing)
+instrumentacion.instalar(engine)
+instrumentacion.instalar(engine_reportes)
+if async_engine is not None:
+    instrumentacion.instalar(async_engine.sync_engine)
+app.add_middleware(instrumentacion.MiddlewareSQL)
+
+# Métricas de Prometheus (GET /metrics): latencia por ruta, códigos de estado, pool, bcrypt y cachés
+metricas.vigilar_pool(engine)
+metricas.vigilar_pool(engine_reportes, "reportes")
+if async_engine is not None:
+    metricas.vigilar_pool(async_engine.sync_engine, "asincrono")
+if settings.metricas_dir:
+    metricas.configurar(settings.metricas_dir)
+app.add_middleware(metricas.MiddlewareMetricas)
+
 # Configurar CORS 
 app.add_middleware(
     CORSMiddleware,
@@ -30,9 +54,45 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[HEADER_CURSOR, instrumentacion.HEADER_CONSULTAS, instrumentacion.HEADER_TIEMPOS],
 )
 
 
+@app.exception_handler(CursorInvalidoError)
+async def cursor_invalido_handler(request: Request, exc: CursorInvalidoError):
+    """
+    Un cursor alterado o de otro listado es un error del cliente, no del servidor
+    """
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+
+@app.exception_handler(PoolAgotadoError)
+async def pool_agotado_handler(request: Request, exc: PoolAgotadoError):
+    """
+    Todas las conexiones del pool siguen ocupadas después de DB_POOL_TIMEOUT segundos:
+    el servicio está saturado, así que se responde 503 en lugar de seguir encolando
+    """
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "No hay conexiones libres a la base de datos, intenta de nuevo"},
+        headers={"Retry-After": "1"}
+    )
+
+
+@app.exception_handler(OperationalError)
+async def statement_timeout_handler(request: Request, exc: OperationalError):
+    """
+    Una sentencia cancelada por statement_timeout (SQLSTATE 57014; QueryCanceled en psycopg2
+    y la cancelación de asyncpg llegan como OperationalError) es una respuesta 503;
+    cualquier otro error operacional de la base de datos es un 500
+    """
+    original = exc.orig
+    if getattr(original, "pgcode", None) != "57014" and getattr(original, "sqlstate", None) != "57014":
+        logger.error("Error de la base de datos en %s %s", request.method, request.url.path, exc_info=exc)
+        return JSONResponse(status_code=500, content={"detail": "Error interno de la base de datos"})
+    return JSONResponse(status_code=503, content={"detail": "La consulta excedió el tiempo límite"})
+
+
 @app.on_event("startup")
 async def startup_event():
     """
@@ -40,10 +100,38 @@ async def startup_event():
     Inicializa las tablas de la base de datos
     """
     init_db()
+    ultimo_login.buffer.iniciar()
+    if settings.estadisticas_materializadas:
+        vistas_estadisticas.instalar(engine)
+    if metricas.exportador is not None:
+        metricas.exportador.iniciar()
     print(f"Aplicación iniciada en modo: {settings.app_env}")
     print(f"Conectado a la base de datos: {settings.db_name}")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """
+    Guarda los last_login pendientes, hace el último refresco de las estadísticas y cierra
+    las conexiones del engine asíncrono (solo existe con DB_ASYNC=true)
+    """
+    ultimo_login.buffer.detener()
+    if settings.estadisticas_materializadas:
+        vistas_estadisticas.desinstalar(engine)
+    if metricas.exportador is not None:
+        metricas.exportador.detener()
+    if async_engine is not None:
+        await async_engine.dispose()
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def read_metricas():
+    """
+    Métricas en formato de Prometheus (de todos los workers si METRICAS_DIR está configurado)
+    """
+    return PlainTextResponse(metricas.exponer(), media_type=metricas.TIPO_CONTENIDO)
+
+
 @app.get("/")
 def read_root():
     return {"mensaje": "¡Hola Mundo desde FastAPI!"}
@@ -0,0 +1,334 @@
+"""
+Métricas en formato de texto de Prometheus (GET /metrics), sin dependencias externas
+
+Cada hilo acumula sus contadores e histogramas en su propio fragmento, así que registrar una
+observación no toma ningún lock; al exponer se suman los fragmentos. Los medidores (conexiones
+del pool) y los aciertos de las cachés se leen en el momento de exponer.
+
+Con varios workers de uvicorn cada proceso tiene sus propias cifras y un scrape llega a uno
+solo. Con METRICAS_DIR (un directorio local compartido por los workers, vacío al arrancar el
+servicio) cada worker escribe su instantánea ahí cada INTERVALO_METRICAS segundos y /metrics
+suma las de todos: contadores e histogramas de todos los archivos (también de workers que ya
+terminaron, para que no retrocedan) y medidores solo de los workers vivos.
+"""
+import json
+import logging
+import os
+import threading
+import time as reloj
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.instrumentacion import plantilla_ruta
+from app.services import catalogo
+
+INTERVALO_METRICAS = 5
+TIPO_CONTENIDO = "text/plain; version=0.0.4; charset=utf-8"
+
+BUCKETS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+BUCKETS_BCRYPT = (0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 2)
+
+# nombre -> (tipo, descripción)
+METRICAS = {
+    "http_peticiones_total": ("counter", "Peticiones atendidas por método, ruta y código de estado"),
+    "http_duracion_segundos": ("histogram", "Duración de las peticiones por método y ruta"),
+    "bcrypt_verificacion_segundos": ("histogram", "Duración de cada verificación de contraseña con bcrypt"),
+    "cache_aciertos_total": ("counter", "Lecturas servidas desde la caché, por tabla"),
+    "cache_fallos_total": ("counter", "Lecturas que tuvieron que ir a la base de datos, por tabla"),
+    "cache_tasa_aciertos": ("gauge", "Aciertos sobre lecturas totales de la caché, por tabla"),
+    "db_pool_conexiones_en_uso": ("gauge", "Conexiones del pool prestadas en este momento"),
+    "db_pool_desbordamiento": ("gauge", "Conexiones abiertas por encima del tamaño del pool"),
+    "db_pool_tamano": ("gauge", "Tamaño configurado del pool de conexiones"),
+}
+
+Etiquetas = Tuple[Tuple[str, str], ...]
+
+logger = logging.getLogger(__name__)
+
+
+class _Fragmento:
+    """
+    Cifras de un solo hilo; solo ese hilo las modifica
+    """
+    __slots__ = ("contadores", "histogramas")
+
+    def __init__(self):
+        self.contadores: Dict[Tuple[str, Etiquetas], float] = {}
+        # (nombre, etiquetas) -> [límites, cuentas por bucket (la última es +Inf), suma]
+        self.histogramas: Dict[Tuple[str, Etiquetas], List[Any]] = {}
+
+
+_local = threading.local()
+_fragmentos: List[_Fragmento] = []
+_fragmentos_lock = threading.Lock()
+
+
+def _fragmento() -> _Fragmento:
+    fragmento = getattr(_local, "fragmento", None)
+    if fragmento is None:
+        fragmento = _local.fragmento = _Fragmento()
+        with _fragmentos_lock:
+            _fragmentos.append(fragmento)
+    return fragmento
+
+
+def contar(nombre: str, etiquetas: Etiquetas = (), valor: float = 1):
+    contadores = _fragmento().contadores
+    clave = (nombre, etiquetas)
+    contadores[clave] = contadores.get(clave, 0) + valor
+
+
+def observar(nombre: str, valor: float, etiquetas: Etiquetas = (), limites: Sequence[float] = BUCKETS_LATENCIA):
+    histogramas = _fragmento().histogramas
+    clave = (nombre, etiquetas)
+    histograma = histogramas.get(clave)
+    if histograma is None:
+        histograma = histogramas[clave] = [tuple(limites), [0] * (len(limites) + 1), 0.0]
+    histograma[1][bisect_left(histograma[0], valor)] += 1
+    histograma[2] += valor
+
+
+# Funciones que devuelven medidores [(nombre, etiquetas, valor)] al momento de exponer
+_recolectores: List[Callable[[], Iterable[Tuple[str, Etiquetas, float]]]] = []
+
+
+def registrar_recolector(recolector: Callable[[], Iterable[Tuple[str, Etiquetas, float]]]):
+    _recolectores.append(recolector)
+
+
+def vigilar_pool(engine, nombre: str = "interactivo"):
+    """
+    Expone los medidores del pool de conexiones del engine (solo pools con tamaño, como QueuePool)
+    """
+    pool = engine.pool
+    if not hasattr(pool, "checkedout"):
+        return
+    etiquetas = (("engine", engine.url.drivername), ("pool", nombre))
+    registrar_recolector(lambda: [
+        ("db_pool_conexiones_en_uso", etiquetas, pool.checkedout()),
+        ("db_pool_desbordamiento", etiquetas, max(pool.overflow(), 0)),
+        ("db_pool_tamano", etiquetas, pool.size()),
+    ])
+
+
+def instantanea() -> Dict[str, Any]:
+    """
+    Cifras de este proceso, serializables a JSON
+    """
+    with _fragmentos_lock:
+        fragmentos = list(_fragmentos)
+    contadores: Dict[Tuple[str, Etiquetas], float] = {}
+    histogramas: Dict[Tuple[str, Etiquetas], List[Any]] = {}
+    for fragmento in fragmentos:
+        # Copias hechas de una vez: el hilo dueño puede seguir escribiendo mientras tanto
+        for clave, valor in fragmento.contadores.copy().items():
+            contadores[clave] = contadores.get(clave, 0) + valor
+        for clave, (limites, cuentas, suma) in fragmento.histogramas.copy().items():
+            actual = histogramas.setdefault(clave, [limites, [0] * len(cuentas), 0.0])
+            actual[1] = [a + b for a, b in zip(actual[1], list(cuentas))]
+            actual[2] += suma
+    for cache in catalogo.estadisticas():
+        etiquetas = (("tabla", cache["tabla"]),)
+        contadores[("cache_aciertos_total", etiquetas)] = cache["aciertos"]
+        contadores[("cache_fallos_total", etiquetas)] = cache["fallos"]
+    medidores = []
+    for recolector in _recolectores:
+        try:
+            medidores.extend(recolector())
+        except Exception:
+            logger.exception("No se pudieron leer los medidores")
+    return {
+        "pid": os.getpid(),
+        "momento": reloj.time(),
+        "contadores": [[nombre, etiquetas, valor] for (nombre, etiquetas), valor in contadores.items()],
+        "histogramas": [[nombre, etiquetas, list(limites), cuentas, suma]
+                        for (nombre, etiquetas), (limites, cuentas, suma) in histogramas.items()],
+        "medidores": [[nombre, etiquetas, valor] for nombre, etiquetas, valor in medidores],
+    }
+
+
+def _llave(nombre: str, etiquetas) -> Tuple[str, Etiquetas]:
+    return nombre, tuple(tuple(par) for par in etiquetas)
+
+
+def combinar(instantaneas: Iterable[Dict[str, Any]], vivos: Optional[set] = None) -> Dict[str, Any]:
+    """
+    Suma las instantáneas de varios procesos; los medidores solo de los pids en `vivos` (todos si es None)
+    """
+    contadores: Dict[Tuple[str, Etiquetas], float] = {}
+    histogramas: Dict[Tuple[str, Etiquetas], List[Any]] = {}
+    medidores: Dict[Tuple[str, Etiquetas], float] = {}
+    for datos in instantaneas:
+        for nombre, etiquetas, valor in datos["contadores"]:
+            clave = _llave(nombre, etiquetas)
+            contadores[clave] = contadores.get(clave, 0) + valor
+        for nombre, etiquetas, limites, cuentas, suma in datos["histogramas"]:
+            actual = histogramas.setdefault(_llave(nombre, etiquetas), [limites, [0] * len(cuentas), 0.0])
+            if actual[0] != limites:
+                continue
+            actual[1] = [a + b for a, b in zip(actual[1], cuentas)]
+            actual[2] += suma
+        if vivos is None or datos["pid"] in vivos:
+            for nombre, etiquetas, valor in datos["medidores"]:
+                clave = _llave(nombre, etiquetas)
+                medidores[clave] = medidores.get(clave, 0) + valor
+    # La tasa se calcula sobre las sumas: un promedio de tasas por worker no sería la tasa global
+    for (nombre, etiquetas), aciertos in list(contadores.items()):
+        if nombre == "cache_aciertos_total":
+            lecturas = aciertos + contadores.get(("cache_fallos_total", etiquetas), 0)
+            if lecturas:
+                medidores[("cache_tasa_aciertos", etiquetas)] = aciertos / lecturas
+    return {"contadores": contadores, "histogramas": histogramas, "medidores": medidores}
+
+
+def _escapar(valor: Any) -> str:
+    return str(valor).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _formato_etiquetas(etiquetas: Etiquetas, extra: Etiquetas = ()) -> str:
+    pares = etiquetas + extra
+    if not pares:
+        return ""
+    return "{" + ",".join(f'{nombre}="{_escapar(valor)}"' for nombre, valor in pares) + "}"
+
+
+def _numero(valor: float) -> str:
+    return repr(float(valor)) if isinstance(valor, float) and not valor.is_integer() else str(int(valor))
+
+
+def formato_texto(combinadas: Dict[str, Any]) -> str:
+    """
+    Formato de exposición de texto de Prometheus
+    """
+    series: Dict[str, List[str]] = {nombre: [] for nombre in METRICAS}
+    for (nombre, etiquetas), valor in sorted(combinadas["contadores"].items()):
+        series.setdefault(nombre, []).append(f"{nombre}{_formato_etiquetas(etiquetas)} {_numero(valor)}")
+    for (nombre, etiquetas), valor in sorted(combinadas["medidores"].items()):
+        series.setdefault(nombre, []).append(f"{nombre}{_formato_etiquetas(etiquetas)} {_numero(valor)}")
+    for (nombre, etiquetas), (limites, cuentas, suma) in sorted(combinadas["histogramas"].items()):
+        lineas = series.setdefault(nombre, [])
+        acumulado = 0
+        for limite, cuenta in zip(list(limites) + ["+Inf"], cuentas):
+            acumulado += cuenta
+            le = limite if limite == "+Inf" else _numero(float(limite))
+            lineas.append(f"{nombre}_bucket{_formato_etiquetas(etiquetas, (('le', le),))} {acumulado}")
+        lineas.append(f"{nombre}_sum{_formato_etiquetas(etiquetas)} {_numero(suma)}")
+        lineas.append(f"{nombre}_count{_formato_etiquetas(etiquetas)} {acumulado}")
+    salida = []
+    for nombre, lineas in series.items():
+        if not lineas:
+            continue
+        tipo, descripcion = METRICAS.get(nombre, ("untyped", ""))
+        salida.append(f"# HELP {nombre} {descripcion}")
+        salida.append(f"# TYPE {nombre} {tipo}")
+        salida.extend(lineas)
+    return "\n".join(salida) + "\n"
+
+
+class ExportadorMetricas:
+    """
+    Escribe la instantánea de este worker en METRICAS_DIR y junta las de todos los workers
+    """
+
+    def __init__(self, directorio: str, intervalo: float = INTERVALO_METRICAS):
+        self.directorio = directorio
+        self.intervalo = intervalo
+        self._detener = threading.Event()
+        self._hilo: Optional[threading.Thread] = None
+
+    def guardar(self):
+        datos = instantanea()
+        destino = os.path.join(self.directorio, f"{datos['pid']}.json")
+        temporal = f"{destino}.tmp"
+        with open(temporal, "w") as archivo:
+            json.dump(datos, archivo)
+        os.replace(temporal, destino)
+
+    def leer_todas(self) -> Tuple[List[Dict[str, Any]], set]:
+        """
+        Instantáneas de todos los workers y pids de los que siguen vivos (escribieron hace poco)
+        """
+        instantaneas, vivos = [], set()
+        limite = reloj.time() - 3 * self.intervalo
+        for nombre in os.listdir(self.directorio):
+            if not nombre.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.directorio, nombre)) as archivo:
+                    datos = json.load(archivo)
+            except (OSError, ValueError):
+                continue
+            instantaneas.append(datos)
+            if datos["momento"] >= limite:
+                vivos.add(datos["pid"])
+        return instantaneas, vivos
+
+    def iniciar(self):
+        os.makedirs(self.directorio, exist_ok=True)
+        if self._hilo is not None and self._hilo.is_alive():
+            return
+        self._detener.clear()
+        self._hilo = threading.Thread(target=self._ciclo, name="metricas", daemon=True)
+        self._hilo.start()
+
+    def detener(self):
+        self._detener.set()
+        if self._hilo is not None:
+            self._hilo.join()
+            self._hilo = None
+        self.guardar()
+
+    def _ciclo(self):
+        while not self._detener.wait(self.intervalo):
+            try:
+                self.guardar()
+            except OSError:
+                logger.exception("No se pudieron guardar las métricas en %s", self.directorio)
+
+
+exportador: Optional[ExportadorMetricas] = None
+
+
+def configurar(directorio: str):
+    """
+    Activa la agregación entre workers (METRICAS_DIR); sin llamarla, /metrics expone solo este proceso
+    """
+    global exportador
+    exportador = ExportadorMetricas(directorio)
+
+
+def exponer() -> str:
+    if exportador is None:
+        return formato_texto(combinar([instantanea()]))
+    exportador.guardar()
+    instantaneas, vivos = exportador.leer_todas()
+    vivos.add(os.getpid())
+    return formato_texto(combinar(instantaneas, vivos))
+
+
+class MiddlewareMetricas:
+    """
+    Middleware ASGI que cuenta cada petición por código de estado y observa su duración por ruta
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        inicio = reloj.perf_counter()
+        codigo = [500]
+
+        async def enviar(mensaje):
+            if mensaje["type"] == "http.response.start":
+                codigo[0] = mensaje["status"]
+            await send(mensaje)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            etiquetas = (("metodo", scope["method"]), ("ruta", plantilla_ruta(scope)))
+            contar("http_peticiones_total", etiquetas + (("codigo", str(codigo[0])),))
+            observar("http_duracion_segundos", reloj.perf_counter() - inicio, etiquetas)
\ No newline at end of file
@@ -1,7 +1,8 @@
-from typing import List, Optional
+from typing import Any, List, Optional, Set
 from sqlalchemy.orm import Session
 
 from app.models.AsignacionAula import AsignacionAula
+from app.models.SolicitudExamen import SolicitudExamen
 from app.repositories.base_repository import BaseRepository
 from app.schemas.AsignacionAulaSchema import AsignacionAulaCreate, AsignacionAulaUpdate
 
@@ -14,16 +15,42 @@ class AsignacionAulaRepository(BaseRepository[AsignacionAula, AsignacionAulaCrea
         return self.db.query(AsignacionAula).filter(AsignacionAula.id_examen_aula == id_examen_aula).first()
 
     def get_by_solicitud(self, id_horario: str) -> List[AsignacionAula]:
-        return self.db.query(AsignacionAula).filter(
+        return self.consulta().filter(
             AsignacionAula.id_horario == id_horario
         ).all()
 
     def get_by_aula(self, id_aula: str) -> List[AsignacionAula]:
-        return self.db.query(AsignacionAula).filter(
+        return self.consulta().filter(
             AsignacionAula.id_aula == id_aula
         ).all()
 
     def get_by_profesor_aplicador(self, id_profesor: str) -> List[AsignacionAula]:
-        return self.db.query(AsignacionAula).filter(
+        return self.consulta().filter(
             AsignacionAula.id_profesor_aplicador == id_profesor
-        ).all()
\ No newline at end of file
+        ).all()
+
+    def get_ocupacion_por_periodo(self, id_periodo: str) -> List[Any]:
+        """
+        Aula y aplicador de cada examen del periodo junto con la fecha, horario y estado de la solicitud
+        """
+        return self.db.query(
+            AsignacionAula.id_examen_aula,
+            AsignacionAula.id_horario,
+            AsignacionAula.id_aula,
+            AsignacionAula.id_profesor_aplicador,
+            SolicitudExamen.fecha_examen,
+            SolicitudExamen.hora_inicio,
+            SolicitudExamen.hora_fin,
+            SolicitudExamen.estado
+        ).join(
+            SolicitudExamen, SolicitudExamen.id_horario == AsignacionAula.id_horario
+        ).filter(SolicitudExamen.id_periodo == id_periodo).all()
+
+    def get_solicitudes_con_aula(self, id_periodo: str) -> Set[str]:
+        """
+        Solicitudes del periodo que ya tienen al menos un aula asignada
+        """
+        filas = self.db.query(AsignacionAula.id_horario).join(
+            SolicitudExamen, SolicitudExamen.id_horario == AsignacionAula.id_horario
+        ).filter(SolicitudExamen.id_periodo == id_periodo).distinct()
+        return {fila.id_horario for fila in filas}
\ No newline at end of file
@@ -1,7 +1,8 @@
-from typing import List, Optional
+from typing import Any, List, Optional, Tuple
 from sqlalchemy.orm import Session
 
 from app.models.AsignacionSinodal import AsignacionSinodal
+from app.models.SolicitudExamen import SolicitudExamen
 from app.repositories.base_repository import BaseRepository
 from app.schemas.AsignacionSinodalSchema import AsignacionSinodalCreate, AsignacionSinodalUpdate
 
@@ -14,11 +15,35 @@ class AsignacionSinodalRepository(BaseRepository[AsignacionSinodal, AsignacionSi
         return self.db.query(AsignacionSinodal).filter(AsignacionSinodal.id_examen_sinodal == id_examen_sinodal).first()
 
     def get_by_solicitud(self, id_horario: str) -> List[AsignacionSinodal]:
-        return self.db.query(AsignacionSinodal).filter(
+        return self.consulta().filter(
             AsignacionSinodal.id_horario == id_horario
         ).all()
 
     def get_by_profesor(self, id_profesor: str) -> List[AsignacionSinodal]:
-        return self.db.query(AsignacionSinodal).filter(
+        return self.consulta().filter(
             AsignacionSinodal.id_profesor == id_profesor
-        ).all()
\ No newline at end of file
+        ).all()
+
+    def get_ocupacion_por_periodo(self, id_periodo: str) -> List[Any]:
+        """
+        Sinodales de cada examen del periodo junto con la fecha, horario y estado de la solicitud
+        """
+        return self.db.query(
+            AsignacionSinodal.id_examen_sinodal,
+            AsignacionSinodal.id_horario,
+            AsignacionSinodal.id_profesor,
+            SolicitudExamen.fecha_examen,
+            SolicitudExamen.hora_inicio,
+            SolicitudExamen.hora_fin,
+            SolicitudExamen.estado
+        ).join(
+            SolicitudExamen, SolicitudExamen.id_horario == AsignacionSinodal.id_horario
+        ).filter(SolicitudExamen.id_periodo == id_periodo).all()
+
+    def get_pares_por_periodo(self, id_periodo: str) -> List[Tuple[str, str]]:
+        """
+        Pares (id_horario, id_profesor) de los sinodales ya asignados en el periodo
+        """
+        return self.db.query(AsignacionSinodal.id_horario, AsignacionSinodal.id_profesor).join(
+            SolicitudExamen, SolicitudExamen.id_horario == AsignacionSinodal.id_horario
+        ).filter(SolicitudExamen.id_periodo == id_periodo).all()
\ No newline at end of file
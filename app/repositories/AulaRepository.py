@@ -1,8 +1,8 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from sqlalchemy.orm import Session
 
 from app.models.Aula import Aula
-from app.repositories.base_repository import BaseRepository
+from app.repositories.base_repository import BaseRepository, Pagina
 from app.schemas.AulaSchema import AulaCreate, AulaUpdate
 
 
@@ -13,10 +13,25 @@ class AulaRepository(BaseRepository[Aula, AulaCreate, AulaUpdate]):
     def get_by_id(self, id_aula: str) -> Optional[Aula]:
         return self.db.query(Aula).filter(Aula.id_aula == id_aula).first()
 
-    def get_disponibles(self, capacidad_minima: Optional[int] = None, skip: int = 0, limit: int = 100) -> List[Aula]:
+    def get_disponibles(
+            self,
+            capacidad_minima: Optional[int] = None,
+            skip: int = 0,
+            limit: int = 100,
+            cursor: Optional[str] = None
+    ) -> Pagina:
         query = self.db.query(Aula).filter(Aula.is_disable == False)
 
         if capacidad_minima:
             query = query.filter(Aula.capacidad >= capacidad_minima)
 
-        return query.offset(skip).limit(limit).all()
\ No newline at end of file
+        return self.paginar(query, skip, limit, cursor)
+
+    def get_habilitadas(self) -> List[Aula]:
+        return self.db.query(Aula).filter(Aula.is_disable == False).order_by(Aula.id_aula).all()
+
+    def get_capacidades_habilitadas(self) -> List[Tuple[str, int]]:
+        """
+        Pares (id_aula, capacidad) de todas las aulas habilitadas
+        """
+        return self.db.query(Aula.id_aula, Aula.capacidad).filter(Aula.is_disable == False).all()
\ No newline at end of file
@@ -1,8 +1,8 @@
-from typing import List, Optional
+from typing import Optional
 from sqlalchemy.orm import Session
 
 from app.models.Carrera import Carrera
-from app.repositories.base_repository import BaseRepository
+from app.repositories.base_repository import BaseRepository, Pagina
 from app.schemas.CarreraSchema import CarreraCreate, CarreraUpdate
 
 
@@ -16,7 +16,8 @@ class CarreraRepository(BaseRepository[Carrera, CarreraCreate, CarreraUpdate]):
     def get_by_nombre(self, nombre: str) -> Optional[Carrera]:
         return self.db.query(Carrera).filter(Carrera.nombre_carrera == nombre).first()
 
-    def search_by_nombre(self, nombre: str, skip: int = 0, limit: int = 100) -> List[Carrera]:
-        return self.db.query(Carrera).filter(
+    def search_by_nombre(self, nombre: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> Pagina:
+        query = self.db.query(Carrera).filter(
             Carrera.nombre_carrera.ilike(f"%{nombre}%")
-        ).offset(skip).limit(limit).all()
\ No newline at end of file
+        )
+        return self.paginar(query, skip, limit, cursor)
\ No newline at end of file
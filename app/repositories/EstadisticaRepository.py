@@ -0,0 +1,144 @@
+from typing import Any, Dict, List
+
+from sqlalchemy import column, distinct, func, select, table, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.util import find_tables
+
+from app.models.AsignacionAula import AsignacionAula
+from app.models.AsignacionSinodal import AsignacionSinodal
+from app.models.Aula import Aula
+from app.models.Carrera import Carrera
+from app.models.GrupoEscolar import GrupoEscolar
+from app.models.GrupoExamen import GrupoExamen
+from app.models.HorarioClase import HorarioClase
+from app.models.Profesor import Profesor
+from app.models.SolicitudExamen import SolicitudExamen
+from app.models.TipoEvaluacion import TipoEvaluacion
+from app.schemas.EstadoSolicitudSchema import EstadoSolicitud
+
+# Las asignaciones de solicitudes rechazadas no ocupan aulas ni profesores
+_vigente = func.coalesce(SolicitudExamen.estado, EstadoSolicitud.PENDIENTE.value) != EstadoSolicitud.RECHAZADO.value
+
+# Cada cifra del tablero es una consulta agregada de todos los periodos, con id_periodo como
+# primera columna: se filtra por periodo al consultarla en vivo o se guarda tal cual en una
+# vista materializada (ver crear_vistas)
+CONSULTAS: Dict[str, Select] = {
+    "solicitudes": select(
+        SolicitudExamen.id_periodo,
+        SolicitudExamen.estado,
+        SolicitudExamen.id_evaluacion,
+        TipoEvaluacion.nombre_evaluacion,
+        func.count(SolicitudExamen.id_horario).label("total")
+    ).outerjoin(TipoEvaluacion, TipoEvaluacion.id_evaluacion == SolicitudExamen.id_evaluacion).group_by(
+        SolicitudExamen.id_periodo, SolicitudExamen.estado, SolicitudExamen.id_evaluacion,
+        TipoEvaluacion.nombre_evaluacion
+    ),
+    "solicitudes_carrera": select(
+        SolicitudExamen.id_periodo,
+        Carrera.id_carrera,
+        Carrera.nombre_carrera,
+        func.count(distinct(SolicitudExamen.id_horario)).label("total")
+    ).select_from(SolicitudExamen).join(
+        GrupoExamen, GrupoExamen.id_horario == SolicitudExamen.id_horario
+    ).join(GrupoEscolar, GrupoEscolar.id_grupo == GrupoExamen.id_grupo).join(
+        Carrera, Carrera.id_carrera == GrupoEscolar.id_carrera
+    ).group_by(SolicitudExamen.id_periodo, Carrera.id_carrera, Carrera.nombre_carrera),
+    # Por duración de la clase y no por aula sola, para sumar horas sin aritmética de fechas en SQL
+    "clases_aula": select(
+        HorarioClase.id_periodo,
+        HorarioClase.id_aula,
+        HorarioClase.hora_inicio,
+        HorarioClase.hora_fin,
+        func.count(HorarioClase.id_horario_clase).label("total")
+    ).where(HorarioClase.id_aula.isnot(None)).group_by(
+        HorarioClase.id_periodo, HorarioClase.id_aula, HorarioClase.hora_inicio, HorarioClase.hora_fin
+    ),
+    "examenes_aula": select(
+        SolicitudExamen.id_periodo,
+        AsignacionAula.id_aula,
+        func.count(AsignacionAula.id_examen_aula).label("total")
+    ).select_from(AsignacionAula).join(
+        SolicitudExamen, SolicitudExamen.id_horario == AsignacionAula.id_horario
+    ).where(_vigente, AsignacionAula.id_aula.isnot(None)).group_by(
+        SolicitudExamen.id_periodo, AsignacionAula.id_aula
+    ),
+    "sinodales": select(
+        SolicitudExamen.id_periodo,
+        AsignacionSinodal.id_profesor,
+        func.count(AsignacionSinodal.id_examen_sinodal).label("total")
+    ).select_from(AsignacionSinodal).join(
+        SolicitudExamen, SolicitudExamen.id_horario == AsignacionSinodal.id_horario
+    ).where(_vigente, AsignacionSinodal.id_profesor.isnot(None)).group_by(
+        SolicitudExamen.id_periodo, AsignacionSinodal.id_profesor
+    ),
+    "aplicadores": select(
+        SolicitudExamen.id_periodo,
+        AsignacionAula.id_profesor_aplicador.label("id_profesor"),
+        func.count(AsignacionAula.id_examen_aula).label("total")
+    ).select_from(AsignacionAula).join(
+        SolicitudExamen, SolicitudExamen.id_horario == AsignacionAula.id_horario
+    ).where(_vigente, AsignacionAula.id_profesor_aplicador.isnot(None)).group_by(
+        SolicitudExamen.id_periodo, AsignacionAula.id_profesor_aplicador
+    ),
+}
+
+# Tablas cuyas escrituras cambian alguna cifra (y obligan a refrescar las vistas)
+TABLAS_ESTADISTICAS = frozenset(tabla.name for consulta in CONSULTAS.values() for tabla in find_tables(consulta))
+
+
+def nombre_vista(nombre: str) -> str:
+    return f"estadisticas_{nombre}"
+
+
+class EstadisticaRepository:
+    """
+    Cifras agregadas por periodo para el tablero, una consulta GROUP BY por cifra
+
+    Con `materializadas=True` (PostgreSQL) las cifras se leen de vistas materializadas con
+    las mismas consultas, que se refrescan en segundo plano después de cada escritura
+    (ver app.services.vistas_estadisticas).
+    """
+
+    def __init__(self, db: Session, materializadas: bool = False):
+        self.db = db
+        self.materializadas = materializadas
+
+    def consultar(self, nombre: str, id_periodo: str) -> List[Any]:
+        consulta = CONSULTAS[nombre]
+        if self.materializadas:
+            vista = table(nombre_vista(nombre), *(column(c.key) for c in consulta.selected_columns))
+            return self.db.execute(select(vista).where(vista.c.id_periodo == id_periodo)).all()
+        return self.db.execute(consulta.where(consulta.selected_columns.id_periodo == id_periodo)).all()
+
+    def get_aulas(self) -> List[Any]:
+        return self.db.execute(
+            select(Aula.id_aula, Aula.nombre_aula, Aula.capacidad, Aula.is_disable)
+        ).all()
+
+    def get_profesores(self) -> List[Any]:
+        return self.db.execute(
+            select(Profesor.id_profesor, Profesor.nombre_profesor, Profesor.is_disable)
+        ).all()
+
+    def crear_vistas(self):
+        """
+        Crea las vistas materializadas que falten, con el índice único que exige
+        REFRESH MATERIALIZED VIEW CONCURRENTLY (sobre las columnas agrupadas)
+        """
+        for nombre, consulta in CONSULTAS.items():
+            sql = consulta.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+            llaves = ", ".join(c.key for c in consulta.selected_columns if c.key != "total")
+            vista = nombre_vista(nombre)
+            self.db.execute(text(f"CREATE MATERIALIZED VIEW IF NOT EXISTS {vista} AS {sql}"))
+            self.db.execute(text(f"CREATE UNIQUE INDEX IF NOT EXISTS {vista}_llave ON {vista} ({llaves})"))
+        self.db.commit()
+
+    def refrescar_vistas(self):
+        """
+        Recalcula las vistas sin bloquear las lecturas que estén en curso
+        """
+        for nombre in CONSULTAS:
+            self.db.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {nombre_vista(nombre)}"))
+        self.db.commit()
\ No newline at end of file
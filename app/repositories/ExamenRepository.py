@@ -0,0 +1,62 @@
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.AsignacionAula import AsignacionAula
+from app.models.AsignacionSinodal import AsignacionSinodal
+from app.models.GrupoExamen import GrupoExamen
+from app.models.SolicitudExamen import SolicitudExamen
+from app.repositories.base_repository import BaseRepository, Pagina
+from app.schemas.ExamenSchema import ExamenCreate, ExamenDetalle
+from app.schemas.SolicitudExamenSchema import SolicitudExamenUpdate
+
+
+class ExamenRepository(BaseRepository[SolicitudExamen, ExamenCreate, SolicitudExamenUpdate]):
+    """
+    Un examen completo: la solicitud junto con sus grupos, aulas y sinodales
+
+    Las lecturas cargan todo lo que pide ExamenDetalle con un número fijo de consultas
+    (la solicitud con su periodo, evaluación y materia, y una consulta por cada tabla hija
+    con sus grupos, aulas y profesores), sin importar cuántos exámenes traiga la página.
+    """
+
+    def __init__(self, db: Session):
+        super().__init__(SolicitudExamen, db)
+        self.con_esquema(ExamenDetalle)
+
+    def get_detalle(self, id_horario: str) -> Optional[SolicitudExamen]:
+        return self.consulta().filter(SolicitudExamen.id_horario == id_horario).first()
+
+    def get_detalles(
+            self,
+            id_periodo: Optional[str] = None,
+            skip: int = 0,
+            limit: int = 100,
+            cursor: Optional[str] = None
+    ) -> Pagina:
+        query = self.db.query(SolicitudExamen)
+        if id_periodo is not None:
+            query = query.filter(SolicitudExamen.id_periodo == id_periodo)
+        return self.paginar(query, skip, limit, cursor)
+
+    def create_completo(
+            self,
+            solicitud: Dict[str, Any],
+            grupos: List[Dict[str, Any]],
+            aulas: List[Dict[str, Any]],
+            sinodales: List[Dict[str, Any]]
+    ):
+        """
+        Inserta la solicitud y un INSERT de múltiples filas por cada tabla hija en una sola
+        transacción: o se guarda el examen completo o no se guarda nada
+        """
+        try:
+            self.db.execute(insert(SolicitudExamen).values(**solicitud))
+            for modelo, filas in ((GrupoExamen, grupos), (AsignacionAula, aulas), (AsignacionSinodal, sinodales)):
+                if filas:
+                    self.db.execute(insert(modelo), filas)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
\ No newline at end of file
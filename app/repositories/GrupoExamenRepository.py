@@ -1,7 +1,10 @@
-from typing import List, Optional
+from typing import Any, List, Optional, Tuple
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from app.models.GrupoEscolar import GrupoEscolar
 from app.models.GrupoExamen import GrupoExamen
+from app.models.SolicitudExamen import SolicitudExamen
 from app.repositories.base_repository import BaseRepository
 from app.schemas.GrupoExamenSchema import GrupoExamenCreate, GrupoExamenUpdate
 
@@ -14,11 +17,48 @@ class GrupoExamenRepository(BaseRepository[GrupoExamen, GrupoExamenCreate, Grupo
         return self.db.query(GrupoExamen).filter(GrupoExamen.id_examen_grupo == id_examen_grupo).first()
 
     def get_by_solicitud(self, id_horario: str) -> List[GrupoExamen]:
-        return self.db.query(GrupoExamen).filter(
+        return self.consulta().filter(
             GrupoExamen.id_horario == id_horario
         ).all()
 
     def get_by_grupo(self, id_grupo: str) -> List[GrupoExamen]:
-        return self.db.query(GrupoExamen).filter(
+        return self.consulta().filter(
             GrupoExamen.id_grupo == id_grupo
-        ).all()
\ No newline at end of file
+        ).all()
+
+    def get_pares_por_periodo(self, id_periodo: str) -> List[Tuple[str, str]]:
+        """
+        Pares (id_horario, id_grupo) de todas las solicitudes de un periodo en una sola consulta
+        """
+        return self.db.query(GrupoExamen.id_horario, GrupoExamen.id_grupo).join(
+            SolicitudExamen, SolicitudExamen.id_horario == GrupoExamen.id_horario
+        ).filter(SolicitudExamen.id_periodo == id_periodo).all()
+
+    def get_ocupacion_por_periodo(self, id_periodo: str) -> List[Any]:
+        """
+        Grupos de cada examen del periodo junto con la fecha, horario y estado de la solicitud
+        """
+        return self.db.query(
+            GrupoExamen.id_examen_grupo,
+            GrupoExamen.id_horario,
+            GrupoExamen.id_grupo,
+            SolicitudExamen.fecha_examen,
+            SolicitudExamen.hora_inicio,
+            SolicitudExamen.hora_fin,
+            SolicitudExamen.estado
+        ).join(
+            SolicitudExamen, SolicitudExamen.id_horario == GrupoExamen.id_horario
+        ).filter(SolicitudExamen.id_periodo == id_periodo).all()
+
+    def get_alumnos_por_solicitud(self, id_periodo: str) -> List[Tuple[str, int]]:
+        """
+        Total de alumnos (suma de GrupoEscolar.numero_alumnos) por solicitud del periodo
+        """
+        return self.db.query(
+            GrupoExamen.id_horario,
+            func.coalesce(func.sum(GrupoEscolar.numero_alumnos), 0)
+        ).join(
+            SolicitudExamen, SolicitudExamen.id_horario == GrupoExamen.id_horario
+        ).join(
+            GrupoEscolar, GrupoEscolar.id_grupo == GrupoExamen.id_grupo
+        ).filter(SolicitudExamen.id_periodo == id_periodo).group_by(GrupoExamen.id_horario).all()
\ No newline at end of file
@@ -1,8 +1,8 @@
-from typing import List, Optional
+from typing import Optional
 from sqlalchemy.orm import Session, joinedload
 
 from app.models.GrupoEscolar import GrupoEscolar
-from app.repositories.base_repository import BaseRepository
+from app.repositories.base_repository import BaseRepository, Pagina
 from app.schemas.GrupoEscolarSchema import GrupoEscolarCreate, GrupoEscolarUpdate
 
 
@@ -18,7 +18,8 @@ class GrupoRepository(BaseRepository[GrupoEscolar, GrupoEscolarCreate, GrupoEsco
             joinedload(GrupoEscolar.carrera)
         ).filter(GrupoEscolar.id_grupo == id_grupo).first()
 
-    def get_by_carrera(self, id_carrera: str, skip: int = 0, limit: int = 100) -> List[GrupoEscolar]:
-        return self.db.query(GrupoEscolar).filter(
+    def get_by_carrera(self, id_carrera: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> Pagina:
+        query = self.db.query(GrupoEscolar).filter(
             GrupoEscolar.id_carrera == id_carrera
-        ).offset(skip).limit(limit).all()
\ No newline at end of file
+        )
+        return self.paginar(query, skip, limit, cursor)
\ No newline at end of file
@@ -1,10 +1,20 @@
-from typing import List, Optional
+import csv
+import io
+from datetime import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import column, insert, select, table, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session, joinedload
 
 from app.models.HorarioClase import HorarioClase
-from app.repositories.base_repository import BaseRepository
+from app.repositories.base_repository import BaseRepository, Pagina
 from app.schemas.HorarioClaseSchema import HorarioClaseCreate, HorarioClaseUpdate
 
+# Tabla temporal donde COPY deja las filas importadas antes de fusionarlas con la real
+TABLA_IMPORTACION = "horarios_importacion"
+# Ids por consulta al buscar los horarios que ya existen
+TAMANO_BLOQUE_IDS = 10000
+
 
 class HorarioRepository(BaseRepository[HorarioClase, HorarioClaseCreate, HorarioClaseUpdate]):
     def __init__(self, db: Session):
@@ -22,12 +32,113 @@ class HorarioRepository(BaseRepository[HorarioClase, HorarioClaseCreate, Horario
             joinedload(HorarioClase.aula)
         ).filter(HorarioClase.id_horario_clase == id_horario).first()
 
-    def get_by_profesor(self, id_profesor: str, skip: int = 0, limit: int = 100) -> List[HorarioClase]:
-        return self.db.query(HorarioClase).filter(
+    def get_by_profesor(
+            self,
+            id_profesor: str,
+            skip: int = 0,
+            limit: int = 100,
+            cursor: Optional[str] = None
+    ) -> Pagina:
+        query = self.db.query(HorarioClase).filter(
             HorarioClase.id_profesor == id_profesor
-        ).offset(skip).limit(limit).all()
+        )
+        return self.paginar(query, skip, limit, cursor)
 
-    def get_by_grupo(self, id_grupo: str, skip: int = 0, limit: int = 100) -> List[HorarioClase]:
-        return self.db.query(HorarioClase).filter(
+    def get_by_grupo(self, id_grupo: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> Pagina:
+        query = self.db.query(HorarioClase).filter(
             HorarioClase.id_grupo == id_grupo
-        ).offset(skip).limit(limit).all()
\ No newline at end of file
+        )
+        return self.paginar(query, skip, limit, cursor)
+
+    def get_bloques_por_periodo(self, id_periodo: str) -> List[Tuple[str, int, time, time]]:
+        """
+        Bloques (id_grupo, dia_semana, hora_inicio, hora_fin) de un periodo, sin materializar objetos ORM
+        """
+        return self.db.query(
+            HorarioClase.id_grupo,
+            HorarioClase.dia_semana,
+            HorarioClase.hora_inicio,
+            HorarioClase.hora_fin
+        ).filter(HorarioClase.id_periodo == id_periodo).all()
+
+    def get_ocupacion_por_periodo(self, id_periodo: str) -> List[Any]:
+        """
+        Recursos y horario de cada clase del periodo, sin materializar objetos ORM
+        """
+        return self.db.query(
+            HorarioClase.id_horario_clase,
+            HorarioClase.id_aula,
+            HorarioClase.id_profesor,
+            HorarioClase.id_grupo,
+            HorarioClase.dia_semana,
+            HorarioClase.hora_inicio,
+            HorarioClase.hora_fin
+        ).filter(HorarioClase.id_periodo == id_periodo).all()
+
+    def periodos_de(self, ids: Iterable[str]) -> Dict[str, str]:
+        """
+        Periodo actual de los horarios que ya existen entre los ids dados, en bloques de TAMANO_BLOQUE_IDS
+        """
+        ids = list(set(ids))
+        periodos: Dict[str, str] = {}
+        for inicio in range(0, len(ids), TAMANO_BLOQUE_IDS):
+            bloque = ids[inicio:inicio + TAMANO_BLOQUE_IDS]
+            periodos.update(self.db.execute(
+                select(HorarioClase.id_horario_clase, HorarioClase.id_periodo)
+                .where(HorarioClase.id_horario_clase.in_(bloque))
+            ).all())
+        return periodos
+
+    def importar(self, filas: List[Dict[str, Any]], existentes: Set[str]) -> int:
+        """
+        Inserta o reemplaza (por id_horario_clase) todas las filas en una sola transacción
+        En PostgreSQL las carga con COPY a una tabla temporal y las fusiona con un solo
+        INSERT ... SELECT ... ON CONFLICT; en otros motores usa un INSERT y un UPDATE de
+        múltiples filas, separando las nuevas de las `existentes`.
+        """
+        if not filas:
+            return 0
+        try:
+            if self.db.get_bind().dialect.name == "postgresql":
+                self._copiar_y_fusionar(filas)
+            else:
+                nuevas = [fila for fila in filas if fila["id_horario_clase"] not in existentes]
+                cambios = [fila for fila in filas if fila["id_horario_clase"] in existentes]
+                if nuevas:
+                    self.db.execute(insert(HorarioClase), nuevas)
+                if cambios:
+                    self.db.execute(update(HorarioClase), cambios)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return len(filas)
+
+    def _copiar_y_fusionar(self, filas: List[Dict[str, Any]]):
+        tabla = HorarioClase.__table__
+        columnas = [c.key for c in tabla.columns]
+        buffer = io.StringIO()
+        escritor = csv.writer(buffer)
+        for fila in filas:
+            escritor.writerow([fila[c].isoformat() if isinstance(fila[c], time) else fila[c] for c in columnas])
+        buffer.seek(0)
+
+        conexion = self.db.connection()
+        conexion.exec_driver_sql(
+            f"CREATE TEMP TABLE {TABLA_IMPORTACION} (LIKE {tabla.name} INCLUDING DEFAULTS) ON COMMIT DROP"
+        )
+        cursor = conexion.connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {TABLA_IMPORTACION} ({', '.join(columnas)}) FROM STDIN WITH (FORMAT csv)", buffer
+            )
+        finally:
+            cursor.close()
+
+        temporal = table(TABLA_IMPORTACION, *(column(c) for c in columnas))
+        fusion = pg_insert(tabla).from_select(columnas, select(*temporal.c))
+        fusion = fusion.on_conflict_do_update(
+            index_elements=[tabla.c.id_horario_clase],
+            set_={c: fusion.excluded[c] for c in columnas if c != "id_horario_clase"}
+        )
+        conexion.execute(fusion)
\ No newline at end of file
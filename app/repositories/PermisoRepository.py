@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from sqlalchemy.orm import Session
 
 from app.models.PermisoSinodal import PermisoSinodal
@@ -20,11 +20,17 @@ class PermisoRepository(BaseRepository[PermisoSinodal, PermisoSinodalCreate, Per
         ).first()
 
     def get_by_profesor(self, id_profesor: str) -> List[PermisoSinodal]:
-        return self.db.query(PermisoSinodal).filter(
+        return self.consulta().filter(
             PermisoSinodal.id_profesor == id_profesor
         ).all()
 
     def get_by_materia(self, id_materia: str) -> List[PermisoSinodal]:
-        return self.db.query(PermisoSinodal).filter(
+        return self.consulta().filter(
             PermisoSinodal.id_materia == id_materia
-        ).all()
\ No newline at end of file
+        ).all()
+
+    def get_pares(self) -> List[Tuple[str, str]]:
+        """
+        Matriz completa de permisos como pares (id_profesor, id_materia) en una sola consulta
+        """
+        return self.db.query(PermisoSinodal.id_profesor, PermisoSinodal.id_materia).all()
\ No newline at end of file
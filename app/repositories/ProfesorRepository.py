@@ -1,8 +1,16 @@
-from typing import List, Optional
+from datetime import date
+from typing import Any, List, Optional
+from sqlalchemy import Date, Integer, String, cast, literal, null, select, union_all
 from sqlalchemy.orm import Session
 
+from app.models.AsignacionAula import AsignacionAula
+from app.models.AsignacionSinodal import AsignacionSinodal
+from app.models.HorarioClase import HorarioClase
 from app.models.Profesor import Profesor
-from app.repositories.base_repository import BaseRepository
+from app.models.SolicitudExamen import SolicitudExamen
+from app.repositories.base_repository import BaseRepository, Pagina
+from app.schemas.AgendaSchema import APLICACION, CLASE, SINODAL
+from app.schemas.EstadoSolicitudSchema import EstadoSolicitud
 from app.schemas.ProfesorSchema import ProfesorCreate, ProfesorUpdate
 
 
@@ -13,7 +21,76 @@ class ProfesorRepository(BaseRepository[Profesor, ProfesorCreate, ProfesorUpdate
     def get_by_id(self, id_profesor: str) -> Optional[Profesor]:
         return self.db.query(Profesor).filter(Profesor.id_profesor == id_profesor).first()
 
-    def get_activos(self, skip: int = 0, limit: int = 100) -> List[Profesor]:
-        return self.db.query(Profesor).filter(
+    def get_activos(self, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> Pagina:
+        query = self.db.query(Profesor).filter(
             Profesor.is_disable == False
-        ).offset(skip).limit(limit).all()
\ No newline at end of file
+        )
+        return self.paginar(query, skip, limit, cursor)
+
+    def get_ids_activos(self) -> List[str]:
+        """
+        Identificadores de todos los profesores habilitados
+        """
+        return [fila.id_profesor for fila in self.db.query(Profesor.id_profesor).filter(Profesor.is_disable == False)]
+
+    def get_agenda(self, id_profesor: str, desde: date, hasta: date, id_periodo: Optional[str] = None) -> List[Any]:
+        """
+        Clases semanales, aplicaciones y sinodalías del profesor en una sola consulta (UNION ALL)
+
+        Cada fila trae tipo (CLASE, APLICACION o SINODAL), id_registro, id_horario, id_periodo,
+        id_materia, id_aula, id_grupo, dia_semana (clases), fecha (exámenes), hora_inicio y hora_fin.
+        Las clases vienen una vez por semana; los exámenes solo los de [desde, hasta] que no fueron rechazados.
+        """
+        rechazado = EstadoSolicitud.RECHAZADO.value
+        sin_fecha = cast(null(), Date)
+        clases = select(
+            literal(CLASE).label("tipo"),
+            HorarioClase.id_horario_clase.label("id_registro"),
+            cast(null(), String).label("id_horario"),
+            HorarioClase.id_periodo,
+            HorarioClase.id_materia,
+            HorarioClase.id_aula,
+            HorarioClase.id_grupo,
+            HorarioClase.dia_semana,
+            sin_fecha.label("fecha"),
+            HorarioClase.hora_inicio,
+            HorarioClase.hora_fin
+        ).where(
+            HorarioClase.id_profesor == id_profesor,
+            HorarioClase.dia_semana.is_not(None),
+            HorarioClase.hora_inicio.is_not(None),
+            HorarioClase.hora_fin.is_not(None)
+        )
+        if id_periodo is not None:
+            clases = clases.where(HorarioClase.id_periodo == id_periodo)
+
+        def examenes(tipo: str, modelo, llave, columna_profesor, columna_aula):
+            return select(
+                literal(tipo),
+                llave,
+                SolicitudExamen.id_horario,
+                SolicitudExamen.id_periodo,
+                SolicitudExamen.id_materia,
+                columna_aula,
+                cast(null(), String),
+                cast(null(), Integer),
+                SolicitudExamen.fecha_examen,
+                SolicitudExamen.hora_inicio,
+                SolicitudExamen.hora_fin
+            ).join(
+                SolicitudExamen, SolicitudExamen.id_horario == modelo.id_horario
+            ).where(
+                columna_profesor == id_profesor,
+                SolicitudExamen.fecha_examen.between(desde, hasta),
+                SolicitudExamen.estado != rechazado,
+                SolicitudExamen.hora_inicio.is_not(None),
+                SolicitudExamen.hora_fin.is_not(None)
+            )
+
+        return self.db.execute(union_all(
+            clases,
+            examenes(APLICACION, AsignacionAula, AsignacionAula.id_examen_aula,
+                     AsignacionAula.id_profesor_aplicador, AsignacionAula.id_aula),
+            examenes(SINODAL, AsignacionSinodal, AsignacionSinodal.id_examen_sinodal,
+                     AsignacionSinodal.id_profesor, cast(null(), String))
+        )).all()
\ No newline at end of file
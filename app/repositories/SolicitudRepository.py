@@ -1,9 +1,10 @@
-from typing import List, Optional
+from typing import List, Optional, Dict, Any
+from sqlalchemy import update
 from sqlalchemy.orm import Session, joinedload
 from datetime import date
 
 from app.models.SolicitudExamen import SolicitudExamen
-from app.repositories.base_repository import BaseRepository
+from app.repositories.base_repository import BaseRepository, Pagina
 from app.schemas.EstadoSolicitudSchema import EstadoSolicitud
 from app.schemas.SolicitudExamenSchema import SolicitudExamenCreate, SolicitudExamenUpdate
 
@@ -22,17 +23,66 @@ class SolicitudRepository(BaseRepository[SolicitudExamen, SolicitudExamenCreate,
             joinedload(SolicitudExamen.materia)
         ).filter(SolicitudExamen.id_horario == id_horario).first()
 
-    def get_by_estado(self, estado: EstadoSolicitud, skip: int = 0, limit: int = 100) -> List[SolicitudExamen]:
-        return self.db.query(SolicitudExamen).filter(
+    def get_by_estado(
+            self,
+            estado: EstadoSolicitud,
+            skip: int = 0,
+            limit: int = 100,
+            cursor: Optional[str] = None
+    ) -> Pagina:
+        query = self.db.query(SolicitudExamen).filter(
             SolicitudExamen.estado == estado.value
-        ).offset(skip).limit(limit).all()
+        )
+        return self.paginar(query, skip, limit, cursor)
 
-    def get_by_fecha(self, fecha: date, skip: int = 0, limit: int = 100) -> List[SolicitudExamen]:
-        return self.db.query(SolicitudExamen).filter(
+    def get_by_fecha(self, fecha: date, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> Pagina:
+        query = self.db.query(SolicitudExamen).filter(
             SolicitudExamen.fecha_examen == fecha
-        ).offset(skip).limit(limit).all()
+        )
+        return self.paginar(query, skip, limit, cursor)
 
-    def get_by_periodo(self, id_periodo: str, skip: int = 0, limit: int = 100) -> List[SolicitudExamen]:
-        return self.db.query(SolicitudExamen).filter(
+    def get_by_periodo(self, id_periodo: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> Pagina:
+        query = self.db.query(SolicitudExamen).filter(
             SolicitudExamen.id_periodo == id_periodo
-        ).offset(skip).limit(limit).all()
\ No newline at end of file
+        )
+        return self.paginar(query, skip, limit, cursor)
+
+    def get_resumen_por_periodo(self, id_periodo: str) -> List[Any]:
+        """
+        Columnas necesarias para calendarizar todas las solicitudes de un periodo, sin objetos ORM
+        """
+        return self.db.query(
+            SolicitudExamen.id_horario,
+            SolicitudExamen.id_evaluacion,
+            SolicitudExamen.fecha_examen,
+            SolicitudExamen.hora_inicio,
+            SolicitudExamen.hora_fin,
+            SolicitudExamen.estado,
+            SolicitudExamen.is_manualmente_editado
+        ).filter(SolicitudExamen.id_periodo == id_periodo).all()
+
+    def update_horarios(self, cambios: List[Dict[str, Any]]) -> int:
+        """
+        Actualiza fecha y horas de varias solicitudes en un solo UPDATE por lotes y una transacción
+        Cada elemento debe incluir id_horario
+        """
+        if not cambios:
+            return 0
+        self.db.execute(update(SolicitudExamen), cambios)
+        self.db.commit()
+        return len(cambios)
+
+    def get_aprobadas_por_periodo(self, id_periodo: str) -> List[Any]:
+        """
+        Fecha y horario de las solicitudes aprobadas de un periodo, sin objetos ORM
+        """
+        return self.db.query(
+            SolicitudExamen.id_horario,
+            SolicitudExamen.id_materia,
+            SolicitudExamen.fecha_examen,
+            SolicitudExamen.hora_inicio,
+            SolicitudExamen.hora_fin
+        ).filter(
+            SolicitudExamen.id_periodo == id_periodo,
+            SolicitudExamen.estado == EstadoSolicitud.APROBADO.value
+        ).all()
\ No newline at end of file
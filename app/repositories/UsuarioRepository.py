@@ -1,8 +1,10 @@
-from typing import Optional
+from datetime import datetime
+from typing import Dict, Optional
+from sqlalchemy import bindparam, update
 from sqlalchemy.orm import Session
 
 from app.models.Usuario import Usuario
-from app.repositories.base_repository import BaseRepository
+from app.repositories.base_repository import BaseRepository, Pagina
 from app.schemas.UsuarioSchema import UsuarioCreate, UsuarioUpdate
 
 
@@ -25,8 +27,31 @@ class UsuarioRepository(BaseRepository[Usuario, UsuarioCreate, UsuarioUpdate]):
         ).first()
         return usuario
 
-    def get_by_rol(self, rol: str, skip: int = 0, limit: int = 100):
-        return self.db.query(Usuario).filter(
+    def get_by_rol(self, rol: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> Pagina:
+        query = self.db.query(Usuario).filter(
             Usuario.rol == rol,
             Usuario.is_active == True
-        ).offset(skip).limit(limit).all()
+        )
+        return self.paginar(query, skip, limit, cursor, orden=(Usuario.nombre_usuario,))
+
+    def update_last_login(self, ultimos: Dict[str, datetime]) -> int:
+        """
+        Actualiza last_login de varios usuarios en un solo UPDATE por lotes
+        Los usuarios que ya no existen se ignoran: un UPDATE de Core no revisa cuántas filas
+        cambió, así que un usuario borrado no hace fallar (y reintentar) el lote completo
+        """
+        if not ultimos:
+            return 0
+        sentencia = update(Usuario.__table__).where(
+            Usuario.id_usuario == bindparam("b_id_usuario")
+        ).values(last_login=bindparam("b_last_login"))
+        try:
+            self.db.execute(
+                sentencia,
+                [{"b_id_usuario": id_usuario, "b_last_login": cuando} for id_usuario, cuando in ultimos.items()]
+            )
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return len(ultimos)
\ No newline at end of file
@@ -1,3 +1,4 @@
+from datetime import date
 from typing import List, Optional
 from sqlalchemy.orm import Session
 
@@ -17,4 +18,13 @@ class VentanaRepository(BaseRepository[VentanaAplicacion, VentanaAplicacionCreat
         return self.db.query(VentanaAplicacion).filter(
             VentanaAplicacion.id_periodo == id_periodo,
             VentanaAplicacion.id_evaluacion == id_evaluacion
-        ).first()
\ No newline at end of file
+        ).first()
+
+    def get_periodos_en_fecha(self, fecha: date) -> List[str]:
+        """
+        Periodos con alguna ventana de aplicación que incluye la fecha
+        """
+        return [fila.id_periodo for fila in self.db.query(VentanaAplicacion.id_periodo).filter(
+            VentanaAplicacion.fecha_inicio_examenes <= fecha,
+            VentanaAplicacion.fecha_fin_examenes >= fecha
+        ).distinct().order_by(VentanaAplicacion.id_periodo)]
\ No newline at end of file
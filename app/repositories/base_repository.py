@@ -1,5 +1,14 @@
-from typing import Generic, TypeVar, Type, List, Optional, Dict, Any
-from sqlalchemy.orm import Session
+import base64
+import json
+from datetime import date, datetime, time
+from functools import lru_cache
+from typing import Generic, TypeVar, Type, List, Optional, Dict, Any, Iterable, Sequence, Set, Tuple, get_args
+from uuid import uuid4
+from pydantic import BaseModel
+from sqlalchemy import delete, func, insert, inspect, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query, Session, joinedload, selectinload
+from sqlalchemy.orm.strategy_options import Load
 from app.database import Base
 
 ModelType = TypeVar("ModelType", bound=Base)
@@ -7,10 +16,146 @@ CreateSchemaType = TypeVar("CreateSchemaType", bound=Base)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=Base)
 
 
+def generar_id(prefijo: str) -> str:
+    """
+    Genera un identificador único que cabe en las columnas String(20) de llave primaria
+    """
+    return f"{prefijo}{uuid4().hex[:20 - len(prefijo)]}"
+
+
+def _esquema_anidado(anotacion: Any) -> Optional[Type[BaseModel]]:
+    """
+    Esquema pydantic dentro de una anotación como Optional[X] o List[X], si lo hay
+    """
+    if isinstance(anotacion, type) and issubclass(anotacion, BaseModel):
+        return anotacion
+    for argumento in get_args(anotacion):
+        esquema = _esquema_anidado(argumento)
+        if esquema is not None:
+            return esquema
+    return None
+
+
+@lru_cache(maxsize=None)
+def opciones_carga(modelo: Type[Base], esquema: Type[BaseModel], en_escritura: bool = False) -> Tuple[Load, ...]:
+    """
+    Opciones de carga anticipada para serializar `modelo` con el esquema de respuesta `esquema`
+
+    Cada campo del esquema que sea a su vez un esquema y coincida con una relación del modelo
+    se carga por adelantado, recorriendo también sus relaciones anidadas: las relaciones
+    muchos-a-uno con joinedload (van en la misma consulta) y las colecciones con selectinload
+    (una consulta por relación). Así el número de consultas de un listado queda fijo sin
+    importar el tamaño de la página, en lugar de un SELECT perezoso por fila y relación.
+    Con `en_escritura` todo se carga con selectinload, que es lo único que admite un
+    INSERT/UPDATE/DELETE ... RETURNING (no se le puede agregar un JOIN).
+    """
+    relaciones = inspect(modelo).relationships
+    opciones = []
+    for nombre, campo in esquema.model_fields.items():
+        # Un campo puede leer la relación con otro nombre (Field(validation_alias=...))
+        if isinstance(campo.validation_alias, str):
+            nombre = campo.validation_alias
+        anidado = _esquema_anidado(campo.annotation)
+        if anidado is None or nombre not in relaciones:
+            continue
+        relacion = relaciones[nombre]
+        cargador = selectinload if relacion.uselist or en_escritura else joinedload
+        opcion = cargador(getattr(modelo, nombre))
+        subopciones = opciones_carga(relacion.mapper.class_, anidado, en_escritura)
+        if subopciones:
+            opcion = opcion.options(*subopciones)
+        opciones.append(opcion)
+    return tuple(opciones)
+
+
+class CursorInvalidoError(ValueError):
+    """
+    El cursor de paginación no se pudo decodificar o no corresponde al listado
+    """
+
+
+class Pagina(list):
+    """
+    Lista de resultados que además conoce el cursor de la página siguiente (None si es la última)
+    Al ser una lista, los servicios y endpoints que ya la usaban como tal no cambian
+    """
+
+    def __init__(self, items: Sequence[Any] = (), next_cursor: Optional[str] = None):
+        super().__init__(items)
+        self.next_cursor = next_cursor
+
+
+def codificar_cursor(valores: Sequence[Any]) -> str:
+    """
+    Convierte los valores de la llave de ordenamiento de la última fila en un token opaco
+    """
+    datos = [v.isoformat() if isinstance(v, (date, time)) else v for v in valores]
+    return base64.urlsafe_b64encode(json.dumps(datos, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor: str, columnas: Sequence[Any]) -> List[Any]:
+    """
+    Recupera los valores de un cursor y los convierte al tipo de cada columna de la llave
+    """
+    try:
+        datos = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(datos, list) or len(datos) != len(columnas):
+            raise ValueError
+        valores = []
+        for valor, columna in zip(datos, columnas):
+            tipo = columna.type.python_type
+            if valor is not None and tipo in (date, time, datetime):
+                valor = tipo.fromisoformat(valor)
+            elif valor is not None and not isinstance(valor, tipo):
+                valor = tipo(valor)
+            valores.append(valor)
+        return valores
+    except (ValueError, TypeError, NotImplementedError):
+        raise CursorInvalidoError("Cursor de paginación inválido")
+
+
+def filtro_cursor(cursor: str, columnas: Sequence[Any]):
+    """
+    Condición "fila posterior al cursor" sobre las columnas de la llave de ordenamiento
+    """
+    valores = decodificar_cursor(cursor, columnas)
+    if len(columnas) == 1:
+        return columnas[0] > valores[0]
+    return tuple_(*columnas) > tuple_(*valores)
+
+
+def armar_pagina(filas: Sequence[Any], limit: int, columnas: Sequence[Any]) -> Pagina:
+    """
+    Recorta las limit + 1 filas leídas y calcula el cursor si hubo una fila de más
+    """
+    if len(filas) <= limit:
+        return Pagina(filas)
+    filas = filas[:limit]
+    ultima = filas[-1]
+    return Pagina(filas, codificar_cursor([getattr(ultima, columna.key) for columna in columnas]))
+
+
 class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def __init__(self, model: Type[ModelType], db: Session):
         self.model = model
         self.db = db
+        self.opciones_carga: Tuple[Load, ...] = ()
+        self.opciones_escritura: Tuple[Load, ...] = ()
+
+    def con_esquema(self, esquema: Type[BaseModel]) -> "BaseRepository":
+        """
+        Hace que los listados y las escrituras carguen por adelantado lo que necesita el esquema
+        de respuesta. Se configura en la dependencia de cada router con su response_model
+        """
+        self.opciones_carga = opciones_carga(self.model, esquema)
+        self.opciones_escritura = opciones_carga(self.model, esquema, en_escritura=True)
+        return self
+
+    def consulta(self) -> Query:
+        """
+        Consulta base del modelo con las opciones de carga del esquema de respuesta
+        """
+        return self.db.query(self.model).options(*self.opciones_carga)
 
     def get(self, id: str) -> Optional[ModelType]:
         return self.db.query(self.model).filter(self.model.id == id).first()
@@ -18,33 +163,347 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def get_by_id(self, id: str) -> Optional[ModelType]:
         return self.db.query(self.model).filter(getattr(self.model, f"id_{self.model.__tablename__}") == id).first()
 
-    def get_all(self, skip: int = 0, limit: int = 100) -> List[ModelType]:
-        return self.db.query(self.model).offset(skip).limit(limit).all()
+    def get_all(self, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> Pagina:
+        return self.paginar(self.db.query(self.model), skip, limit, cursor)
+
+    def paginar(
+            self,
+            query: Query,
+            skip: int = 0,
+            limit: int = 100,
+            cursor: Optional[str] = None,
+            orden: Sequence[Any] = ()
+    ) -> Pagina:
+        """
+        Pagina una consulta por llave (keyset): ordena por `orden` más la llave primaria y,
+        con cursor, filtra las filas posteriores a la última fila entregada en lugar de usar
+        OFFSET, así que cualquier página cuesta lo mismo que la primera.
+        También aplica las opciones de carga del esquema de respuesta (ver con_esquema).
+        Las columnas de `orden` no deben admitir NULL.
+        `skip` se conserva para clientes anteriores y solo se aplica cuando no hay cursor.
+        """
+        columnas = list(orden) + list(inspect(self.model).primary_key)
+        query = query.options(*self.opciones_carga).order_by(*columnas)
+        if cursor:
+            query = query.filter(filtro_cursor(cursor, columnas))
+        elif skip:
+            query = query.offset(skip)
+
+        # Una fila extra indica si existe la página siguiente
+        return armar_pagina(query.limit(limit + 1).all(), limit, columnas)
 
     def create(self, obj_in: CreateSchemaType) -> ModelType:
-        obj_data = obj_in.dict()
-        db_obj = self.model(**obj_data)
-        self.db.add(db_obj)
-        self.db.commit()
-        self.db.refresh(db_obj)
-        return db_obj
+        return self._escribir(insert(self.model).values(**obj_in.dict()))
 
     def update(self, id: str, obj_in: UpdateSchemaType) -> Optional[ModelType]:
-        db_obj = self.get_by_id(id)
-        if db_obj:
-            update_data = obj_in.dict(exclude_unset=True)
-            for field, value in update_data.items():
-                setattr(db_obj, field, value)
-            self.db.commit()
-            self.db.refresh(db_obj)
-        return db_obj
+        update_data = obj_in.dict(exclude_unset=True)
+        if not update_data:
+            # Nada que escribir: la fila tal cual, buscada por la llave primaria real del modelo
+            return self.db.scalars(
+                select(self.model).where(self.llave == id).options(*self.opciones_escritura)
+            ).one_or_none()
+        return self._escribir(update(self.model).where(self.llave == id).values(**update_data))
 
     def delete(self, id: str) -> Optional[ModelType]:
-        db_obj = self.get_by_id(id)
-        if db_obj:
-            self.db.delete(db_obj)
-            self.db.commit()
+        return self._escribir(delete(self.model).where(self.llave == id))
+
+    def _escribir(self, sentencia) -> Optional[ModelType]:
+        """
+        Ejecuta un INSERT/UPDATE/DELETE de una fila con RETURNING y confirma la transacción
+
+        La fila escrita vuelve en la misma sentencia, así que no hace falta un SELECT antes
+        ni un refresh después. Las relaciones que pide el esquema de respuesta se cargan con
+        selectinload antes del commit, y el commit no expira la instancia: así se puede
+        serializar aun cuando la fila ya se borró.
+        """
+        try:
+            db_obj = self.db.scalars(
+                sentencia.returning(self.model).options(*self.opciones_escritura),
+                execution_options={"populate_existing": True}
+            ).one_or_none()
+            expirar = self.db.expire_on_commit
+            self.db.expire_on_commit = False
+            try:
+                self.db.commit()
+            finally:
+                self.db.expire_on_commit = expirar
+        except Exception:
+            self.db.rollback()
+            raise
         return db_obj
 
     def count(self) -> int:
-        return self.db.query(self.model).count()
\ No newline at end of file
+        return self.db.query(self.model).count()
+
+    def separar(self, resultado: Any) -> Any:
+        """
+        Separa de la sesión la fila o filas leídas para poder guardarlas fuera de la petición
+        (caché de catálogos); devuelve el mismo resultado
+        """
+        for fila in (resultado if isinstance(resultado, list) else [resultado]):
+            if fila is not None and fila in self.db:
+                self.db.expunge(fila)
+        return resultado
+
+    def stream(
+            self,
+            columnas: Sequence[str],
+            filtros: Optional[Dict[str, Any]] = None,
+            tamano_lote: int = 1000
+    ) -> Iterable[Sequence[Any]]:
+        """
+        Recorre la tabla en lotes de `tamano_lote` tuplas con las columnas dadas, ordenadas por
+        llave primaria, con un cursor del lado del servidor: la memoria no crece con el
+        tamaño de la tabla. `filtros` son igualdades columna = valor.
+        """
+        tabla = self.model.__table__
+        consulta = select(*(tabla.c[columna] for columna in columnas)).order_by(*inspect(self.model).primary_key)
+        for columna, valor in (filtros or {}).items():
+            consulta = consulta.where(tabla.c[columna] == valor)
+        resultado = self.db.execute(consulta.execution_options(yield_per=tamano_lote))
+        try:
+            for lote in resultado.partitions():
+                yield lote
+        finally:
+            resultado.close()
+
+    @property
+    def llave(self):
+        """
+        Columna de llave primaria del modelo
+        """
+        return inspect(self.model).primary_key[0]
+
+    def get_many(self, ids: Iterable[str]) -> Dict[str, ModelType]:
+        """
+        Filas con los ids dados en una sola consulta, separadas de la sesión
+        Se separan para conservar sus valores anteriores después de un commit (lotes)
+        """
+        ids = list(set(ids))
+        if not ids:
+            return {}
+        llave = self.llave
+        filas = self.db.query(self.model).filter(llave.in_(ids)).all()
+        for fila in filas:
+            self.db.expunge(fila)
+        return {getattr(fila, llave.key): fila for fila in filas}
+
+    def ids_existentes(self, ids: Iterable[str]) -> Set[str]:
+        ids = list(set(ids))
+        if not ids:
+            return set()
+        llave = self.llave
+        return set(self.db.execute(select(llave).where(llave.in_(ids))).scalars())
+
+    def ids_referenciables(self) -> Dict[str, Set[Any]]:
+        """
+        Todos los valores válidos de cada columna foránea (los ids de la tabla a la que apunta),
+        con una consulta por columna. Para validar archivos grandes contra conjuntos en memoria
+        en lugar de consultar por fila; las tablas referenciadas son catálogos pequeños.
+        """
+        validos: Dict[str, Set[Any]] = {}
+        for columna in self.model.__table__.columns:
+            for foranea in columna.foreign_keys:
+                validos[columna.key] = set(self.db.execute(select(foranea.column)).scalars())
+        return validos
+
+    def errores_de_referencia(self, filas: Dict[int, Dict[str, Any]]) -> Dict[int, str]:
+        """
+        Filas cuyas llaves foráneas no existen, con una consulta por columna foránea
+        """
+        errores: Dict[int, str] = {}
+        for columna in self.model.__table__.columns:
+            for foranea in columna.foreign_keys:
+                valores = {fila[columna.key] for fila in filas.values() if fila.get(columna.key) is not None}
+                if not valores:
+                    continue
+                destino = foranea.column
+                existentes = set(self.db.execute(select(destino).where(destino.in_(valores))).scalars())
+                for i, fila in filas.items():
+                    valor = fila.get(columna.key)
+                    if valor is not None and valor not in existentes and i not in errores:
+                        errores[i] = f"{columna.key}: no existe {valor} en {destino.table.name}"
+        return errores
+
+    def errores_de_unicidad(self, filas: Dict[int, Dict[str, Any]]) -> Dict[int, str]:
+        """
+        Filas que repiten el valor de una columna única, dentro del lote o contra la tabla
+        """
+        errores: Dict[int, str] = {}
+        llave = self.llave
+        for columna in self.model.__table__.columns:
+            if not columna.unique or columna.primary_key:
+                continue
+            primera: Dict[Any, int] = {}
+            for i, fila in filas.items():
+                valor = fila.get(columna.key)
+                if valor is None:
+                    continue
+                if valor in primera:
+                    errores.setdefault(i, f"{columna.key}: {valor} se repite en la fila {primera[valor]}")
+                else:
+                    primera[valor] = i
+            if not primera:
+                continue
+            duenos = dict(self.db.execute(select(columna, llave).where(columna.in_(list(primera)))).all())
+            for i, fila in filas.items():
+                valor = fila.get(columna.key)
+                if valor in duenos and duenos[valor] != fila.get(llave.key):
+                    errores.setdefault(i, f"{columna.key}: {valor} ya está registrado")
+        return errores
+
+    def referencias_en_uso(self, ids: Iterable[str]) -> Dict[str, str]:
+        """
+        Ids referenciados desde otras tablas (no se pueden borrar), con una consulta por llave foránea
+        """
+        ids = list(set(ids))
+        tabla = self.model.__table__
+        en_uso: Dict[str, str] = {}
+        if not ids:
+            return en_uso
+        for otra in tabla.metadata.sorted_tables:
+            for foranea in otra.foreign_keys:
+                if foranea.column.table is not tabla:
+                    continue
+                usados = self.db.execute(select(foranea.parent).where(foranea.parent.in_(ids)).distinct()).scalars()
+                for valor in usados:
+                    en_uso.setdefault(valor, f"Está referenciado desde {otra.name}")
+        return en_uso
+
+    def create_many(self, filas: List[Dict[str, Any]]) -> int:
+        """
+        Inserta varias filas con un INSERT de múltiples filas en una sola transacción
+        """
+        if not filas:
+            return 0
+        try:
+            self.db.execute(insert(self.model), filas)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return len(filas)
+
+    def update_many(self, filas: List[Dict[str, Any]]) -> int:
+        """
+        Actualiza varias filas por llave primaria (cada dict incluye la llave) en una sola transacción
+        """
+        if not filas:
+            return 0
+        try:
+            self.db.execute(update(self.model), filas)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return len(filas)
+
+    def delete_many(self, ids: List[str]) -> int:
+        """
+        Borra varias filas con un solo DELETE ... WHERE llave IN (...)
+        """
+        if not ids:
+            return 0
+        try:
+            resultado = self.db.execute(
+                delete(self.model).where(self.llave.in_(ids)).execution_options(synchronize_session=False)
+            )
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return resultado.rowcount
+
+
+class AsyncBaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    """
+    Variante asíncrona de BaseRepository sobre una AsyncSession (modo DB_ASYNC)
+
+    Una sesión asíncrona no puede cargar relaciones de forma perezosa, así que todo lo que
+    vaya a serializarse tiene que venir en la consulta: se configura con con_esquema igual
+    que el repositorio síncrono y las lecturas aplican siempre esas opciones de carga.
+    """
+
+    def __init__(self, model: Type[ModelType], db: AsyncSession):
+        self.model = model
+        self.db = db
+        self.opciones_carga: Tuple[Load, ...] = ()
+        self.opciones_escritura: Tuple[Load, ...] = ()
+
+    def con_esquema(self, esquema: Type[BaseModel]) -> "AsyncBaseRepository":
+        self.opciones_carga = opciones_carga(self.model, esquema)
+        self.opciones_escritura = opciones_carga(self.model, esquema, en_escritura=True)
+        return self
+
+    @property
+    def llave(self):
+        return inspect(self.model).primary_key[0]
+
+    def consulta(self):
+        return select(self.model).options(*self.opciones_carga)
+
+    async def get_by_id(self, id: str) -> Optional[ModelType]:
+        resultado = await self.db.execute(self.consulta().where(self.llave == id))
+        return resultado.scalars().first()
+
+    async def get_all(self, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> Pagina:
+        return await self.paginar(select(self.model), skip, limit, cursor)
+
+    async def paginar(
+            self,
+            consulta,
+            skip: int = 0,
+            limit: int = 100,
+            cursor: Optional[str] = None,
+            orden: Sequence[Any] = ()
+    ) -> Pagina:
+        """
+        Misma paginación por llave que BaseRepository.paginar
+        """
+        columnas = list(orden) + list(inspect(self.model).primary_key)
+        consulta = consulta.options(*self.opciones_carga).order_by(*columnas)
+        if cursor:
+            consulta = consulta.where(filtro_cursor(cursor, columnas))
+        elif skip:
+            consulta = consulta.offset(skip)
+        resultado = await self.db.execute(consulta.limit(limit + 1))
+        return armar_pagina(resultado.scalars().all(), limit, columnas)
+
+    async def create(self, obj_in: CreateSchemaType) -> ModelType:
+        return await self._escribir(insert(self.model).values(**obj_in.dict()))
+
+    async def update(self, id: str, obj_in: UpdateSchemaType) -> Optional[ModelType]:
+        update_data = obj_in.dict(exclude_unset=True)
+        if not update_data:
+            return await self.get_by_id(id)
+        return await self._escribir(update(self.model).where(self.llave == id).values(**update_data))
+
+    async def delete(self, id: str) -> Optional[ModelType]:
+        return await self._escribir(delete(self.model).where(self.llave == id))
+
+    def separar(self, resultado: Any) -> Any:
+        for fila in (resultado if isinstance(resultado, list) else [resultado]):
+            if fila is not None and fila in self.db:
+                self.db.expunge(fila)
+        return resultado
+
+    async def count(self) -> int:
+        resultado = await self.db.execute(select(func.count()).select_from(self.model))
+        return resultado.scalar_one()
+
+    async def _escribir(self, sentencia) -> Optional[ModelType]:
+        """
+        Misma escritura de una fila con RETURNING que BaseRepository._escribir
+        (la sesión asíncrona ya se crea sin expirar al hacer commit)
+        """
+        try:
+            resultado = await self.db.scalars(
+                sentencia.returning(self.model).options(*self.opciones_escritura),
+                execution_options={"populate_existing": True}
+            )
+            db_obj = resultado.one_or_none()
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+        return db_obj
\ No newline at end of file
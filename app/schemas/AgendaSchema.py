@@ -0,0 +1,28 @@
+from datetime import date, time
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+CLASE = "clase"
+APLICACION = "aplicacion"
+SINODAL = "sinodal"
+
+
+class EventoAgenda(BaseModel):
+    tipo: str  # clase, aplicacion (aplicador de un examen) o sinodal
+    fecha: date
+    hora_inicio: time
+    hora_fin: time
+    id_registro: str  # id_horario_clase, id_examen_aula o id_examen_sinodal según el tipo
+    id_horario: Optional[str] = None  # solicitud de examen
+    id_periodo: Optional[str] = None
+    id_materia: Optional[str] = None
+    id_aula: Optional[str] = None
+    id_grupo: Optional[str] = None
+
+
+class Agenda(BaseModel):
+    id_profesor: str
+    desde: date
+    hasta: date
+    eventos: List[EventoAgenda] = []
\ No newline at end of file
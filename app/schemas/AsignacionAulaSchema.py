@@ -1,8 +1,9 @@
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel
 
 from app.schemas.AulaSchema import Aula
+from app.schemas.CalendarizacionSchema import SolicitudSinAsignar
 from app.schemas.ProfesorSchema import Profesor
 from app.schemas.SolicitudExamenSchema import SolicitudExamen
 
@@ -29,4 +30,11 @@ class AsignacionAula(AsignacionAulaBase):
     profesor_aplicador: Optional[Profesor] = None
 
     class Config:
-        orm_mode = True
\ No newline at end of file
+        orm_mode = True
+
+
+class ResultadoAsignacionAulas(BaseModel):
+    id_periodo: str
+    asignaciones: List[AsignacionAulaBase] = []
+    sin_asignar: List[SolicitudSinAsignar] = []
+    aplicado: bool = False
\ No newline at end of file
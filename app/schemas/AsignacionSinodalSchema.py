@@ -1,7 +1,8 @@
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel
 
+from app.schemas.CalendarizacionSchema import SolicitudSinAsignar
 from app.schemas.ProfesorSchema import Profesor
 from app.schemas.SolicitudExamenSchema import SolicitudExamen
 
@@ -25,4 +26,11 @@ class AsignacionSinodal(AsignacionSinodalBase):
     profesor: Optional[Profesor] = None
 
     class Config:
-        orm_mode = True
\ No newline at end of file
+        orm_mode = True
+
+
+class ResultadoAsignacionSinodales(BaseModel):
+    id_periodo: str
+    asignaciones: List[AsignacionSinodalBase] = []
+    sin_asignar: List[SolicitudSinAsignar] = []
+    aplicado: bool = False
\ No newline at end of file
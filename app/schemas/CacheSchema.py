@@ -0,0 +1,15 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class EstadisticasCache(BaseModel):
+    tabla: str
+    entradas: int
+    max_entradas: int
+    ttl: float
+    aciertos: int
+    fallos: int
+    tasa_aciertos: Optional[float] = None
+    desalojos: int
+    invalidaciones: int
\ No newline at end of file
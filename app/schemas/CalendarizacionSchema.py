@@ -0,0 +1,25 @@
+from datetime import date, time
+from typing import List
+
+from pydantic import BaseModel
+
+
+class PropuestaExamen(BaseModel):
+    id_horario: str
+    fecha_examen: date
+    hora_inicio: time
+    hora_fin: time
+
+
+class SolicitudSinAsignar(BaseModel):
+    id_horario: str
+    motivo: str
+
+
+class ResultadoCalendarizacion(BaseModel):
+    id_periodo: str
+    id_evaluacion: str
+    propuestas: List[PropuestaExamen] = []
+    sin_asignar: List[SolicitudSinAsignar] = []
+    fijas: int = 0
+    aplicado: bool = False
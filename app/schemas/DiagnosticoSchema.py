@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+
+
+class ResumenRuta(BaseModel):
+    metodo: str
+    ruta: str
+    peticiones: int
+    muestras: int
+    consultas_promedio: float
+    consultas_max: int
+    db_ms_promedio: float
+    total_ms_promedio: float
+    total_ms_p95: float
\ No newline at end of file
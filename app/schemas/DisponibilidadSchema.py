@@ -0,0 +1,22 @@
+from datetime import date, time
+from typing import List
+
+from pydantic import BaseModel
+
+
+class FranjaLibre(BaseModel):
+    hora_inicio: time
+    hora_fin: time
+
+
+class DiaDisponible(BaseModel):
+    fecha: date
+    franjas: List[FranjaLibre] = []
+
+
+class Disponibilidad(BaseModel):
+    id_ventana: str
+    id_periodo: str
+    grupos: List[str]
+    duracion_minutos: int
+    dias: List[DiaDisponible] = []
\ No newline at end of file
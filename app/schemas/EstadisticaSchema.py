@@ -0,0 +1,50 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class SolicitudesPorEstado(BaseModel):
+    estado: Optional[int] = None
+    nombre_estado: Optional[str] = None
+    total: int
+
+
+class SolicitudesPorCarrera(BaseModel):
+    id_carrera: str
+    nombre_carrera: Optional[str] = None
+    total: int
+
+
+class SolicitudesPorEvaluacion(BaseModel):
+    id_evaluacion: Optional[str] = None
+    nombre_evaluacion: Optional[str] = None
+    total: int
+
+
+class UsoAula(BaseModel):
+    id_aula: str
+    nombre_aula: Optional[str] = None
+    capacidad: Optional[int] = None
+    clases: int = 0
+    horas_clase_semana: float = 0
+    porcentaje_uso: float = 0  # horas de clase sobre las horas de la jornada de lunes a viernes
+    examenes: int = 0
+
+
+class CargaProfesor(BaseModel):
+    id_profesor: str
+    nombre_profesor: Optional[str] = None
+    sinodalias: int = 0
+    aplicaciones: int = 0
+    total: int = 0
+
+
+class EstadisticasPeriodo(BaseModel):
+    id_periodo: str
+    total_solicitudes: int
+    solicitudes_por_estado: List[SolicitudesPorEstado] = []
+    solicitudes_por_carrera: List[SolicitudesPorCarrera] = []
+    solicitudes_por_evaluacion: List[SolicitudesPorEvaluacion] = []
+    uso_aulas: List[UsoAula] = []
+    carga_profesores: List[CargaProfesor] = []
+    materializadas: bool = False
\ No newline at end of file
@@ -0,0 +1,74 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from app.schemas.AsignacionAulaSchema import AsignacionAulaBase
+from app.schemas.AsignacionSinodalSchema import AsignacionSinodalBase
+from app.schemas.AulaSchema import Aula
+from app.schemas.GrupoEscolarSchema import GrupoEscolar
+from app.schemas.GrupoExamenSchema import GrupoExamenBase
+from app.schemas.ProfesorSchema import Profesor
+from app.schemas.SolicitudExamenSchema import SolicitudExamen, SolicitudExamenBase
+
+MAX_ELEMENTOS_EXAMEN = 200
+
+
+# Filas hijas de un examen nuevo: el id_horario es el de la solicitud y los ids se generan si no vienen
+
+class GrupoExamenNuevo(BaseModel):
+    id_examen_grupo: Optional[str] = None
+    id_grupo: str
+
+
+class AulaExamenNueva(BaseModel):
+    id_examen_aula: Optional[str] = None
+    id_aula: str
+    id_profesor_aplicador: str
+
+
+class SinodalExamenNuevo(BaseModel):
+    id_examen_sinodal: Optional[str] = None
+    id_profesor: str
+
+
+class ExamenCreate(SolicitudExamenBase):
+    grupos: List[GrupoExamenNuevo] = Field([], max_length=MAX_ELEMENTOS_EXAMEN)
+    aulas: List[AulaExamenNueva] = Field([], max_length=MAX_ELEMENTOS_EXAMEN)
+    sinodales: List[SinodalExamenNuevo] = Field([], max_length=MAX_ELEMENTOS_EXAMEN)
+
+
+class Examen(SolicitudExamenBase):
+    grupos: List[GrupoExamenBase] = []
+    aulas: List[AsignacionAulaBase] = []
+    sinodales: List[AsignacionSinodalBase] = []
+
+
+# Examen con todo lo que referencia, para mostrarlo sin más peticiones. Los alias son los nombres
+# de las relaciones de SolicitudExamen, que es lo que usa opciones_carga para cargarlas por adelantado
+
+class GrupoDeExamen(GrupoExamenBase):
+    grupo: Optional[GrupoEscolar] = None
+
+    class Config:
+        orm_mode = True
+
+
+class AulaDeExamen(AsignacionAulaBase):
+    aula: Optional[Aula] = None
+    profesor_aplicador: Optional[Profesor] = None
+
+    class Config:
+        orm_mode = True
+
+
+class SinodalDeExamen(AsignacionSinodalBase):
+    profesor: Optional[Profesor] = None
+
+    class Config:
+        orm_mode = True
+
+
+class ExamenDetalle(SolicitudExamen):
+    grupos: List[GrupoDeExamen] = Field([], validation_alias="grupos_examen")
+    aulas: List[AulaDeExamen] = Field([], validation_alias="aulas_asignadas")
+    sinodales: List[SinodalDeExamen] = Field([], validation_alias="sinodales_asignados")
\ No newline at end of file
@@ -0,0 +1,21 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+# Errores que se detallan en la respuesta; `fallidos` siempre trae el total
+MAX_ERRORES_REPORTE = 1000
+
+
+class ErrorLinea(BaseModel):
+    linea: int
+    id: Optional[str] = None
+    error: str
+
+
+class ResultadoImportacion(BaseModel):
+    aplicado: bool
+    total: int
+    creados: int
+    actualizados: int
+    fallidos: int
+    errores: List[ErrorLinea] = []
\ No newline at end of file
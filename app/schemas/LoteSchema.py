@@ -0,0 +1,39 @@
+from functools import lru_cache
+from typing import List, Optional, Type
+
+from pydantic import BaseModel, Field, create_model
+
+MAX_FILAS_LOTE = 10000
+
+CREADO = "creado"
+ACTUALIZADO = "actualizado"
+ELIMINADO = "eliminado"
+ERROR = "error"
+OMITIDO = "omitido"  # fila válida que no se escribió porque el lote se rechazó
+
+
+class EliminacionLote(BaseModel):
+    ids: List[str] = Field(..., min_length=1, max_length=MAX_FILAS_LOTE)
+
+
+class ResultadoFila(BaseModel):
+    indice: int
+    id: Optional[str] = None
+    estado: str
+    error: Optional[str] = None
+
+
+class ResultadoLote(BaseModel):
+    aplicado: bool
+    total: int
+    exitosos: int
+    fallidos: int
+    resultados: List[ResultadoFila] = []
+
+
+@lru_cache(maxsize=None)
+def esquema_actualizacion_lote(esquema: Type[BaseModel], llave: str) -> Type[BaseModel]:
+    """
+    Esquema de actualización de un recurso con su llave primaria obligatoria, para PATCH por lotes
+    """
+    return create_model(f"{esquema.__name__}Lote", __base__=esquema, **{llave: (str, ...)})
\ No newline at end of file
@@ -0,0 +1,91 @@
+"""
+Agenda de un profesor: sus clases semanales convertidas a fechas junto con los exámenes donde
+es aplicador o sinodal, en una sola línea de tiempo
+
+Las agendas se calculan por meses completos con una sola consulta (ProfesorRepository.get_agenda)
+y se guardan en una caché (ver app.services.catalogo), así que recorrer un mes semana por semana
+solo consulta la base de datos la primera vez. Cualquier cambio en la ocupación (clases,
+asignaciones o solicitudes, ver ocupacion.al_cambiar) vacía la caché; con varios workers un
+cambio hecho en otro proceso tarda a lo más TTL_AGENDA segundos en verse.
+"""
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+from typing import Iterator, List, Optional, Tuple
+
+from app.repositories.ProfesorRepository import ProfesorRepository
+from app.schemas.AgendaSchema import CLASE, Agenda, EventoAgenda
+from app.services import catalogo, ocupacion
+
+TTL_AGENDA = 60
+MAX_DIAS_AGENDA = 186
+
+cache_agendas = catalogo.cache_de("agendas", ttl=TTL_AGENDA, max_entradas=512)
+ocupacion.al_cambiar(cache_agendas.invalidar)
+
+
+def inicio_de_mes(dia: date) -> date:
+    return dia.replace(day=1)
+
+
+def fin_de_mes(dia: date) -> date:
+    siguiente = dia.replace(day=28) + timedelta(days=4)
+    return siguiente - timedelta(days=siguiente.day)
+
+
+def fechas_de_clase(dia_semana: int, desde: date, hasta: date) -> Iterator[date]:
+    """
+    Fechas de [desde, hasta] que caen en el día de la semana dado (1 = lunes)
+    """
+    fecha = desde + timedelta(days=(dia_semana - desde.isoweekday()) % 7)
+    while fecha <= hasta:
+        yield fecha
+        fecha += timedelta(days=7)
+
+
+class AgendaService:
+    def __init__(self, profesor_repository: ProfesorRepository):
+        self.profesor_repository = profesor_repository
+
+    def get_agenda(
+            self,
+            id_profesor: str,
+            desde: date,
+            hasta: date,
+            id_periodo: Optional[str] = None
+    ) -> Optional[Agenda]:
+        """
+        Agenda del profesor entre dos fechas (inclusive), o None si el profesor no existe
+        `id_periodo` limita las clases a las de ese periodo (los periodos no tienen fechas)
+        """
+        if hasta < desde:
+            raise ValueError("hasta debe ser igual o posterior a desde")
+        if (hasta - desde).days >= MAX_DIAS_AGENDA:
+            raise ValueError(f"El rango no puede pasar de {MAX_DIAS_AGENDA} días")
+
+        inicio, fin = inicio_de_mes(desde), fin_de_mes(hasta)
+        fechas, eventos = cache_agendas.obtener(
+            ("agenda", id_profesor, id_periodo, inicio, fin),
+            lambda: self._calcular(id_profesor, inicio, fin, id_periodo)
+        )
+        eventos = eventos[bisect_left(fechas, desde):bisect_right(fechas, hasta)]
+        if not eventos and not self.profesor_repository.ids_existentes([id_profesor]):
+            return None
+        return Agenda(id_profesor=id_profesor, desde=desde, hasta=hasta, eventos=eventos)
+
+    def _calcular(self, id_profesor: str, desde: date, hasta: date,
+                  id_periodo: Optional[str]) -> Tuple[List[date], List[EventoAgenda]]:
+        """
+        Eventos ordenados de [desde, hasta] junto con la lista de sus fechas, para recortar rangos con bisect
+        """
+        eventos: List[EventoAgenda] = []
+        for fila in self.profesor_repository.get_agenda(id_profesor, desde, hasta, id_periodo):
+            datos = dict(fila._mapping)
+            dia_semana = datos.pop("dia_semana")
+            if datos["tipo"] == CLASE:
+                datos.pop("fecha")
+                eventos.extend(EventoAgenda(fecha=fecha, **datos)
+                               for fecha in fechas_de_clase(dia_semana, desde, hasta))
+            else:
+                eventos.append(EventoAgenda(**datos))
+        eventos.sort(key=lambda e: (e.fecha, e.hora_inicio, e.hora_fin, e.tipo, e.id_registro))
+        return [evento.fecha for evento in eventos], eventos
\ No newline at end of file
@@ -1,8 +1,9 @@
-from typing import List
+from typing import Any, Dict, List, Optional
 
 from app.models.AsignacionAula import AsignacionAula
 from app.repositories.AsignacionAulaRepository import AsignacionAulaRepository
 from app.schemas.AsignacionAulaSchema import AsignacionAulaCreate, AsignacionAulaUpdate
+from app.services import ocupacion
 from app.services.base_service import BaseService
 
 
@@ -18,4 +19,49 @@ class AsignacionAulaService(BaseService[AsignacionAula, AsignacionAulaCreate, As
         return self.repository.get_by_aula(id_aula)
 
     def get_by_profesor_aplicador(self, id_profesor: str) -> List[AsignacionAula]:
-        return self.repository.get_by_profesor_aplicador(id_profesor)
\ No newline at end of file
+        return self.repository.get_by_profesor_aplicador(id_profesor)
+
+    def create(self, obj_in: AsignacionAulaCreate) -> AsignacionAula:
+        """
+        Crea la asignación si el aula y el aplicador están libres en el horario del examen
+        """
+        recursos = [(ocupacion.AULA, obj_in.id_aula), (ocupacion.PROFESOR, obj_in.id_profesor_aplicador)]
+        registro = ocupacion.registro_aula(obj_in.id_examen_aula)
+        with ocupacion.reserva_examen(self.repository.db, registro, obj_in.id_horario, recursos):
+            return super().create(obj_in)
+
+    def update(self, id: str, obj_in: AsignacionAulaUpdate) -> Optional[AsignacionAula]:
+        actual = self.repository.get_by_id(id)
+        if actual is None:
+            return None
+        datos = obj_in.dict(exclude_unset=True)
+        recursos = [
+            (ocupacion.AULA, datos.get("id_aula", actual.id_aula)),
+            (ocupacion.PROFESOR, datos.get("id_profesor_aplicador", actual.id_profesor_aplicador))
+        ]
+        with ocupacion.reserva_examen(self.repository.db, ocupacion.registro_aula(id), actual.id_horario, recursos):
+            return super().update(id, obj_in)
+
+    def delete(self, id: str) -> Optional[AsignacionAula]:
+        asignacion = super().delete(id)
+        if asignacion is not None:
+            ocupacion.liberar(ocupacion.registro_aula(id))
+        return asignacion
+
+    def _reservar_lote(self, filas: Dict[int, Dict[str, Any]], actuales: Dict[str, AsignacionAula],
+                       reservas: ocupacion.ReservaLote, errores: Dict[int, str]):
+        examenes = {}
+        for i, fila in filas.items():
+            actual = actuales.get(fila["id_examen_aula"])
+            id_horario = actual.id_horario if actual is not None else fila.get("id_horario")
+            recursos = [
+                (ocupacion.AULA, fila.get("id_aula", actual.id_aula if actual is not None else None)),
+                (ocupacion.PROFESOR, fila.get("id_profesor_aplicador",
+                                              actual.id_profesor_aplicador if actual is not None else None))
+            ]
+            examenes[i] = (ocupacion.registro_aula(fila["id_examen_aula"]), id_horario, recursos)
+        ocupacion.reservar_examenes_lote(self.repository.db, reservas, examenes, errores)
+
+    def _despues_de_eliminar_lote(self, eliminados: List[AsignacionAula]):
+        for asignacion in eliminados:
+            ocupacion.liberar(ocupacion.registro_aula(asignacion.id_examen_aula))
\ No newline at end of file
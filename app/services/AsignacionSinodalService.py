@@ -1,8 +1,9 @@
-from typing import List
+from typing import Any, Dict, List, Optional
 
 from app.models.AsignacionSinodal import AsignacionSinodal
 from app.repositories.AsignacionSinodalRepository import AsignacionSinodalRepository
 from app.schemas.AsignacionSinodalSchema import AsignacionSinodalCreate, AsignacionSinodalUpdate
+from app.services import ocupacion
 from app.services.base_service import BaseService
 
 
@@ -15,4 +16,43 @@ class AsignacionSinodalService(BaseService[AsignacionSinodal, AsignacionSinodalC
         return self.repository.get_by_solicitud(id_horario)
 
     def get_by_profesor(self, id_profesor: str) -> List[AsignacionSinodal]:
-        return self.repository.get_by_profesor(id_profesor)
\ No newline at end of file
+        return self.repository.get_by_profesor(id_profesor)
+
+    def create(self, obj_in: AsignacionSinodalCreate) -> AsignacionSinodal:
+        """
+        Crea la asignación si el profesor está libre en el horario del examen
+        """
+        recursos = [(ocupacion.PROFESOR, obj_in.id_profesor)]
+        registro = ocupacion.registro_sinodal(obj_in.id_examen_sinodal)
+        with ocupacion.reserva_examen(self.repository.db, registro, obj_in.id_horario, recursos):
+            return super().create(obj_in)
+
+    def update(self, id: str, obj_in: AsignacionSinodalUpdate) -> Optional[AsignacionSinodal]:
+        actual = self.repository.get_by_id(id)
+        if actual is None:
+            return None
+        datos = obj_in.dict(exclude_unset=True)
+        recursos = [(ocupacion.PROFESOR, datos.get("id_profesor", actual.id_profesor))]
+        with ocupacion.reserva_examen(self.repository.db, ocupacion.registro_sinodal(id), actual.id_horario, recursos):
+            return super().update(id, obj_in)
+
+    def delete(self, id: str) -> Optional[AsignacionSinodal]:
+        asignacion = super().delete(id)
+        if asignacion is not None:
+            ocupacion.liberar(ocupacion.registro_sinodal(id))
+        return asignacion
+
+    def _reservar_lote(self, filas: Dict[int, Dict[str, Any]], actuales: Dict[str, AsignacionSinodal],
+                       reservas: ocupacion.ReservaLote, errores: Dict[int, str]):
+        examenes = {}
+        for i, fila in filas.items():
+            actual = actuales.get(fila["id_examen_sinodal"])
+            id_horario = actual.id_horario if actual is not None else fila.get("id_horario")
+            id_profesor = fila.get("id_profesor", actual.id_profesor if actual is not None else None)
+            examenes[i] = (ocupacion.registro_sinodal(fila["id_examen_sinodal"]), id_horario,
+                           [(ocupacion.PROFESOR, id_profesor)])
+        ocupacion.reservar_examenes_lote(self.repository.db, reservas, examenes, errores)
+
+    def _despues_de_eliminar_lote(self, eliminados: List[AsignacionSinodal]):
+        for asignacion in eliminados:
+            ocupacion.liberar(ocupacion.registro_sinodal(asignacion.id_examen_sinodal))
\ No newline at end of file
@@ -0,0 +1,187 @@
+import heapq
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import date
+from typing import Dict, List, Tuple
+
+from app.repositories.AsignacionAulaRepository import AsignacionAulaRepository
+from app.repositories.AulaRepository import AulaRepository
+from app.repositories.GrupoExamenRepository import GrupoExamenRepository
+from app.repositories.ProfesorRepository import ProfesorRepository
+from app.repositories.SolicitudRepository import SolicitudRepository
+from app.repositories.base_repository import generar_id
+from app.schemas.AsignacionAulaSchema import AsignacionAulaBase, ResultadoAsignacionAulas
+from app.schemas.CalendarizacionSchema import SolicitudSinAsignar
+from app.services import ocupacion, slots
+
+
+class AsignadorAulasService:
+    """
+    Asigna aulas y aplicadores a las solicitudes aprobadas de un periodo
+
+    Es un empaquetado (bin packing) por horario: las solicitudes con más alumnos se atienden
+    primero y a cada una se le da la menor aula donde caben todos sus alumnos o, si ninguna
+    alcanza, varias aulas empezando por las más grandes. La ocupación de aulas y profesores
+    se consulta en el índice del periodo (app.services.ocupacion), así que nunca se asigna
+    un aula o aplicador que ya tenga clase u otro examen en ese horario.
+    """
+
+    def __init__(
+            self,
+            asignacion_repository: AsignacionAulaRepository,
+            solicitud_repository: SolicitudRepository,
+            grupo_examen_repository: GrupoExamenRepository,
+            aula_repository: AulaRepository,
+            profesor_repository: ProfesorRepository
+    ):
+        self.asignacion_repository = asignacion_repository
+        self.solicitud_repository = solicitud_repository
+        self.grupo_examen_repository = grupo_examen_repository
+        self.aula_repository = aula_repository
+        self.profesor_repository = profesor_repository
+
+    def asignar(self, id_periodo: str, aplicar: bool = False) -> ResultadoAsignacionAulas:
+        """
+        Calcula las asignaciones de las solicitudes aprobadas que todavía no tienen aula
+        Si aplicar=True se insertan todas en una sola transacción
+        """
+        db = self.asignacion_repository.db
+        indice = ocupacion.get_indice(db, id_periodo)
+
+        aulas = sorted(
+            (capacidad or 0, id_aula) for id_aula, capacidad in self.aula_repository.get_capacidades_habilitadas()
+        )
+        alumnos = dict(self.grupo_examen_repository.get_alumnos_por_solicitud(id_periodo))
+        con_aula = self.asignacion_repository.get_solicitudes_con_aula(id_periodo)
+        pendientes = [
+            fila for fila in self.solicitud_repository.get_aprobadas_por_periodo(id_periodo)
+            if fila.id_horario not in con_aula
+        ]
+        pendientes.sort(key=lambda f: (-alumnos.get(f.id_horario, 0), f.id_horario))
+
+        # Aplicadores en un heap por carga para repartir el trabajo
+        carga: List[Tuple[int, str]] = [(0, id_profesor) for id_profesor in self.profesor_repository.get_ids_activos()]
+        heapq.heapify(carga)
+
+        # Ocupación generada en esta misma corrida
+        aulas_usadas: Dict[Tuple[str, date], int] = defaultdict(int)
+        profesores_usados: Dict[Tuple[str, date], int] = defaultdict(int)
+
+        asignaciones: List[AsignacionAulaBase] = []
+        sin_asignar: List[SolicitudSinAsignar] = []
+        for fila in pendientes:
+            necesarios = alumnos.get(fila.id_horario, 0)
+            if fila.fecha_examen is None or fila.hora_inicio is None or fila.hora_fin is None:
+                sin_asignar.append(SolicitudSinAsignar(id_horario=fila.id_horario,
+                                                       motivo="La solicitud no tiene fecha u horario"))
+                continue
+            if necesarios <= 0:
+                sin_asignar.append(SolicitudSinAsignar(id_horario=fila.id_horario,
+                                                       motivo="La solicitud no tiene grupos con alumnos"))
+                continue
+            fecha = fila.fecha_examen
+            bloque = slots.mascara(fila.hora_inicio, fila.hora_fin)
+
+            libres = [
+                (capacidad, id_aula) for capacidad, id_aula in aulas
+                if capacidad > 0 and not (
+                    (indice.ocupacion(ocupacion.AULA, id_aula, fecha) | aulas_usadas.get((id_aula, fecha), 0)) & bloque
+                )
+            ]
+            elegidas = self._elegir_aulas(libres, necesarios)
+            if elegidas is None:
+                disponible = sum(capacidad for capacidad, _ in libres)
+                sin_asignar.append(SolicitudSinAsignar(
+                    id_horario=fila.id_horario,
+                    motivo=f"Capacidad insuficiente: {necesarios} alumnos y {disponible} lugares libres en ese horario"
+                ))
+                continue
+
+            aplicadores = self._elegir_aplicadores(carga, len(elegidas), indice, profesores_usados, fecha, bloque)
+            if aplicadores is None:
+                sin_asignar.append(SolicitudSinAsignar(
+                    id_horario=fila.id_horario,
+                    motivo="No hay suficientes profesores libres para aplicar el examen"
+                ))
+                continue
+
+            for (_, id_aula), id_profesor in zip(elegidas, aplicadores):
+                aulas_usadas[(id_aula, fecha)] |= bloque
+                profesores_usados[(id_profesor, fecha)] |= bloque
+                asignaciones.append(AsignacionAulaBase(
+                    id_examen_aula=generar_id("AA"),
+                    id_horario=fila.id_horario,
+                    id_aula=id_aula,
+                    id_profesor_aplicador=id_profesor
+                ))
+
+        if aplicar:
+            self._guardar(indice, asignaciones, {fila.id_horario: fila for fila in pendientes})
+
+        return ResultadoAsignacionAulas(
+            id_periodo=id_periodo,
+            asignaciones=asignaciones,
+            sin_asignar=sin_asignar,
+            aplicado=aplicar
+        )
+
+    @staticmethod
+    def _elegir_aulas(libres: List[Tuple[int, str]], necesarios: int):
+        """
+        Menor aula suficiente o, si no hay, las mayores hasta cubrir a todos; None si no alcanza
+        `libres` debe estar ordenada por capacidad
+        """
+        capacidades = [capacidad for capacidad, _ in libres]
+        libres = list(libres)
+        elegidas = []
+        restante = necesarios
+        while restante > 0 and libres:
+            posicion = bisect_left(capacidades, restante)
+            if posicion == len(libres):
+                posicion = len(libres) - 1
+            elegidas.append(libres.pop(posicion))
+            restante -= capacidades.pop(posicion)
+        return elegidas if restante <= 0 else None
+
+    @staticmethod
+    def _elegir_aplicadores(carga, cantidad: int, indice, usados, fecha: date, bloque: int):
+        """
+        Toma del heap los profesores menos cargados que estén libres en ese horario
+        """
+        elegidos = []
+        descartados = []
+        while carga and len(elegidos) < cantidad:
+            asignados, id_profesor = heapq.heappop(carga)
+            ocupado = indice.ocupacion(ocupacion.PROFESOR, id_profesor, fecha) | usados.get((id_profesor, fecha), 0)
+            if ocupado & bloque:
+                descartados.append((asignados, id_profesor))
+            else:
+                elegidos.append((asignados, id_profesor))
+        for elemento in descartados:
+            heapq.heappush(carga, elemento)
+        if len(elegidos) < cantidad:
+            for elemento in elegidos:
+                heapq.heappush(carga, elemento)
+            return None
+        for asignados, id_profesor in elegidos:
+            heapq.heappush(carga, (asignados + 1, id_profesor))
+        return [id_profesor for _, id_profesor in elegidos]
+
+    def _guardar(self, indice: ocupacion.IndiceOcupacion, asignaciones: List[AsignacionAulaBase], solicitudes):
+        """
+        Reserva todas las asignaciones en el índice y las inserta en una sola transacción
+        """
+        reservas = ocupacion.ReservaLote()
+        try:
+            for asignacion in asignaciones:
+                fila = solicitudes[asignacion.id_horario]
+                registro = ocupacion.registro_aula(asignacion.id_examen_aula)
+                reservas.reservar(indice, registro, ocupacion.entradas_examen(
+                    [(ocupacion.AULA, asignacion.id_aula), (ocupacion.PROFESOR, asignacion.id_profesor_aplicador)],
+                    fila.id_horario, fila.fecha_examen, fila.hora_inicio, fila.hora_fin
+                ))
+            self.asignacion_repository.create_many([asignacion.dict() for asignacion in asignaciones])
+        except Exception:
+            reservas.revertir()
+            raise
+        reservas.confirmar()
@@ -0,0 +1,204 @@
+from collections import defaultdict, deque
+from typing import Dict, List, Optional, Set
+
+from app.repositories.AsignacionSinodalRepository import AsignacionSinodalRepository
+from app.repositories.PermisoRepository import PermisoRepository
+from app.repositories.ProfesorRepository import ProfesorRepository
+from app.repositories.SolicitudRepository import SolicitudRepository
+from app.repositories.base_repository import generar_id
+from app.schemas.AsignacionSinodalSchema import AsignacionSinodalBase, ResultadoAsignacionSinodales
+from app.schemas.CalendarizacionSchema import SolicitudSinAsignar
+from app.services import ocupacion, slots
+
+
+def emparejar(candidatos: List[List[int]]) -> List[int]:
+    """
+    Emparejamiento bipartito máximo entre lugares y profesores (caminos aumentantes con BFS)
+    candidatos[i] son los profesores posibles para el lugar i, en orden de preferencia
+    Regresa el profesor de cada lugar o -1 si quedó vacío
+    """
+    resultado = [-1] * len(candidatos)
+    lugar_de: Dict[int, int] = {}
+    for inicio in range(len(candidatos)):
+        padre: Dict[int, int] = {}
+        cola = deque([inicio])
+        libre = None
+        while cola and libre is None:
+            lugar = cola.popleft()
+            for profesor in candidatos[lugar]:
+                if profesor in padre:
+                    continue
+                padre[profesor] = lugar
+                if profesor not in lugar_de:
+                    libre = profesor
+                    break
+                cola.append(lugar_de[profesor])
+        if libre is None:
+            continue
+        profesor = libre
+        while True:
+            lugar = padre[profesor]
+            anterior = resultado[lugar]
+            resultado[lugar] = profesor
+            lugar_de[profesor] = lugar
+            if lugar == inicio:
+                break
+            profesor = anterior
+    return resultado
+
+
+class AsignadorSinodalesService:
+    """
+    Asigna sinodales a las solicitudes aprobadas de un periodo
+
+    La matriz de permisos se carga una vez como un entero por materia cuyo bit i indica que
+    el profesor i puede ser sinodal. Los exámenes que se traslapan en una misma fecha forman
+    un bloque; dentro de cada bloque se resuelve un emparejamiento bipartito máximo entre
+    lugares de sinodal y profesores libres (sin clase ni otra comisión en ese horario según
+    el índice de ocupación), probando primero a los profesores con menos carga.
+    """
+
+    def __init__(
+            self,
+            asignacion_repository: AsignacionSinodalRepository,
+            solicitud_repository: SolicitudRepository,
+            permiso_repository: PermisoRepository,
+            profesor_repository: ProfesorRepository
+    ):
+        self.asignacion_repository = asignacion_repository
+        self.solicitud_repository = solicitud_repository
+        self.permiso_repository = permiso_repository
+        self.profesor_repository = profesor_repository
+
+    def asignar(
+            self,
+            id_periodo: str,
+            sinodales_por_examen: int = 2,
+            max_por_profesor: Optional[int] = None,
+            aplicar: bool = False
+    ) -> ResultadoAsignacionSinodales:
+        """
+        Completa hasta `sinodales_por_examen` sinodales en cada solicitud aprobada del periodo
+        Si aplicar=True se insertan todas las asignaciones en una sola transacción
+        """
+        db = self.asignacion_repository.db
+        indice = ocupacion.get_indice(db, id_periodo)
+
+        profesores = self.profesor_repository.get_ids_activos()
+        posicion = {id_profesor: i for i, id_profesor in enumerate(profesores)}
+        elegibles: Dict[str, int] = defaultdict(int)
+        for id_profesor, id_materia in self.permiso_repository.get_pares():
+            if id_profesor in posicion:
+                elegibles[id_materia] |= 1 << posicion[id_profesor]
+
+        actuales: Dict[str, Set[int]] = defaultdict(set)
+        carga = [0] * len(profesores)
+        for id_horario, id_profesor in self.asignacion_repository.get_pares_por_periodo(id_periodo):
+            if id_profesor in posicion:
+                actuales[id_horario].add(posicion[id_profesor])
+                carga[posicion[id_profesor]] += 1
+
+        sin_asignar: List[SolicitudSinAsignar] = []
+        examenes = []
+        for fila in self.solicitud_repository.get_aprobadas_por_periodo(id_periodo):
+            faltantes = sinodales_por_examen - len(actuales.get(fila.id_horario, ()))
+            if faltantes <= 0:
+                continue
+            if fila.fecha_examen is None or fila.hora_inicio is None or fila.hora_fin is None:
+                sin_asignar.append(SolicitudSinAsignar(id_horario=fila.id_horario,
+                                                       motivo="La solicitud no tiene fecha u horario"))
+                continue
+            examenes.append((fila, faltantes, slots.mascara(fila.hora_inicio, fila.hora_fin)))
+
+        asignaciones: List[AsignacionSinodalBase] = []
+        for bloque_examenes in self._bloques_traslapados(examenes):
+            lugares = []
+            candidatos = []
+            for fila, faltantes, mascara in bloque_examenes:
+                posibles = []
+                for i in slots.bits(elegibles.get(fila.id_materia, 0)):
+                    if i in actuales.get(fila.id_horario, ()):
+                        continue
+                    if max_por_profesor is not None and carga[i] >= max_por_profesor:
+                        continue
+                    if indice.ocupacion(ocupacion.PROFESOR, profesores[i], fila.fecha_examen) & mascara:
+                        continue
+                    posibles.append(i)
+                posibles.sort(key=lambda i: (carga[i], i))
+                for _ in range(faltantes):
+                    lugares.append(fila)
+                    candidatos.append(posibles)
+
+            # Los lugares con menos opciones se emparejan primero
+            orden = sorted(range(len(lugares)), key=lambda k: len(candidatos[k]))
+            elegidos = emparejar([candidatos[k] for k in orden])
+
+            sin_cubrir: Dict[str, int] = defaultdict(int)
+            for k, i in zip(orden, elegidos):
+                fila = lugares[k]
+                if i < 0:
+                    sin_cubrir[fila.id_horario] += 1
+                    continue
+                carga[i] += 1
+                actuales[fila.id_horario].add(i)
+                asignaciones.append(AsignacionSinodalBase(
+                    id_examen_sinodal=generar_id("AS"),
+                    id_horario=fila.id_horario,
+                    id_profesor=profesores[i]
+                ))
+            for id_horario, cantidad in sin_cubrir.items():
+                sin_asignar.append(SolicitudSinAsignar(
+                    id_horario=id_horario,
+                    motivo=f"Faltan {cantidad} sinodal(es) con permiso en la materia y libres en ese horario"
+                ))
+
+        if aplicar:
+            self._guardar(indice, asignaciones, {fila.id_horario: fila for fila, _, _ in examenes})
+
+        return ResultadoAsignacionSinodales(
+            id_periodo=id_periodo,
+            asignaciones=asignaciones,
+            sin_asignar=sin_asignar,
+            aplicado=aplicar
+        )
+
+    @staticmethod
+    def _bloques_traslapados(examenes):
+        """
+        Agrupa los exámenes de una misma fecha cuyos horarios se traslapan (directa o encadenadamente)
+        Un profesor recibe a lo más un lugar por bloque, así nunca queda en dos exámenes simultáneos
+        """
+        por_fecha = defaultdict(list)
+        for examen in examenes:
+            por_fecha[examen[0].fecha_examen].append(examen)
+        for fecha in sorted(por_fecha):
+            actual = []
+            fin = -1
+            for examen in sorted(por_fecha[fecha], key=lambda e: slots.primer_bit(e[2])):
+                inicio = slots.primer_bit(examen[2])
+                if actual and inicio >= fin:
+                    yield actual
+                    actual = []
+                actual.append(examen)
+                fin = max(fin, examen[2].bit_length())
+            if actual:
+                yield actual
+
+    def _guardar(self, indice: ocupacion.IndiceOcupacion, asignaciones: List[AsignacionSinodalBase], solicitudes):
+        """
+        Reserva todas las asignaciones en el índice y las inserta en una sola transacción
+        """
+        reservas = ocupacion.ReservaLote()
+        try:
+            for asignacion in asignaciones:
+                fila = solicitudes[asignacion.id_horario]
+                registro = ocupacion.registro_sinodal(asignacion.id_examen_sinodal)
+                reservas.reservar(indice, registro, ocupacion.entradas_examen(
+                    [(ocupacion.PROFESOR, asignacion.id_profesor)],
+                    fila.id_horario, fila.fecha_examen, fila.hora_inicio, fila.hora_fin
+                ))
+            self.asignacion_repository.create_many([asignacion.dict() for asignacion in asignaciones])
+        except Exception:
+            reservas.revertir()
+            raise
+        reservas.confirmar()
@@ -1,15 +1,80 @@
+from datetime import date, time
 from typing import List, Optional
 
 from app.models.Aula import Aula
 from app.repositories.AulaRepository import AulaRepository
+from app.repositories.PeriodoRepository import PeriodoRepository
+from app.repositories.VentanaRepository import VentanaRepository
 from app.schemas.AulaSchema import AulaCreate, AulaUpdate
+from app.services import catalogo, ocupacion, slots
+from app.services.PeriodoService import PeriodoService
 from app.services.base_service import BaseService
 
 
 class AulaService(BaseService[Aula, AulaCreate, AulaUpdate]):
-    def __init__(self, repository: AulaRepository):
+    cache = catalogo.cache_de(Aula.__tablename__)
+
+    def __init__(
+            self,
+            repository: AulaRepository,
+            ventana_repository: Optional[VentanaRepository] = None,
+            periodo_service: Optional[PeriodoService] = None
+    ):
         super().__init__(repository)
         self.repository = repository
+        self.ventana_repository = ventana_repository or VentanaRepository(repository.db)
+        self.periodo_service = periodo_service or PeriodoService(PeriodoRepository(repository.db))
+
+    def get_disponibles(
+            self,
+            capacidad_minima: Optional[int] = None,
+            skip: int = 0,
+            limit: int = 100,
+            cursor: Optional[str] = None
+    ) -> List[Aula]:
+        return self._leer(
+            ("get_disponibles", capacidad_minima, skip, limit, cursor),
+            lambda: self.repository.get_disponibles(capacidad_minima, skip, limit, cursor)
+        )
+
+    def get_libres(
+            self,
+            fecha: date,
+            hora_inicio: time,
+            hora_fin: time,
+            capacidad_minima: Optional[int] = None,
+            id_periodo: Optional[str] = None,
+            skip: int = 0,
+            limit: int = 100
+    ) -> Optional[List[Aula]]:
+        """
+        Aulas habilitadas con cupo para capacidad_minima y sin clase ni examen en ese horario,
+        empezando por la de menor capacidad (la que mejor se ajusta) para no desperdiciar aulas grandes
+
+        Las aulas salen de la caché del catálogo y la ocupación del índice del periodo, así que
+        no se consulta la base de datos por aula. Sin `id_periodo` se revisan los periodos cuyas
+        ventanas de aplicación incluyen la fecha. Regresa None si `id_periodo` no existe y lanza
+        ValueError si el horario no sirve o ninguna ventana incluye la fecha.
+        """
+        bloque = slots.mascara(hora_inicio, hora_fin)
+        if not bloque:
+            raise ValueError("hora_fin debe ser posterior a hora_inicio")
+        if id_periodo is not None:
+            # Solo periodos existentes: cada índice construido se queda en memoria
+            if self.periodo_service.get(id_periodo) is None:
+                return None
+            periodos = [id_periodo]
+        else:
+            periodos = self.ventana_repository.get_periodos_en_fecha(fecha)
+        if not periodos:
+            raise ValueError("Ninguna ventana de aplicación incluye esa fecha; indicar el periodo")
+        indices = [ocupacion.get_indice(self.repository.db, periodo) for periodo in periodos]
 
-    def get_disponibles(self, capacidad_minima: Optional[int] = None, skip: int = 0, limit: int = 100) -> List[Aula]:
-        return self.repository.get_disponibles(capacidad_minima, skip, limit)
\ No newline at end of file
+        minimo = capacidad_minima or 0
+        libres = [
+            aula for aula in self._leer(("get_habilitadas",), self.repository.get_habilitadas)
+            if (aula.capacidad or 0) >= minimo
+            and not any(indice.ocupacion(ocupacion.AULA, aula.id_aula, fecha) & bloque for indice in indices)
+        ]
+        libres.sort(key=lambda aula: (aula.capacidad or 0, aula.id_aula))
+        return libres[skip:skip + limit]
\ No newline at end of file
@@ -0,0 +1,157 @@
+from collections import defaultdict
+from datetime import date, time
+from typing import Dict, Iterable, List, Tuple
+
+from app.repositories.GrupoExamenRepository import GrupoExamenRepository
+from app.repositories.HorarioRepository import HorarioRepository
+from app.repositories.SolicitudRepository import SolicitudRepository
+from app.repositories.VentanaRepository import VentanaRepository
+from app.schemas.CalendarizacionSchema import PropuestaExamen, ResultadoCalendarizacion, SolicitudSinAsignar
+from app.schemas.EstadoSolicitudSchema import EstadoSolicitud
+from app.services import ocupacion, slots
+
+HORA_INICIO_JORNADA = time(7, 0)
+HORA_FIN_JORNADA = time(21, 0)
+DURACION_DEFECTO_SLOTS = 4  # 2 horas con franjas de 30 minutos
+
+
+class CalendarizacionService:
+    """
+    Propone fecha y horario para las solicitudes pendientes de un periodo y tipo de evaluación
+
+    Toda la información se carga con cuatro consultas y se trabaja sobre máscaras de bits
+    por grupo y día (ver app.services.slots), de modo que el costo no depende de consultas por fila.
+    """
+
+    def __init__(
+            self,
+            solicitud_repository: SolicitudRepository,
+            grupo_examen_repository: GrupoExamenRepository,
+            horario_repository: HorarioRepository,
+            ventana_repository: VentanaRepository
+    ):
+        self.solicitud_repository = solicitud_repository
+        self.grupo_examen_repository = grupo_examen_repository
+        self.horario_repository = horario_repository
+        self.ventana_repository = ventana_repository
+
+    def calendarizar(
+            self,
+            id_periodo: str,
+            id_evaluacion: str,
+            aplicar: bool = False,
+            hora_inicio_jornada: time = HORA_INICIO_JORNADA,
+            hora_fin_jornada: time = HORA_FIN_JORNADA,
+            dias_semana: Iterable[int] = slots.DIAS_HABILES
+    ) -> ResultadoCalendarizacion:
+        """
+        Calcula una propuesta sin choques entre grupos para cada solicitud pendiente
+        Las solicitudes con is_manualmente_editado=True y las ya aprobadas se respetan tal cual
+        Si aplicar=True, las propuestas se guardan en un solo UPDATE por lotes
+        """
+        ventana = self.ventana_repository.get_by_periodo_evaluacion(id_periodo, id_evaluacion)
+        if ventana is None:
+            raise ValueError("No existe ventana de aplicación para el periodo y tipo de evaluación")
+
+        fechas = slots.fechas_en_rango(ventana.fecha_inicio_examenes, ventana.fecha_fin_examenes, dias_semana)
+        jornada = slots.mascara(hora_inicio_jornada, hora_fin_jornada)
+
+        grupos_por_solicitud: Dict[str, List[str]] = defaultdict(list)
+        for id_horario, id_grupo in self.grupo_examen_repository.get_pares_por_periodo(id_periodo):
+            grupos_por_solicitud[id_horario].append(id_grupo)
+
+        # Ocupación semanal de clases por (grupo, dia_semana)
+        clases: Dict[Tuple[str, int], int] = defaultdict(int)
+        for id_grupo, dia_semana, hora_inicio, hora_fin in self.horario_repository.get_bloques_por_periodo(id_periodo):
+            if hora_inicio is not None and hora_fin is not None:
+                clases[(id_grupo, dia_semana)] |= slots.mascara(hora_inicio, hora_fin)
+
+        # Ocupación por examen en fechas concretas y número de exámenes por grupo y día
+        examenes: Dict[Tuple[str, date], int] = defaultdict(int)
+        examenes_dia: Dict[Tuple[str, date], int] = defaultdict(int)
+        carga: Dict[date, int] = defaultdict(int)
+
+        pendientes = []
+        fijas = 0
+        for fila in self.solicitud_repository.get_resumen_por_periodo(id_periodo):
+            if fila.estado == EstadoSolicitud.RECHAZADO.value:
+                continue
+            movible = (
+                fila.id_evaluacion == id_evaluacion
+                and fila.estado == EstadoSolicitud.PENDIENTE.value
+                and not fila.is_manualmente_editado
+            )
+            if movible:
+                pendientes.append(fila)
+                continue
+            if fila.fecha_examen is None or fila.hora_inicio is None or fila.hora_fin is None:
+                continue
+            if fila.id_evaluacion == id_evaluacion:
+                fijas += 1
+            bloque = slots.mascara(fila.hora_inicio, fila.hora_fin)
+            for id_grupo in grupos_por_solicitud.get(fila.id_horario, ()):
+                examenes[(id_grupo, fila.fecha_examen)] |= bloque
+                examenes_dia[(id_grupo, fila.fecha_examen)] += 1
+            carga[fila.fecha_examen] += 1
+
+        # Primero las solicitudes más restringidas: más grupos y mayor duración
+        def duracion(fila) -> int:
+            if fila.hora_inicio is None or fila.hora_fin is None:
+                return DURACION_DEFECTO_SLOTS
+            return slots.duracion_slots(fila.hora_inicio, fila.hora_fin) or DURACION_DEFECTO_SLOTS
+
+        pendientes.sort(key=lambda f: (-len(grupos_por_solicitud.get(f.id_horario, ())), -duracion(f), f.id_horario))
+
+        propuestas: List[PropuestaExamen] = []
+        sin_asignar: List[SolicitudSinAsignar] = []
+        for fila in pendientes:
+            grupos = grupos_por_solicitud.get(fila.id_horario, [])
+            dur = duracion(fila)
+            mejor = None
+            for indice, fecha in enumerate(fechas):
+                dia_semana = fecha.isoweekday()
+                ocupado = 0
+                repetidos = 0
+                for id_grupo in grupos:
+                    ocupado |= clases.get((id_grupo, dia_semana), 0) | examenes.get((id_grupo, fecha), 0)
+                    repetidos += examenes_dia.get((id_grupo, fecha), 0)
+                inicios = slots.inicios_libres(ocupado, dur, jornada)
+                if not inicios:
+                    continue
+                # Preferir días sin otro examen para los mismos grupos y después los menos cargados
+                candidato = (repetidos, carga[fecha], indice, slots.primer_bit(inicios))
+                if mejor is None or candidato < mejor:
+                    mejor = candidato
+            if mejor is None:
+                sin_asignar.append(SolicitudSinAsignar(
+                    id_horario=fila.id_horario,
+                    motivo="No hay un horario libre para todos los grupos dentro de la ventana de aplicación"
+                ))
+                continue
+
+            _, _, indice, inicio = mejor
+            fecha = fechas[indice]
+            bloque = slots.mascara_slots(inicio, dur)
+            for id_grupo in grupos:
+                examenes[(id_grupo, fecha)] |= bloque
+                examenes_dia[(id_grupo, fecha)] += 1
+            carga[fecha] += 1
+            propuestas.append(PropuestaExamen(
+                id_horario=fila.id_horario,
+                fecha_examen=fecha,
+                hora_inicio=slots.hora_de_slot(inicio),
+                hora_fin=slots.hora_de_slot(inicio + dur)
+            ))
+
+        if aplicar:
+            self.solicitud_repository.update_horarios([p.dict() for p in propuestas])
+            ocupacion.invalidar_indice(id_periodo)
+
+        return ResultadoCalendarizacion(
+            id_periodo=id_periodo,
+            id_evaluacion=id_evaluacion,
+            propuestas=propuestas,
+            sin_asignar=sin_asignar,
+            fijas=fijas,
+            aplicado=aplicar
+        )
@@ -3,16 +3,28 @@ from typing import List, Optional
 from app.models.Carrera import Carrera
 from app.repositories.CarreraRepository import CarreraRepository
 from app.schemas.CarreraSchema import CarreraCreate, CarreraUpdate
+from app.services import catalogo
 from app.services.base_service import BaseService
 
 
 class CarreraService(BaseService[Carrera, CarreraCreate, CarreraUpdate]):
+    cache = catalogo.cache_de(Carrera.__tablename__)
+
     def __init__(self, repository: CarreraRepository):
         super().__init__(repository)
         self.repository = repository
 
     def get_by_nombre(self, nombre: str) -> Optional[Carrera]:
-        return self.repository.get_by_nombre(nombre)
+        return self._leer(("get_by_nombre", nombre), lambda: self.repository.get_by_nombre(nombre))
 
-    def search_by_nombre(self, nombre: str, skip: int = 0, limit: int = 100) -> List[Carrera]:
-        return self.repository.search_by_nombre(nombre, skip, limit)
\ No newline at end of file
+    def search_by_nombre(
+            self,
+            nombre: str,
+            skip: int = 0,
+            limit: int = 100,
+            cursor: Optional[str] = None
+    ) -> List[Carrera]:
+        return self._leer(
+            ("search_by_nombre", nombre, skip, limit, cursor),
+            lambda: self.repository.search_by_nombre(nombre, skip, limit, cursor)
+        )
\ No newline at end of file
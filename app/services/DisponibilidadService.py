@@ -0,0 +1,84 @@
+from datetime import time
+from typing import Iterable, List, Optional
+
+from app.repositories.GrupoRepository import GrupoRepository
+from app.repositories.VentanaRepository import VentanaRepository
+from app.schemas.DisponibilidadSchema import DiaDisponible, Disponibilidad, FranjaLibre
+from app.services import ocupacion, slots
+from app.services.CalendarizacionService import HORA_FIN_JORNADA, HORA_INICIO_JORNADA
+
+MAX_GRUPOS_DISPONIBILIDAD = 50
+
+
+class DisponibilidadService:
+    """
+    Horarios en que ninguno de varios grupos tiene clase ni examen dentro de una ventana de aplicación
+
+    La ocupación sale del índice del periodo (app.services.ocupacion), sin consultas por grupo.
+    Las clases de cada grupo se toman como una máscara semanal de ancho fijo; la unión de las
+    máscaras de todos los grupos se extiende a las fechas de la ventana formando un solo entero
+    (la fecha i ocupa los bits [i * SLOTS_POR_DIA, (i + 1) * SLOTS_POR_DIA)), se le agregan los
+    exámenes por fecha y las franjas libres de toda la ventana se obtienen con unas cuantas
+    operaciones de bits sobre ese entero en lugar de recorrer grupo por grupo y día por día.
+    """
+
+    def __init__(self, grupo_repository: GrupoRepository, ventana_repository: VentanaRepository):
+        self.grupo_repository = grupo_repository
+        self.ventana_repository = ventana_repository
+
+    def buscar(
+            self,
+            id_grupos: List[str],
+            id_ventana: str,
+            duracion_minutos: int,
+            hora_inicio_jornada: time = HORA_INICIO_JORNADA,
+            hora_fin_jornada: time = HORA_FIN_JORNADA,
+            dias_semana: Iterable[int] = slots.DIAS_HABILES
+    ) -> Optional[Disponibilidad]:
+        """
+        Franjas libres comunes de al menos `duracion_minutos`, por fecha; None si la ventana no existe
+        Lanza ValueError si algún grupo no existe
+        """
+        ventana = self.ventana_repository.get_by_id(id_ventana)
+        if ventana is None:
+            return None
+        id_grupos = list(dict.fromkeys(id_grupos))
+        faltantes = set(id_grupos) - self.grupo_repository.ids_existentes(id_grupos)
+        if faltantes:
+            raise ValueError(f"No existen los grupos: {', '.join(sorted(faltantes))}")
+
+        indice = ocupacion.get_indice(self.grupo_repository.db, ventana.id_periodo)
+        fechas = slots.fechas_en_rango(ventana.fecha_inicio_examenes, ventana.fecha_fin_examenes, dias_semana)
+        posicion = {fecha: i * slots.SLOTS_POR_DIA for i, fecha in enumerate(fechas)}
+        jornada = slots.mascara(hora_inicio_jornada, hora_fin_jornada)
+
+        semanal = 0
+        for id_grupo in id_grupos:
+            semanal |= indice.mascara_semanal(ocupacion.GRUPO, id_grupo)
+        por_dia = [(semanal >> (dia - 1) * slots.SLOTS_POR_DIA) & slots.MASCARA_DIA for dia in range(1, 8)]
+
+        ocupado = 0
+        permitido = 0
+        for fecha, desplazamiento in posicion.items():
+            ocupado |= por_dia[fecha.isoweekday() - 1] << desplazamiento
+            permitido |= jornada << desplazamiento
+        for id_grupo in id_grupos:
+            for fecha, mascara in indice.examenes_por_fecha(ocupacion.GRUPO, id_grupo).items():
+                if fecha in posicion:
+                    ocupado |= mascara << posicion[fecha]
+
+        duracion = -(-duracion_minutos // slots.SLOT_MINUTOS)
+        libres = permitido & ~ocupado
+        inicios = slots.inicios_libres(ocupado, duracion, permitido)
+
+        dias: List[DiaDisponible] = []
+        for fecha, desplazamiento in posicion.items():
+            if not (inicios >> desplazamiento) & slots.MASCARA_DIA:
+                continue
+            franjas = [
+                FranjaLibre(hora_inicio=slots.hora_de_slot(inicio), hora_fin=slots.hora_de_slot(inicio + largo))
+                for inicio, largo in slots.tramos((libres >> desplazamiento) & slots.MASCARA_DIA) if largo >= duracion
+            ]
+            dias.append(DiaDisponible(fecha=fecha, franjas=franjas))
+        return Disponibilidad(id_ventana=id_ventana, id_periodo=ventana.id_periodo, grupos=id_grupos,
+                              duracion_minutos=duracion_minutos, dias=dias)
@@ -0,0 +1,96 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Optional
+
+from app.repositories.EstadisticaRepository import EstadisticaRepository
+from app.schemas.EstadisticaSchema import (CargaProfesor, EstadisticasPeriodo, SolicitudesPorCarrera,
+                                           SolicitudesPorEstado, SolicitudesPorEvaluacion, UsoAula)
+from app.schemas.EstadoSolicitudSchema import EstadoSolicitud
+from app.services import slots
+from app.services.CalendarizacionService import HORA_FIN_JORNADA, HORA_INICIO_JORNADA
+from app.services.PeriodoService import PeriodoService
+
+
+def _horas(hora_inicio, hora_fin) -> float:
+    if hora_inicio is None or hora_fin is None:
+        return 0
+    dia = datetime.min.date()
+    return max((datetime.combine(dia, hora_fin) - datetime.combine(dia, hora_inicio)).total_seconds(), 0) / 3600
+
+
+# Horas que un aula puede usarse a la semana, base de UsoAula.porcentaje_uso
+HORAS_SEMANA_AULA = _horas(HORA_INICIO_JORNADA, HORA_FIN_JORNADA) * len(slots.DIAS_HABILES)
+
+
+class EstadisticaService:
+    """
+    Resumen de un periodo para el tablero: solicitudes por estado, carrera y tipo de evaluación,
+    uso de aulas y carga de sinodales por profesor
+
+    Cada cifra sale de una consulta agregada (ver EstadisticaRepository) y aquí solo se juntan,
+    así que el costo no depende del número de solicitudes ni de asignaciones.
+    """
+
+    def __init__(self, repository: EstadisticaRepository, periodo_service: PeriodoService):
+        self.repository = repository
+        self.periodo_service = periodo_service
+
+    def get_periodo(self, id_periodo: str) -> Optional[EstadisticasPeriodo]:
+        if self.periodo_service.get(id_periodo) is None:
+            return None
+        consultar = self.repository.consultar
+
+        por_estado: Dict[Optional[int], int] = defaultdict(int)
+        por_evaluacion: Dict[Optional[str], SolicitudesPorEvaluacion] = {}
+        for fila in consultar("solicitudes", id_periodo):
+            por_estado[fila.estado] += fila.total
+            evaluacion = por_evaluacion.setdefault(fila.id_evaluacion, SolicitudesPorEvaluacion(
+                id_evaluacion=fila.id_evaluacion, nombre_evaluacion=fila.nombre_evaluacion, total=0
+            ))
+            evaluacion.total += fila.total
+        estados = {estado.value: estado.name.lower() for estado in EstadoSolicitud}
+
+        aulas: Dict[str, UsoAula] = {
+            fila.id_aula: UsoAula(id_aula=fila.id_aula, nombre_aula=fila.nombre_aula, capacidad=fila.capacidad)
+            for fila in self.repository.get_aulas() if not fila.is_disable
+        }
+        for fila in consultar("clases_aula", id_periodo):
+            aula = aulas.setdefault(fila.id_aula, UsoAula(id_aula=fila.id_aula))
+            aula.clases += fila.total
+            aula.horas_clase_semana += _horas(fila.hora_inicio, fila.hora_fin) * fila.total
+        for fila in consultar("examenes_aula", id_periodo):
+            aulas.setdefault(fila.id_aula, UsoAula(id_aula=fila.id_aula)).examenes += fila.total
+        for aula in aulas.values():
+            aula.horas_clase_semana = round(aula.horas_clase_semana, 2)
+            aula.porcentaje_uso = round(100 * aula.horas_clase_semana / HORAS_SEMANA_AULA, 1)
+
+        profesores: Dict[str, CargaProfesor] = {
+            fila.id_profesor: CargaProfesor(id_profesor=fila.id_profesor, nombre_profesor=fila.nombre_profesor)
+            for fila in self.repository.get_profesores() if not fila.is_disable
+        }
+        for fila in consultar("sinodales", id_periodo):
+            profesor = profesores.setdefault(fila.id_profesor, CargaProfesor(id_profesor=fila.id_profesor))
+            profesor.sinodalias += fila.total
+        for fila in consultar("aplicadores", id_periodo):
+            profesor = profesores.setdefault(fila.id_profesor, CargaProfesor(id_profesor=fila.id_profesor))
+            profesor.aplicaciones += fila.total
+        for profesor in profesores.values():
+            profesor.total = profesor.sinodalias + profesor.aplicaciones
+
+        return EstadisticasPeriodo(
+            id_periodo=id_periodo,
+            total_solicitudes=sum(por_estado.values()),
+            solicitudes_por_estado=[
+                SolicitudesPorEstado(estado=estado, nombre_estado=estados.get(estado), total=total)
+                for estado, total in sorted(por_estado.items(), key=lambda par: (par[0] is None, par[0] or 0))
+            ],
+            solicitudes_por_carrera=sorted(
+                (SolicitudesPorCarrera(id_carrera=fila.id_carrera, nombre_carrera=fila.nombre_carrera, total=fila.total)
+                 for fila in consultar("solicitudes_carrera", id_periodo)),
+                key=lambda carrera: -carrera.total
+            ),
+            solicitudes_por_evaluacion=sorted(por_evaluacion.values(), key=lambda evaluacion: -evaluacion.total),
+            uso_aulas=sorted(aulas.values(), key=lambda aula: (-aula.porcentaje_uso, -aula.examenes, aula.id_aula)),
+            carga_profesores=sorted(profesores.values(), key=lambda profesor: (-profesor.total, profesor.id_profesor)),
+            materializadas=self.repository.materializadas
+        )
\ No newline at end of file
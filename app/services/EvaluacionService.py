@@ -1,10 +1,13 @@
 from app.models.TipoEvaluacion import TipoEvaluacion
 from app.repositories.EvaluacionRepository import EvaluacionRepository
 from app.schemas.TipoEvaluacionSchema import TipoEvaluacionCreate, TipoEvaluacionUpdate
+from app.services import catalogo
 from app.services.base_service import BaseService
 
 
 class EvaluacionService(BaseService[TipoEvaluacion, TipoEvaluacionCreate, TipoEvaluacionUpdate]):
+    cache = catalogo.cache_de(TipoEvaluacion.__tablename__)
+
     def __init__(self, repository: EvaluacionRepository):
         super().__init__(repository)
         self.repository = repository
\ No newline at end of file
@@ -0,0 +1,154 @@
+from typing import Any, Dict, List, Optional
+
+from app.models.SolicitudExamen import SolicitudExamen
+from app.repositories.AsignacionAulaRepository import AsignacionAulaRepository
+from app.repositories.AsignacionSinodalRepository import AsignacionSinodalRepository
+from app.repositories.ExamenRepository import ExamenRepository
+from app.repositories.GrupoExamenRepository import GrupoExamenRepository
+from app.repositories.SolicitudRepository import SolicitudRepository
+from app.repositories.base_repository import BaseRepository, Pagina, generar_id
+from app.schemas.EstadoSolicitudSchema import EstadoSolicitud
+from app.schemas.ExamenSchema import Examen, ExamenCreate
+from app.services import ocupacion, slots
+
+
+class ExamenInvalidoError(ValueError):
+    """
+    El examen no se guardó; `errores` trae un mensaje por elemento ("solicitud", "grupos[0]", ...)
+    `conflicto` indica que todo era válido salvo por choques de horario
+    """
+
+    def __init__(self, errores: Dict[str, str], conflicto: bool = False):
+        super().__init__("; ".join(f"{ruta}: {error}" for ruta, error in errores.items()))
+        self.errores = errores
+        self.conflicto = conflicto
+
+
+class ExamenService:
+    """
+    Exámenes completos (solicitud, grupos, aulas y sinodales); el alta es una sola unidad de trabajo
+
+    Todo el examen se valida de una vez con consultas por conjunto (una por tabla y llave
+    foránea, sin importar cuántos grupos, aulas o sinodales traiga), los choques de horario
+    se revisan en el índice de ocupación del periodo y las filas se insertan en una sola
+    transacción, así que nunca queda un examen a medias.
+    """
+
+    def __init__(
+            self,
+            examen_repository: ExamenRepository,
+            solicitud_repository: SolicitudRepository,
+            grupo_examen_repository: GrupoExamenRepository,
+            asignacion_aula_repository: AsignacionAulaRepository,
+            asignacion_sinodal_repository: AsignacionSinodalRepository
+    ):
+        self.examen_repository = examen_repository
+        self.solicitud_repository = solicitud_repository
+        self.grupo_examen_repository = grupo_examen_repository
+        self.asignacion_aula_repository = asignacion_aula_repository
+        self.asignacion_sinodal_repository = asignacion_sinodal_repository
+
+    def get(self, id_horario: str) -> Optional[SolicitudExamen]:
+        return self.examen_repository.get_detalle(id_horario)
+
+    def get_all(
+            self,
+            id_periodo: Optional[str] = None,
+            skip: int = 0,
+            limit: int = 100,
+            cursor: Optional[str] = None
+    ) -> Pagina:
+        return self.examen_repository.get_detalles(id_periodo, skip, limit, cursor)
+
+    def create(self, obj_in: ExamenCreate) -> Examen:
+        """
+        Valida y guarda el examen completo; lanza ExamenInvalidoError con todos los errores encontrados
+        """
+        solicitud = obj_in.dict(exclude={"grupos", "aulas", "sinodales"})
+        id_horario = solicitud["id_horario"]
+        grupos = [{**grupo.dict(), "id_examen_grupo": grupo.id_examen_grupo or generar_id("EG")}
+                  for grupo in obj_in.grupos]
+        aulas = [{**aula.dict(), "id_examen_aula": aula.id_examen_aula or generar_id("AA")}
+                 for aula in obj_in.aulas]
+        sinodales = [{**sinodal.dict(), "id_examen_sinodal": sinodal.id_examen_sinodal or generar_id("AS")}
+                     for sinodal in obj_in.sinodales]
+
+        errores: Dict[str, str] = {}
+        if self.solicitud_repository.ids_existentes([id_horario]):
+            errores["solicitud"] = f"Ya existe id_horario = {id_horario}"
+        elif not slots.mascara(obj_in.hora_inicio, obj_in.hora_fin):
+            errores["solicitud"] = "hora_fin debe ser posterior a hora_inicio"
+        else:
+            errores.update({"solicitud": error for error in
+                            self.solicitud_repository.errores_de_referencia({0: solicitud}).values()})
+        self._validar_hijas(self.grupo_examen_repository, "grupos", grupos, ["id_grupo"], errores)
+        self._validar_hijas(self.asignacion_aula_repository, "aulas", aulas, ["id_aula"], errores)
+        self._validar_hijas(self.asignacion_sinodal_repository, "sinodales", sinodales, ["id_profesor"], errores)
+        if errores:
+            raise ExamenInvalidoError(errores)
+
+        reservas = ocupacion.ReservaLote()
+        if obj_in.estado != EstadoSolicitud.RECHAZADO:
+            self._reservar(obj_in, grupos, aulas, sinodales, reservas, errores)
+            if errores:
+                reservas.revertir()
+                raise ExamenInvalidoError(errores, conflicto=True)
+
+        for filas in (grupos, aulas, sinodales):
+            for fila in filas:
+                fila["id_horario"] = id_horario
+        try:
+            self.examen_repository.create_completo(solicitud, grupos, aulas, sinodales)
+        except Exception:
+            reservas.revertir()
+            raise
+        reservas.confirmar()
+        return Examen(**solicitud, grupos=grupos, aulas=aulas, sinodales=sinodales)
+
+    @staticmethod
+    def _validar_hijas(repository: BaseRepository, nombre: str, filas: List[Dict[str, Any]],
+                       unicas: List[str], errores: Dict[str, str]):
+        """
+        Ids repetidos o ya registrados, recursos repetidos dentro del examen y llaves foráneas
+        inexistentes, con una consulta por columna para todas las filas de la lista
+        """
+        llave = repository.llave.key
+        for columna in [llave] + unicas:
+            primera: Dict[Any, int] = {}
+            for i, fila in enumerate(filas):
+                valor = fila[columna]
+                if valor in primera:
+                    errores.setdefault(f"{nombre}[{i}]", f"{columna} = {valor} se repite en {nombre}[{primera[valor]}]")
+                else:
+                    primera[valor] = i
+        existentes = repository.ids_existentes(fila[llave] for fila in filas)
+        for i, fila in enumerate(filas):
+            if fila[llave] in existentes:
+                errores.setdefault(f"{nombre}[{i}]", f"Ya existe {llave} = {fila[llave]}")
+        # id_horario todavía no existe: se valida solo contra las demás tablas
+        for i, error in repository.errores_de_referencia(dict(enumerate(filas))).items():
+            errores.setdefault(f"{nombre}[{i}]", error)
+
+    def _reservar(self, obj_in: ExamenCreate, grupos, aulas, sinodales,
+                  reservas: ocupacion.ReservaLote, errores: Dict[str, str]):
+        """
+        Reserva en el índice del periodo los grupos, aulas, aplicadores y sinodales del examen
+        Los elementos del mismo examen no chocan entre sí (un aplicador puede ser también sinodal)
+        """
+        indice = ocupacion.get_indice(self.solicitud_repository.db, obj_in.id_periodo)
+        elementos = (
+            [(f"grupos[{i}]", ocupacion.registro_grupo(fila["id_examen_grupo"]),
+              [(ocupacion.GRUPO, fila["id_grupo"])]) for i, fila in enumerate(grupos)]
+            + [(f"aulas[{i}]", ocupacion.registro_aula(fila["id_examen_aula"]),
+                [(ocupacion.AULA, fila["id_aula"]), (ocupacion.PROFESOR, fila["id_profesor_aplicador"])])
+               for i, fila in enumerate(aulas)]
+            + [(f"sinodales[{i}]", ocupacion.registro_sinodal(fila["id_examen_sinodal"]),
+                [(ocupacion.PROFESOR, fila["id_profesor"])]) for i, fila in enumerate(sinodales)]
+        )
+        for ruta, registro, recursos in elementos:
+            entradas = ocupacion.entradas_examen(recursos, obj_in.id_horario, obj_in.fecha_examen,
+                                                 obj_in.hora_inicio, obj_in.hora_fin)
+            try:
+                reservas.reservar(indice, registro, entradas)
+            except ocupacion.ConflictoHorarioError as e:
+                errores[ruta] = str(e)
\ No newline at end of file
@@ -1,8 +1,9 @@
-from typing import List
+from typing import Any, Dict, List, Optional
 
 from app.models.GrupoExamen import GrupoExamen
 from app.repositories.GrupoExamenRepository import GrupoExamenRepository
 from app.schemas.GrupoExamenSchema import GrupoExamenCreate, GrupoExamenUpdate
+from app.services import ocupacion
 from app.services.base_service import BaseService
 
 
@@ -15,4 +16,42 @@ class GrupoExamenService(BaseService[GrupoExamen, GrupoExamenCreate, GrupoExamen
         return self.repository.get_by_solicitud(id_horario)
 
     def get_by_grupo(self, id_grupo: str) -> List[GrupoExamen]:
-        return self.repository.get_by_grupo(id_grupo)
\ No newline at end of file
+        return self.repository.get_by_grupo(id_grupo)
+
+    def create(self, obj_in: GrupoExamenCreate) -> GrupoExamen:
+        """
+        Agrega el grupo al examen si no tiene clase ni otro examen en ese horario
+        """
+        recursos = [(ocupacion.GRUPO, obj_in.id_grupo)]
+        registro = ocupacion.registro_grupo(obj_in.id_examen_grupo)
+        with ocupacion.reserva_examen(self.repository.db, registro, obj_in.id_horario, recursos):
+            return super().create(obj_in)
+
+    def update(self, id: str, obj_in: GrupoExamenUpdate) -> Optional[GrupoExamen]:
+        actual = self.repository.get_by_id(id)
+        if actual is None:
+            return None
+        datos = obj_in.dict(exclude_unset=True)
+        recursos = [(ocupacion.GRUPO, datos.get("id_grupo", actual.id_grupo))]
+        with ocupacion.reserva_examen(self.repository.db, ocupacion.registro_grupo(id), actual.id_horario, recursos):
+            return super().update(id, obj_in)
+
+    def delete(self, id: str) -> Optional[GrupoExamen]:
+        grupo = super().delete(id)
+        if grupo is not None:
+            ocupacion.liberar(ocupacion.registro_grupo(id))
+        return grupo
+
+    def _reservar_lote(self, filas: Dict[int, Dict[str, Any]], actuales: Dict[str, GrupoExamen],
+                       reservas: ocupacion.ReservaLote, errores: Dict[int, str]):
+        examenes = {}
+        for i, fila in filas.items():
+            actual = actuales.get(fila["id_examen_grupo"])
+            id_horario = actual.id_horario if actual is not None else fila.get("id_horario")
+            id_grupo = fila.get("id_grupo", actual.id_grupo if actual is not None else None)
+            examenes[i] = (ocupacion.registro_grupo(fila["id_examen_grupo"]), id_horario, [(ocupacion.GRUPO, id_grupo)])
+        ocupacion.reservar_examenes_lote(self.repository.db, reservas, examenes, errores)
+
+    def _despues_de_eliminar_lote(self, eliminados: List[GrupoExamen]):
+        for grupo in eliminados:
+            ocupacion.liberar(ocupacion.registro_grupo(grupo.id_examen_grupo))
\ No newline at end of file
@@ -14,5 +14,11 @@ class GrupoService(BaseService[GrupoEscolar, GrupoEscolarCreate, GrupoEscolarUpd
     def get_with_carrera(self, id_grupo: str) -> Optional[GrupoEscolar]:
         return self.repository.get_with_carrera(id_grupo)
 
-    def get_by_carrera(self, id_carrera: str, skip: int = 0, limit: int = 100) -> List[GrupoEscolar]:
-        return self.repository.get_by_carrera(id_carrera, skip, limit)
\ No newline at end of file
+    def get_by_carrera(
+            self,
+            id_carrera: str,
+            skip: int = 0,
+            limit: int = 100,
+            cursor: Optional[str] = None
+    ) -> List[GrupoEscolar]:
+        return self.repository.get_by_carrera(id_carrera, skip, limit, cursor)
\ No newline at end of file
@@ -1,10 +1,54 @@
-from typing import List, Optional
+import csv
+from datetime import time
+from typing import Any, Dict, List, Optional, Set, TextIO, Tuple
 
 from app.models.HorarioClase import HorarioClase
 from app.repositories.HorarioRepository import HorarioRepository
 from app.schemas.HorarioClaseSchema import HorarioClaseCreate, HorarioClaseUpdate
+from app.schemas.ImportacionSchema import MAX_ERRORES_REPORTE, ErrorLinea, ResultadoImportacion
+from app.services import ocupacion
 from app.services.base_service import BaseService
 
+# Campos de un horario que determinan qué recursos ocupa y cuándo
+CAMPOS_OCUPACION = ("id_periodo", "id_aula", "id_profesor", "id_grupo", "dia_semana", "hora_inicio", "hora_fin")
+
+# Columnas obligatorias del CSV de importación (las mismas que entrega GET /horarios/export)
+COLUMNAS_IMPORTACION = tuple(HorarioClaseCreate.model_fields)
+
+
+def _convertir_fila(fila: Dict[str, Optional[str]], validos: Dict[str, Set[str]],
+                    tablas: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Valores de una fila del CSV ya convertidos, o ValueError con el motivo por el que es inválida
+    Las llaves foráneas se buscan en los conjuntos `validos` precargados, sin consultar la BD
+    """
+    datos: Dict[str, Any] = {}
+    for campo in COLUMNAS_IMPORTACION:
+        valor = (fila.get(campo) or "").strip()
+        if not valor:
+            raise ValueError(f"{campo}: falta el valor")
+        datos[campo] = valor
+    longitud = HorarioClase.__table__.c.id_horario_clase.type.length
+    if len(datos["id_horario_clase"]) > longitud:
+        raise ValueError(f"id_horario_clase: más de {longitud} caracteres")
+    for campo, ids in validos.items():
+        if datos[campo] not in ids:
+            raise ValueError(f"{campo}: no existe {datos[campo]} en {tablas[campo]}")
+    try:
+        datos["dia_semana"] = int(datos["dia_semana"])
+    except ValueError:
+        raise ValueError(f"dia_semana: {datos['dia_semana']} no es un número")
+    if not 1 <= datos["dia_semana"] <= 7:
+        raise ValueError("dia_semana: debe estar entre 1 (lunes) y 7 (domingo)")
+    for campo in ("hora_inicio", "hora_fin"):
+        try:
+            datos[campo] = time.fromisoformat(datos[campo])
+        except ValueError:
+            raise ValueError(f"{campo}: {datos[campo]} no es una hora válida (HH:MM)")
+    if datos["hora_inicio"] >= datos["hora_fin"]:
+        raise ValueError("hora_fin: debe ser posterior a hora_inicio")
+    return datos
+
 
 class HorarioService(BaseService[HorarioClase, HorarioClaseCreate, HorarioClaseUpdate]):
     def __init__(self, repository: HorarioRepository):
@@ -14,8 +58,165 @@ class HorarioService(BaseService[HorarioClase, HorarioClaseCreate, HorarioClaseU
     def get_with_relations(self, id_horario: str) -> Optional[HorarioClase]:
         return self.repository.get_with_relations(id_horario)
 
-    def get_by_profesor(self, id_profesor: str, skip: int = 0, limit: int = 100) -> List[HorarioClase]:
-        return self.repository.get_by_profesor(id_profesor, skip, limit)
+    def get_by_profesor(
+            self,
+            id_profesor: str,
+            skip: int = 0,
+            limit: int = 100,
+            cursor: Optional[str] = None
+    ) -> List[HorarioClase]:
+        return self.repository.get_by_profesor(id_profesor, skip, limit, cursor)
+
+    def get_by_grupo(
+            self,
+            id_grupo: str,
+            skip: int = 0,
+            limit: int = 100,
+            cursor: Optional[str] = None
+    ) -> List[HorarioClase]:
+        return self.repository.get_by_grupo(id_grupo, skip, limit, cursor)
+
+    def create(self, obj_in: HorarioClaseCreate) -> HorarioClase:
+        """
+        Crea el horario si el aula, el profesor y el grupo están libres (ConflictoHorarioError si no)
+        """
+        indice = ocupacion.get_indice(self.repository.db, obj_in.id_periodo)
+        entradas = ocupacion.entradas_clase(obj_in.id_aula, obj_in.id_profesor, obj_in.id_grupo,
+                                            obj_in.dia_semana, obj_in.hora_inicio, obj_in.hora_fin)
+        with ocupacion.reserva(indice, ocupacion.registro_clase(obj_in.id_horario_clase), entradas):
+            return super().create(obj_in)
+
+    def update(self, id: str, obj_in: HorarioClaseUpdate) -> Optional[HorarioClase]:
+        actual = self.repository.get_by_id(id)
+        if actual is None:
+            return None
+        datos = {campo: getattr(actual, campo) for campo in CAMPOS_OCUPACION}
+        datos.update(obj_in.dict(exclude_unset=True, include=set(CAMPOS_OCUPACION)))
+        registro = ocupacion.registro_clase(id)
+        indice = ocupacion.get_indice(self.repository.db, datos["id_periodo"])
+        entradas = ocupacion.entradas_clase(datos["id_aula"], datos["id_profesor"], datos["id_grupo"],
+                                            datos["dia_semana"], datos["hora_inicio"], datos["hora_fin"])
+        periodo_anterior = actual.id_periodo
+        with ocupacion.reserva(indice, registro, entradas):
+            horario = super().update(id, obj_in)
+        if periodo_anterior != datos["id_periodo"]:
+            ocupacion.liberar(registro, periodo_anterior)
+        return horario
+
+    def delete(self, id: str) -> Optional[HorarioClase]:
+        horario = super().delete(id)
+        if horario is not None:
+            ocupacion.liberar(ocupacion.registro_clase(id))
+        return horario
+
+    def importar_csv(self, archivo: TextIO, parcial: bool = False) -> ResultadoImportacion:
+        """
+        Importa horarios desde un CSV con encabezado y las columnas de COLUMNAS_IMPORTACION:
+        crea los nuevos y reemplaza los que ya existen (por id_horario_clase).
+
+        El archivo se lee fila por fila. Las llaves foráneas se validan contra los ids
+        precargados de cada tabla (una consulta por tabla, no por fila) y los choques contra el
+        índice de ocupación, incluidos los choques entre filas del mismo archivo. Las filas
+        válidas se escriben en una sola transacción (COPY en PostgreSQL, ver
+        HorarioRepository.importar). Igual que los lotes, es todo o nada salvo con `parcial`.
+        ValueError si el archivo no es un CSV con las columnas esperadas.
+        """
+        lector = csv.DictReader(archivo)
+        faltantes = [campo for campo in COLUMNAS_IMPORTACION if campo not in (lector.fieldnames or ())]
+        if faltantes:
+            raise ValueError(f"Faltan columnas en el CSV: {', '.join(faltantes)}")
+
+        validos = self.repository.ids_referenciables()
+        tablas = {columna.key: foranea.column.table.name
+                  for columna in HorarioClase.__table__.columns for foranea in columna.foreign_keys}
+        filas: Dict[int, Dict[str, Any]] = {}
+        errores: Dict[int, Tuple[Optional[str], str]] = {}
+        primera_linea: Dict[str, int] = {}
+        total = 0
+        try:
+            for fila in lector:
+                total += 1
+                linea = lector.line_num
+                id_horario = (fila.get("id_horario_clase") or "").strip() or None
+                try:
+                    datos = _convertir_fila(fila, validos, tablas)
+                except ValueError as e:
+                    errores[linea] = (id_horario, str(e))
+                    continue
+                if id_horario in primera_linea:
+                    repetida = f"id_horario_clase: se repite en la línea {primera_linea[id_horario]}"
+                    errores[linea] = (id_horario, repetida)
+                    continue
+                primera_linea[id_horario] = linea
+                filas[linea] = datos
+        except csv.Error as e:
+            raise ValueError(f"CSV inválido en la línea {lector.line_num}: {e}")
+        if not total:
+            raise ValueError("El archivo no trae filas")
+
+        actuales = self.repository.periodos_de(datos["id_horario_clase"] for datos in filas.values())
+        db = self.repository.db
+        reservas = ocupacion.ReservaLote()
+        for linea, datos in filas.items():
+            entradas = ocupacion.entradas_clase(datos["id_aula"], datos["id_profesor"], datos["id_grupo"],
+                                                datos["dia_semana"], datos["hora_inicio"], datos["hora_fin"])
+            try:
+                reservas.reservar(ocupacion.get_indice(db, datos["id_periodo"]),
+                                  ocupacion.registro_clase(datos["id_horario_clase"]), entradas)
+            except ocupacion.ConflictoHorarioError as e:
+                errores[linea] = (datos["id_horario_clase"], str(e))
+
+        validas = [datos for linea, datos in filas.items() if linea not in errores]
+        aplicado = bool(validas) and (parcial or not errores)
+        if not aplicado:
+            reservas.revertir()
+            validas = []
+        else:
+            try:
+                self.repository.importar(validas, set(actuales))
+            except Exception:
+                reservas.revertir()
+                raise
+            reservas.confirmar()
+            for datos in validas:
+                anterior = actuales.get(datos["id_horario_clase"])
+                if anterior is not None and anterior != datos["id_periodo"]:
+                    ocupacion.liberar(ocupacion.registro_clase(datos["id_horario_clase"]), anterior)
+
+        actualizados = sum(1 for datos in validas if datos["id_horario_clase"] in actuales)
+        return ResultadoImportacion(
+            aplicado=aplicado,
+            total=total,
+            creados=len(validas) - actualizados,
+            actualizados=actualizados,
+            fallidos=len(errores),
+            errores=[ErrorLinea(linea=linea, id=id_horario, error=error)
+                     for linea, (id_horario, error) in sorted(errores.items())[:MAX_ERRORES_REPORTE]]
+        )
+
+    def _reservar_lote(self, filas: Dict[int, Dict[str, Any]], actuales: Dict[str, HorarioClase],
+                       reservas: ocupacion.ReservaLote, errores: Dict[int, str]):
+        db = self.repository.db
+        for i, fila in filas.items():
+            actual = actuales.get(fila["id_horario_clase"])
+            datos = {campo: getattr(actual, campo) for campo in CAMPOS_OCUPACION} if actual is not None else {}
+            datos.update((campo, valor) for campo, valor in fila.items() if campo in CAMPOS_OCUPACION)
+            if datos.get("id_periodo") is None:
+                continue
+            entradas = ocupacion.entradas_clase(datos.get("id_aula"), datos.get("id_profesor"), datos.get("id_grupo"),
+                                                datos.get("dia_semana"), datos.get("hora_inicio"), datos.get("hora_fin"))
+            try:
+                reservas.reservar(ocupacion.get_indice(db, datos["id_periodo"]),
+                                  ocupacion.registro_clase(fila["id_horario_clase"]), entradas)
+            except ocupacion.ConflictoHorarioError as e:
+                errores[i] = str(e)
+
+    def _despues_de_actualizar_lote(self, filas: List[Dict[str, Any]], actuales: Dict[str, HorarioClase]):
+        for fila in filas:
+            actual = actuales[fila["id_horario_clase"]]
+            if fila.get("id_periodo", actual.id_periodo) != actual.id_periodo:
+                ocupacion.liberar(ocupacion.registro_clase(actual.id_horario_clase), actual.id_periodo)
 
-    def get_by_grupo(self, id_grupo: str, skip: int = 0, limit: int = 100) -> List[HorarioClase]:
-        return self.repository.get_by_grupo(id_grupo, skip, limit)
\ No newline at end of file
+    def _despues_de_eliminar_lote(self, eliminados: List[HorarioClase]):
+        for horario in eliminados:
+            ocupacion.liberar(ocupacion.registro_clase(horario.id_horario_clase))
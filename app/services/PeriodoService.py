@@ -1,10 +1,13 @@
 from app.models.PeriodoAcademico import PeriodoAcademico
 from app.repositories.PeriodoRepository import PeriodoRepository
 from app.schemas.PeriodoAcademicoSchema import PeriodoAcademicoCreate, PeriodoAcademicoUpdate
+from app.services import catalogo
 from app.services.base_service import BaseService
 
 
 class PeriodoService(BaseService[PeriodoAcademico, PeriodoAcademicoCreate, PeriodoAcademicoUpdate]):
+    cache = catalogo.cache_de(PeriodoAcademico.__tablename__)
+
     def __init__(self, repository: PeriodoRepository):
         super().__init__(repository)
         self.repository = repository
\ No newline at end of file
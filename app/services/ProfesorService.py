@@ -1,15 +1,21 @@
-from typing import List
+from typing import List, Optional
 
 from app.models.Profesor import Profesor
 from app.repositories.ProfesorRepository import ProfesorRepository
 from app.schemas.ProfesorSchema import ProfesorCreate, ProfesorUpdate
+from app.services import catalogo
 from app.services.base_service import BaseService
 
 
 class ProfesorService(BaseService[Profesor, ProfesorCreate, ProfesorUpdate]):
+    cache = catalogo.cache_de(Profesor.__tablename__)
+
     def __init__(self, repository: ProfesorRepository):
         super().__init__(repository)
         self.repository = repository
 
-    def get_activos(self, skip: int = 0, limit: int = 100) -> List[Profesor]:
-        return self.repository.get_activos(skip, limit)
\ No newline at end of file
+    def get_activos(self, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Profesor]:
+        return self._leer(
+            ("get_activos", skip, limit, cursor),
+            lambda: self.repository.get_activos(skip, limit, cursor)
+        )
\ No newline at end of file
@@ -1,10 +1,11 @@
-from typing import List
+from typing import Any, Dict, List, Optional
 from datetime import date
 
 from app.models.SolicitudExamen import SolicitudExamen
 from app.repositories.SolicitudRepository import SolicitudRepository
 from app.schemas.EstadoSolicitudSchema import EstadoSolicitud
 from app.schemas.SolicitudExamenSchema import SolicitudExamenCreate, SolicitudExamenUpdate
+from app.services import ocupacion
 from app.services.base_service import BaseService
 
 
@@ -16,11 +17,50 @@ class SolicitudService(BaseService[SolicitudExamen, SolicitudExamenCreate, Solic
     def get_with_relations(self, id_horario: str) -> SolicitudExamen:
         return self.repository.get_with_relations(id_horario)
 
-    def get_by_estado(self, estado: EstadoSolicitud, skip: int = 0, limit: int = 100) -> List[SolicitudExamen]:
-        return self.repository.get_by_estado(estado, skip, limit)
+    def get_by_estado(
+            self,
+            estado: EstadoSolicitud,
+            skip: int = 0,
+            limit: int = 100,
+            cursor: Optional[str] = None
+    ) -> List[SolicitudExamen]:
+        return self.repository.get_by_estado(estado, skip, limit, cursor)
 
-    def get_by_fecha(self, fecha: date, skip: int = 0, limit: int = 100) -> List[SolicitudExamen]:
-        return self.repository.get_by_fecha(fecha, skip, limit)
+    def get_by_fecha(
+            self,
+            fecha: date,
+            skip: int = 0,
+            limit: int = 100,
+            cursor: Optional[str] = None
+    ) -> List[SolicitudExamen]:
+        return self.repository.get_by_fecha(fecha, skip, limit, cursor)
 
-    def get_by_periodo(self, id_periodo: str, skip: int = 0, limit: int = 100) -> List[SolicitudExamen]:
-        return self.repository.get_by_periodo(id_periodo, skip, limit)
\ No newline at end of file
+    def get_by_periodo(
+            self,
+            id_periodo: str,
+            skip: int = 0,
+            limit: int = 100,
+            cursor: Optional[str] = None
+    ) -> List[SolicitudExamen]:
+        return self.repository.get_by_periodo(id_periodo, skip, limit, cursor)
+
+    def update(self, id: str, obj_in: SolicitudExamenUpdate) -> Optional[SolicitudExamen]:
+        solicitud = super().update(id, obj_in)
+        if solicitud is not None:
+            # Un cambio de estado puede liberar u ocupar aulas, profesores y grupos
+            ocupacion.invalidar_indice(solicitud.id_periodo)
+        return solicitud
+
+    def delete(self, id: str) -> Optional[SolicitudExamen]:
+        solicitud = super().delete(id)
+        if solicitud is not None:
+            ocupacion.invalidar_indice(solicitud.id_periodo)
+        return solicitud
+
+    def _despues_de_actualizar_lote(self, filas: List[Dict[str, Any]], actuales: Dict[str, SolicitudExamen]):
+        for id_periodo in {actuales[fila["id_horario"]].id_periodo for fila in filas}:
+            ocupacion.invalidar_indice(id_periodo)
+
+    def _despues_de_eliminar_lote(self, eliminados: List[SolicitudExamen]):
+        for id_periodo in {solicitud.id_periodo for solicitud in eliminados}:
+            ocupacion.invalidar_indice(id_periodo)
\ No newline at end of file
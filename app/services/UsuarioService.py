@@ -1,45 +1,63 @@
-from typing import Optional
+import asyncio
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from typing import Any, Dict, Optional
 import bcrypt
 from sqlalchemy.orm import Session
 
+from app import metricas
+from app.config import get_settings
+
 from app.models.Usuario import Usuario
 from app.repositories.UsuarioRepository import UsuarioRepository
-from app.schemas.UsuarioSchema import UsuarioCreate, UsuarioUpdate
+from app.schemas.UsuarioSchema import UsuarioCreate, UsuarioResponse, UsuarioUpdate
+from app.services import catalogo
+from app.services.base_service import BaseService
+
+# Usuarios ya autenticados por token, para no consultar la base de datos en cada petición.
+# Se vacía con cada escritura de usuarios; con varios workers un cambio hecho en otro proceso
+# tarda a lo más TTL_USUARIOS_AUTENTICADOS segundos en verse.
+TTL_USUARIOS_AUTENTICADOS = 60
+usuarios_autenticados = catalogo.cache_de("usuarios_autenticados", ttl=TTL_USUARIOS_AUTENTICADOS, max_entradas=1024)
+
+
+logger = logging.getLogger(__name__)
+
+# bcrypt es CPU puro y libera el GIL: se ejecuta en su propio pool para acotar cuántas
+# verificaciones corren a la vez sin ocupar los hilos que atienden peticiones
+_pool_bcrypt = ThreadPoolExecutor(max_workers=get_settings().bcrypt_workers, thread_name_prefix="bcrypt")
 
 
-class UsuarioService:
+def version_autorizacion(usuario: Any) -> str:
+    """
+    Huella de los datos de autorización del usuario (rol, carrera e is_active)
+    Va en el token como "ver": si alguno cambia, los tokens emitidos antes dejan de valer
+    """
+    datos = f"{usuario.rol}|{usuario.id_carrera or ''}|{int(bool(usuario.is_active))}"
+    return hashlib.sha256(datos.encode("utf-8")).hexdigest()[:16]
+
+
+class UsuarioService(BaseService[Usuario, UsuarioCreate, UsuarioUpdate]):
     def __init__(self, repository: UsuarioRepository):
+        super().__init__(repository)
         self.repository = repository
 
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
         """Verifica si la contraseña en texto plano coincide con el hash"""
+        if not hashed_password or not plain_password:
+            return False
+        inicio = perf_counter()
         try:
-            if not hashed_password or not plain_password:
-                return False
-            
-            # Limpiar el hash (eliminar espacios y caracteres extra)
-            hashed_password = hashed_password.strip()
-            
-            # Convertir a bytes si es necesario
-            if isinstance(hashed_password, str):
-                hashed_password_bytes = hashed_password.encode('utf-8')
-            else:
-                hashed_password_bytes = hashed_password
-            
-            if isinstance(plain_password, str):
-                plain_password_bytes = plain_password.encode('utf-8')
-            else:
-                plain_password_bytes = plain_password
-            
-            # Verificar con bcrypt directamente
-            return bcrypt.checkpw(plain_password_bytes, hashed_password_bytes)
-        except Exception as e:
-            print(f"Error verificando contraseña: {str(e)}")
-            print(f"Hash recibido (longitud: {len(hashed_password) if hashed_password else 0}): {hashed_password[:50] if hashed_password else 'None'}...")
-            import traceback
-            traceback.print_exc()
+            return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.strip().encode('utf-8'))
+        except ValueError:
+            # Hash con formato inválido; no se registra el hash ni la contraseña
+            logger.warning("Hash de contraseña con formato inválido")
             return False
+        finally:
+            metricas.observar("bcrypt_verificacion_segundos", perf_counter() - inicio, limites=metricas.BUCKETS_BCRYPT)
 
     @staticmethod
     def get_password_hash(password: str) -> str:
@@ -50,48 +68,40 @@ class UsuarioService:
         hashed = bcrypt.hashpw(password_bytes, salt)
         return hashed.decode('utf-8')
 
-    def authenticate_user(self, username: str, password: str) -> Optional[Usuario]:
+    @classmethod
+    async def verificar_credenciales(cls, usuario: Usuario, password: str) -> bool:
         """
-        Autentica un usuario verificando sus credenciales
-        Retorna el usuario si las credenciales son correctas, None en caso contrario
+        Verifica la contraseña de un usuario ya leído (y que siga activo) con bcrypt en el pool
+        acotado de hilos (BCRYPT_WORKERS), para no bloquear el event loop ni acaparar el
+        threadpool de FastAPI cuando muchos usuarios inician sesión a la vez
+        No registra last_login; el endpoint de login lo anota en app.services.ultimo_login
         """
-        try:
-            usuario = self.repository.get_by_username_or_id(username)
-            if not usuario:
-                print(f"Usuario '{username}' no encontrado")
-                return None
-            
-            if not usuario.is_active:
-                print(f"Usuario '{username}' está inactivo")
-                return None
-            
-            # Debug: verificar hash
-            print(f"Verificando contraseña para usuario: {usuario.id_usuario}")
-            stored_hash = usuario.contraseña.strip() if usuario.contraseña else None
-            print(f"Hash almacenado (longitud: {len(stored_hash) if stored_hash else 0}): {stored_hash[:30] if stored_hash else 'None'}...")
-            print(f"Password recibida: {password}")
-            
-            if not stored_hash:
-                print(f"No hay hash almacenado para usuario: {usuario.id_usuario}")
-                return None
-            
-            if not self.verify_password(password, stored_hash):
-                print(f"Contraseña incorrecta para usuario: {usuario.id_usuario}")
-                return None
-            
-            # Actualizar fecha de último login
-            from datetime import datetime
-            usuario.last_login = datetime.utcnow()
-            self.repository.db.commit()
-            self.repository.db.refresh(usuario)
-            
-            print(f"Autenticación exitosa para usuario: {usuario.id_usuario}")
-            return usuario
-        except Exception as e:
-            print(f"Error en authenticate_user: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            return None
+        if not usuario.is_active:
+            return False
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_pool_bcrypt, cls.verify_password, password, usuario.contraseña)
+
+    @staticmethod
+    def claims_token(usuario: Usuario) -> Dict[str, Any]:
+        """
+        Datos del token de acceso: lo que necesitan las dependencias de autorización
+        """
+        return {
+            "sub": usuario.id_usuario,
+            "rol": usuario.rol,
+            "id_carrera": usuario.id_carrera,
+            "ver": version_autorizacion(usuario),
+        }
+
+    def get_autenticado(self, id_usuario: str) -> Optional[UsuarioResponse]:
+        """
+        Usuario de un token, desde la caché de usuarios autenticados si está vigente
+        """
+        def cargar():
+            usuario = self.repository.get_by_id_usuario(id_usuario)
+            return UsuarioResponse.model_validate(usuario) if usuario is not None else None
+
+        return usuarios_autenticados.obtener(id_usuario, cargar)
 
     def get(self, id_usuario: str) -> Optional[Usuario]:
         return self.repository.get_by_id_usuario(id_usuario)
@@ -111,7 +121,8 @@ class UsuarioService:
         
         # Crear el objeto UsuarioCreate con la contraseña hasheada
         usuario_create = UsuarioCreate(**usuario_data)
-        return self.repository.create(usuario_create)
+        # get_autenticado pudo guardar None para este id (p. ej. un usuario borrado y recreado)
+        return self._invalidar(self.repository.create(usuario_create))
 
     def update(self, id_usuario: str, usuario_update: UsuarioUpdate) -> Optional[Usuario]:
         update_data = usuario_update.dict(exclude_unset=True)
@@ -121,13 +132,24 @@ class UsuarioService:
             update_data['contraseña'] = self.get_password_hash(update_data['contraseña'])
         
         usuario_update_obj = UsuarioUpdate(**update_data)
-        return self.repository.update(id_usuario, usuario_update_obj)
+        return self._invalidar(self.repository.update(id_usuario, usuario_update_obj))
 
     def delete(self, id_usuario: str) -> Optional[Usuario]:
-        return self.repository.delete(id_usuario)
+        return self._invalidar(self.repository.delete(id_usuario))
+
+    def get_all(self, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+        return self.repository.get_all(skip, limit, cursor)
+
+    def get_by_rol(self, rol: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+        return self.repository.get_by_rol(rol, skip, limit, cursor)
 
-    def get_all(self, skip: int = 0, limit: int = 100):
-        return self.repository.get_all(skip, limit)
+    def _preparar_lote(self, filas: Dict[int, Dict[str, Any]]):
+        # Solo se hashean las contraseñas de las filas que sí se van a escribir
+        for fila in filas.values():
+            if fila.get('contraseña'):
+                fila['contraseña'] = self.get_password_hash(fila['contraseña'])
 
-    def get_by_rol(self, rol: str, skip: int = 0, limit: int = 100):
-        return self.repository.get_by_rol(rol, skip, limit)
+    def _invalidar(self, resultado: Any = None) -> Any:
+        # Un cambio de rol, carrera o is_active debe verse en la siguiente petición autenticada
+        usuarios_autenticados.invalidar()
+        return super()._invalidar(resultado)
\ No newline at end of file
@@ -1,5 +1,8 @@
-from typing import Generic, TypeVar, List, Optional
-from app.repositories.base_repository import BaseRepository
+from typing import Any, Callable, Dict, Generic, List, TypeVar, Optional
+from app.repositories.base_repository import AsyncBaseRepository, BaseRepository, Pagina
+from app.schemas.LoteSchema import ACTUALIZADO, CREADO, ELIMINADO, ERROR, OMITIDO, ResultadoFila, ResultadoLote
+from app.services import ocupacion
+from app.services.catalogo import CacheCatalogo
 
 ModelType = TypeVar("ModelType")
 CreateSchemaType = TypeVar("CreateSchemaType")
@@ -7,23 +10,210 @@ UpdateSchemaType = TypeVar("UpdateSchemaType")
 
 
 class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    # Caché de lecturas de las tablas de catálogo (ver app.services.catalogo); None en las demás
+    cache: Optional[CacheCatalogo] = None
+
     def __init__(self, repository: BaseRepository):
         self.repository = repository
 
     def get(self, id: str) -> Optional[ModelType]:
-        return self.repository.get_by_id(id)
+        return self._leer(("get", id), lambda: self.repository.get_by_id(id))
 
-    def get_all(self, skip: int = 0, limit: int = 100) -> List[ModelType]:
-        return self.repository.get_all(skip, limit)
+    def get_all(self, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> Pagina:
+        return self._leer(("get_all", skip, limit, cursor), lambda: self.repository.get_all(skip, limit, cursor))
 
     def create(self, obj_in: CreateSchemaType) -> ModelType:
-        return self.repository.create(obj_in)
+        return self._invalidar(self.repository.create(obj_in))
 
     def update(self, id: str, obj_in: UpdateSchemaType) -> Optional[ModelType]:
-        return self.repository.update(id, obj_in)
+        return self._invalidar(self.repository.update(id, obj_in))
 
     def delete(self, id: str) -> Optional[ModelType]:
-        return self.repository.delete(id)
+        return self._invalidar(self.repository.delete(id))
 
     def count(self) -> int:
-        return self.repository.count()
\ No newline at end of file
+        return self.repository.count()
+
+    def _leer(self, clave: tuple, cargar: Callable[[], Any]) -> Any:
+        """
+        Lectura a través de la caché del catálogo, si el servicio tiene una
+        `clave` debe distinguir la consulta y sus argumentos
+        """
+        if self.cache is None:
+            return cargar()
+        return self.cache.obtener(clave, lambda: self.repository.separar(cargar()))
+
+    def _invalidar(self, resultado: Any = None) -> Any:
+        """
+        Vacía la caché del catálogo después de una escritura; devuelve el resultado tal cual
+        """
+        if self.cache is not None:
+            self.cache.invalidar()
+        return resultado
+
+    # Operaciones por lotes: se valida todo el lote con consultas por conjunto y se escribe
+    # con una sola sentencia de múltiples filas en una transacción. Si alguna fila es inválida
+    # no se escribe nada, salvo con parcial=True, que escribe solo las filas válidas.
+
+    def create_many(self, objs: List[CreateSchemaType], parcial: bool = False) -> ResultadoLote:
+        llave = self.repository.llave.key
+        filas = {i: obj.dict() for i, obj in enumerate(objs)}
+        errores = self._errores_de_llave(filas)
+        existentes = self.repository.ids_existentes(fila[llave] for fila in filas.values())
+        for i, fila in filas.items():
+            if fila[llave] in existentes:
+                errores.setdefault(i, f"Ya existe {llave} = {fila[llave]}")
+        self._validar_filas(filas, errores)
+        return self._aplicar_lote(filas, {}, errores, parcial, CREADO, self.repository.create_many)
+
+    def update_many(self, objs: List[Any], parcial: bool = False) -> ResultadoLote:
+        llave = self.repository.llave.key
+        filas = {i: obj.dict(exclude_unset=True) for i, obj in enumerate(objs)}
+        errores = self._errores_de_llave(filas)
+        actuales = self.repository.get_many(fila[llave] for fila in filas.values())
+        for i, fila in filas.items():
+            if fila[llave] not in actuales:
+                errores.setdefault(i, f"No existe {llave} = {fila[llave]}")
+            elif len(fila) == 1:
+                errores.setdefault(i, "La fila no trae campos para actualizar")
+        self._validar_filas(filas, errores)
+        resultado = self._aplicar_lote(filas, actuales, errores, parcial, ACTUALIZADO, self.repository.update_many)
+        if resultado.aplicado:
+            self._despues_de_actualizar_lote(
+                [fila for i, fila in filas.items() if i not in errores], actuales
+            )
+        return resultado
+
+    def delete_many(self, ids: List[str], parcial: bool = False) -> ResultadoLote:
+        llave = self.repository.llave.key
+        filas = {i: {llave: id} for i, id in enumerate(ids)}
+        errores = self._errores_de_llave(filas)
+        actuales = self.repository.get_many(ids)
+        en_uso = self.repository.referencias_en_uso(actuales)
+        for i, id in enumerate(ids):
+            if id not in actuales:
+                errores.setdefault(i, f"No existe {llave} = {id}")
+            elif id in en_uso:
+                errores.setdefault(i, en_uso[id])
+        resultado = self._aplicar_lote(filas, actuales, errores, parcial, ELIMINADO,
+                                       lambda validas: self.repository.delete_many([f[llave] for f in validas]))
+        if resultado.aplicado:
+            self._despues_de_eliminar_lote([actuales[ids[i]] for i in filas if i not in errores])
+        return resultado
+
+    def _errores_de_llave(self, filas: Dict[int, Dict[str, Any]]) -> Dict[int, str]:
+        llave = self.repository.llave.key
+        errores: Dict[int, str] = {}
+        primera: Dict[str, int] = {}
+        for i, fila in filas.items():
+            if fila[llave] in primera:
+                errores[i] = f"{llave} = {fila[llave]} se repite en la fila {primera[fila[llave]]}"
+            else:
+                primera[fila[llave]] = i
+        return errores
+
+    def _validar_filas(self, filas: Dict[int, Dict[str, Any]], errores: Dict[int, str]):
+        pendientes = {i: fila for i, fila in filas.items() if i not in errores}
+        for origen in (self.repository.errores_de_referencia(pendientes),
+                       self.repository.errores_de_unicidad(pendientes)):
+            for i, error in origen.items():
+                errores.setdefault(i, error)
+
+    def _aplicar_lote(
+            self,
+            filas: Dict[int, Dict[str, Any]],
+            actuales: Dict[str, ModelType],
+            errores: Dict[int, str],
+            parcial: bool,
+            estado: str,
+            escribir: Callable[[List[Dict[str, Any]]], int]
+    ) -> ResultadoLote:
+        reservas = ocupacion.ReservaLote()
+        pendientes = {i: fila for i, fila in filas.items() if i not in errores}
+        if estado != ELIMINADO:
+            self._reservar_lote(pendientes, actuales, reservas, errores)
+        validas = {i: fila for i, fila in pendientes.items() if i not in errores}
+        aplicado = bool(validas) and (parcial or not errores)
+        if not aplicado:
+            reservas.revertir()
+        else:
+            try:
+                self._preparar_lote(validas)
+                escribir(list(validas.values()))
+            except Exception:
+                reservas.revertir()
+                raise
+            reservas.confirmar()
+            self._invalidar()
+
+        llave = self.repository.llave.key
+        resultados = []
+        for i, fila in filas.items():
+            if i in errores:
+                resultados.append(ResultadoFila(indice=i, id=fila[llave], estado=ERROR, error=errores[i]))
+            else:
+                resultados.append(ResultadoFila(indice=i, id=fila[llave], estado=estado if aplicado else OMITIDO))
+        exitosos = len(validas) if aplicado else 0
+        return ResultadoLote(aplicado=aplicado, total=len(filas), exitosos=exitosos,
+                             fallidos=len(errores), resultados=resultados)
+
+    def _reservar_lote(self, filas: Dict[int, Dict[str, Any]], actuales: Dict[str, ModelType],
+                       reservas: ocupacion.ReservaLote, errores: Dict[int, str]):
+        """
+        Validaciones propias del recurso antes de escribir (p. ej. choques de horario)
+        `actuales` trae las filas actuales en actualizaciones y está vacío al crear
+        """
+
+    def _preparar_lote(self, filas: Dict[int, Dict[str, Any]]):
+        """
+        Último ajuste de las filas válidas justo antes de escribirlas
+        """
+
+    def _despues_de_actualizar_lote(self, filas: List[Dict[str, Any]], actuales: Dict[str, ModelType]):
+        pass
+
+    def _despues_de_eliminar_lote(self, eliminados: List[ModelType]):
+        pass
+
+
+class AsyncBaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    """
+    Variante asíncrona de BaseService sobre AsyncBaseRepository (modo DB_ASYNC)
+    Con `cache` comparte la caché del catálogo (y sus claves) con el servicio síncrono
+    """
+
+    def __init__(self, repository: AsyncBaseRepository, cache: Optional[CacheCatalogo] = None):
+        self.repository = repository
+        self.cache = cache
+
+    async def get(self, id: str) -> Optional[ModelType]:
+        return await self._leer(("get", id), lambda: self.repository.get_by_id(id))
+
+    async def get_all(self, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> Pagina:
+        return await self._leer(("get_all", skip, limit, cursor), lambda: self.repository.get_all(skip, limit, cursor))
+
+    async def create(self, obj_in: CreateSchemaType) -> ModelType:
+        return self._invalidar(await self.repository.create(obj_in))
+
+    async def update(self, id: str, obj_in: UpdateSchemaType) -> Optional[ModelType]:
+        return self._invalidar(await self.repository.update(id, obj_in))
+
+    async def delete(self, id: str) -> Optional[ModelType]:
+        return self._invalidar(await self.repository.delete(id))
+
+    async def _leer(self, clave: tuple, cargar: Callable[[], Any]) -> Any:
+        if self.cache is None:
+            return await cargar()
+
+        async def cargar_separado():
+            return self.repository.separar(await cargar())
+
+        return await self.cache.obtener_async(clave, cargar_separado)
+
+    def _invalidar(self, resultado: Any = None) -> Any:
+        if self.cache is not None:
+            self.cache.invalidar()
+        return resultado
+
+    async def count(self) -> int:
+        return await self.repository.count()
\ No newline at end of file
@@ -0,0 +1,132 @@
+"""
+Caché en memoria de las tablas de catálogo (carreras, materias, periodos, tipos de evaluación,
+aulas y profesores)
+
+Estas tablas cambian unas cuantas veces por semestre pero se leen en casi todas las pantallas,
+así que sus lecturas pasan por una caché de lectura (read-through) por tabla: cada consulta
+del servicio (get, get_all, búsquedas) se guarda con su clave y sus argumentos, vence a los
+TTL_CATALOGO segundos y, al pasar de MAX_ENTRADAS_CATALOGO, se desaloja la menos usada.
+Las escrituras hechas con el servicio de la tabla vacían su caché.
+
+Los objetos guardados se separan de la sesión que los leyó para poder devolverlos en otras
+peticiones; solo se leen sus columnas, que ya vienen cargadas. Cada proceso tiene su propia
+caché, así que con varios workers una escritura en uno tarda a lo más TTL_CATALOGO segundos
+en verse en los demás.
+"""
+import threading
+import time as reloj
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Tuple, TypeVar
+
+TTL_CATALOGO = 300
+MAX_ENTRADAS_CATALOGO = 256
+
+T = TypeVar("T")
+
+
+class CacheCatalogo:
+    """
+    Caché LRU con vencimiento por tiempo de las lecturas de una tabla de catálogo
+    """
+
+    def __init__(self, tabla: str, ttl: float = TTL_CATALOGO, max_entradas: int = MAX_ENTRADAS_CATALOGO):
+        self.tabla = tabla
+        self.ttl = ttl
+        self.max_entradas = max_entradas
+        self._entradas: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self.invalidaciones = 0
+
+    def _buscar(self, clave: Hashable) -> Tuple[bool, Any, int]:
+        """
+        (encontrado, valor, versión de la caché al buscar)
+        """
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is not None and entrada[0] > reloj.monotonic():
+                self._entradas.move_to_end(clave)
+                self.aciertos += 1
+                return True, entrada[1], self._version
+            if entrada is not None:
+                del self._entradas[clave]
+            self.fallos += 1
+            return False, None, self._version
+
+    def _guardar(self, clave: Hashable, valor: Any, version: int):
+        with self._lock:
+            # Si hubo una escritura mientras se consultaba, el valor leído puede ser anterior a ella
+            if version != self._version:
+                return
+            self._entradas[clave] = (reloj.monotonic() + self.ttl, valor)
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+                self.desalojos += 1
+
+    def obtener(self, clave: Hashable, cargar: Callable[[], T]) -> T:
+        encontrado, valor, version = self._buscar(clave)
+        if encontrado:
+            return valor
+        valor = cargar()
+        self._guardar(clave, valor, version)
+        return valor
+
+    async def obtener_async(self, clave: Hashable, cargar: Callable[[], Awaitable[T]]) -> T:
+        encontrado, valor, version = self._buscar(clave)
+        if encontrado:
+            return valor
+        valor = await cargar()
+        self._guardar(clave, valor, version)
+        return valor
+
+    def invalidar(self):
+        with self._lock:
+            self._entradas.clear()
+            self._version += 1
+            self.invalidaciones += 1
+
+    def estadisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            return {
+                "tabla": self.tabla,
+                "entradas": len(self._entradas),
+                "max_entradas": self.max_entradas,
+                "ttl": self.ttl,
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "tasa_aciertos": round(self.aciertos / consultas, 4) if consultas else None,
+                "desalojos": self.desalojos,
+                "invalidaciones": self.invalidaciones,
+            }
+
+
+_caches: Dict[str, CacheCatalogo] = {}
+_caches_lock = threading.Lock()
+
+
+def cache_de(tabla: str, ttl: float = TTL_CATALOGO, max_entradas: int = MAX_ENTRADAS_CATALOGO) -> CacheCatalogo:
+    """
+    Caché de la tabla, creada la primera vez que se pide
+    """
+    with _caches_lock:
+        if tabla not in _caches:
+            _caches[tabla] = CacheCatalogo(tabla, ttl, max_entradas)
+        return _caches[tabla]
+
+
+def estadisticas() -> List[Dict[str, Any]]:
+    with _caches_lock:
+        caches = list(_caches.values())
+    return [cache.estadisticas() for cache in caches]
+
+
+def invalidar_todo():
+    with _caches_lock:
+        caches = list(_caches.values())
+    for cache in caches:
+        cache.invalidar()
\ No newline at end of file
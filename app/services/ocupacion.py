@@ -0,0 +1,434 @@
+"""
+Índice en memoria de ocupación de aulas, profesores y grupos por periodo
+
+Las clases se registran por día de la semana y los exámenes por fecha concreta; en ambos
+casos cada registro guarda su máscara de franjas (ver app.services.slots). El índice de un
+periodo se construye una sola vez con consultas por conjunto y después se actualiza en cada
+escritura, así que verificar un choque cuesta una búsqueda en diccionario y unos cuantos AND
+en lugar de recorrer las filas del recurso.
+
+Cada proceso mantiene su propio índice; para acotar la desactualización cuando hay varios
+workers, un índice se reconstruye si tiene más de MAX_EDAD_INDICE segundos.
+"""
+import threading
+import time as reloj
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from datetime import date, time
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from sqlalchemy.orm import Session
+
+from app.repositories.AsignacionAulaRepository import AsignacionAulaRepository
+from app.repositories.AsignacionSinodalRepository import AsignacionSinodalRepository
+from app.repositories.GrupoExamenRepository import GrupoExamenRepository
+from app.repositories.HorarioRepository import HorarioRepository
+from app.repositories.SolicitudRepository import SolicitudRepository
+from app.schemas.EstadoSolicitudSchema import EstadoSolicitud
+from app.services import slots
+
+MAX_EDAD_INDICE = 300
+
+AULA = "aula"
+PROFESOR = "profesor"
+GRUPO = "grupo"
+
+ETIQUETAS = {AULA: ("El aula", "ocupada"), PROFESOR: ("El profesor", "ocupado"), GRUPO: ("El grupo", "ocupado")}
+NOMBRES_DIA = {1: "lunes", 2: "martes", 3: "miércoles", 4: "jueves", 5: "viernes", 6: "sábado", 7: "domingo"}
+
+
+# Funciones que se llaman cada vez que cambia la ocupación, para vaciar lo que se calcula a partir
+# de ella (p. ej. la caché de agendas); se registran con al_cambiar. Se avisa al reservar y otra
+# vez cuando la escritura se confirma en BD, porque una lectura hecha entre ambos momentos pudo
+# volver a guardar en caché las filas anteriores
+_observadores: List[Callable[[], None]] = []
+
+
+def al_cambiar(funcion: Callable[[], None]) -> Callable[[], None]:
+    _observadores.append(funcion)
+    return funcion
+
+
+def _notificar():
+    for funcion in _observadores:
+        funcion()
+
+
+class ConflictoHorarioError(ValueError):
+    """
+    Se intentó ocupar un aula, profesor o grupo que ya está ocupado en ese horario
+    """
+
+
+class Entrada(NamedTuple):
+    tipo: str
+    id_recurso: str
+    cuando: Union[int, date]  # dia_semana para clases, fecha para exámenes
+    mascara: int
+    id_horario: Optional[str] = None  # solicitud a la que pertenece un examen
+
+
+def entradas_clase(id_aula: Optional[str], id_profesor: Optional[str], id_grupo: Optional[str],
+                   dia_semana: Optional[int], hora_inicio: Optional[time], hora_fin: Optional[time]) -> List[Entrada]:
+    """
+    Entradas de ocupación semanal de un horario de clase
+    """
+    if dia_semana is None or hora_inicio is None or hora_fin is None:
+        return []
+    bloque = slots.mascara(hora_inicio, hora_fin)
+    if not bloque:
+        return []
+    recursos = ((AULA, id_aula), (PROFESOR, id_profesor), (GRUPO, id_grupo))
+    return [Entrada(tipo, id_recurso, dia_semana, bloque) for tipo, id_recurso in recursos if id_recurso]
+
+
+def entradas_examen(recursos: List[Tuple[str, Optional[str]]], id_horario: str, fecha: Optional[date],
+                    hora_inicio: Optional[time], hora_fin: Optional[time]) -> List[Entrada]:
+    """
+    Entradas de ocupación de un examen en una fecha concreta para los recursos dados
+    """
+    if fecha is None or hora_inicio is None or hora_fin is None:
+        return []
+    bloque = slots.mascara(hora_inicio, hora_fin)
+    if not bloque:
+        return []
+    return [Entrada(tipo, id_recurso, fecha, bloque, id_horario) for tipo, id_recurso in recursos if id_recurso]
+
+
+class IndiceOcupacion:
+    def __init__(self, id_periodo: str):
+        self.id_periodo = id_periodo
+        self.creado = reloj.monotonic()
+        self._lock = threading.RLock()
+        # (tipo, id_recurso, dia_semana | fecha) -> {registro: Entrada}
+        self._celdas: Dict[Tuple[str, str, Union[int, date]], Dict[str, Entrada]] = defaultdict(dict)
+        # (tipo, id_recurso) -> fechas con exámenes, para cruzar clases contra exámenes
+        self._fechas: Dict[Tuple[str, str], Dict[date, int]] = defaultdict(lambda: defaultdict(int))
+        self._registros: Dict[str, List[Entrada]] = {}
+
+    def __len__(self) -> int:
+        return len(self._registros)
+
+    def _celdas_relacionadas(self, entrada: Entrada):
+        yield entrada.tipo, entrada.id_recurso, entrada.cuando
+        if isinstance(entrada.cuando, date):
+            # Un examen también choca con las clases de ese día de la semana
+            yield entrada.tipo, entrada.id_recurso, entrada.cuando.isoweekday()
+        else:
+            # Una clase también choca con los exámenes que caen en ese día de la semana
+            for fecha in self._fechas.get((entrada.tipo, entrada.id_recurso), ()):
+                if fecha.isoweekday() == entrada.cuando:
+                    yield entrada.tipo, entrada.id_recurso, fecha
+
+    def conflictos(self, entradas: List[Entrada], excluir: Optional[str] = None) -> List[Tuple[Entrada, str]]:
+        """
+        Entradas existentes que se traslapan con las dadas, como pares (entrada_existente, registro)
+        Se ignoran el registro `excluir` y los exámenes de la misma solicitud
+        """
+        encontrados = []
+        with self._lock:
+            for entrada in entradas:
+                for clave in self._celdas_relacionadas(entrada):
+                    for registro, existente in self._celdas.get(clave, {}).items():
+                        if registro == excluir or not existente.mascara & entrada.mascara:
+                            continue
+                        if entrada.id_horario is not None and existente.id_horario == entrada.id_horario:
+                            continue
+                        encontrados.append((existente, registro))
+        return encontrados
+
+    def ocupacion(self, tipo: str, id_recurso: str, cuando: Union[int, date]) -> int:
+        """
+        Máscara de franjas ocupadas de un recurso en un día de la semana o fecha
+        Para una fecha incluye las clases de ese día de la semana
+        """
+        with self._lock:
+            total = 0
+            for entrada in self._celdas.get((tipo, id_recurso, cuando), {}).values():
+                total |= entrada.mascara
+            if isinstance(cuando, date):
+                for entrada in self._celdas.get((tipo, id_recurso, cuando.isoweekday()), {}).values():
+                    total |= entrada.mascara
+            return total
+
+    def mascara_semanal(self, tipo: str, id_recurso: str) -> int:
+        """
+        Clases de un recurso en toda la semana como un solo entero de ancho fijo: el día d ocupa
+        los bits [(d - 1) * SLOTS_POR_DIA, d * SLOTS_POR_DIA), con el lunes en los bits bajos
+        """
+        with self._lock:
+            total = 0
+            for dia in range(1, 8):
+                for entrada in self._celdas.get((tipo, id_recurso, dia), {}).values():
+                    total |= entrada.mascara << (dia - 1) * slots.SLOTS_POR_DIA
+            return total
+
+    def examenes_por_fecha(self, tipo: str, id_recurso: str) -> Dict[date, int]:
+        """
+        Máscara de franjas ocupadas por exámenes de un recurso en cada fecha (sin las clases)
+        """
+        with self._lock:
+            resultado: Dict[date, int] = {}
+            for fecha in self._fechas.get((tipo, id_recurso), ()):
+                for entrada in self._celdas.get((tipo, id_recurso, fecha), {}).values():
+                    resultado[fecha] = resultado.get(fecha, 0) | entrada.mascara
+            return resultado
+
+    def _agregar(self, registro: str, entradas: List[Entrada]):
+        if not entradas:
+            return
+        for entrada in entradas:
+            self._celdas[(entrada.tipo, entrada.id_recurso, entrada.cuando)][registro] = entrada
+            if isinstance(entrada.cuando, date):
+                self._fechas[(entrada.tipo, entrada.id_recurso)][entrada.cuando] += 1
+        self._registros[registro] = entradas
+
+    def _quitar(self, registro: str) -> List[Entrada]:
+        entradas = self._registros.pop(registro, [])
+        for entrada in entradas:
+            clave = (entrada.tipo, entrada.id_recurso, entrada.cuando)
+            celda = self._celdas.get(clave)
+            if celda is not None:
+                celda.pop(registro, None)
+                if not celda:
+                    del self._celdas[clave]
+            if isinstance(entrada.cuando, date):
+                fechas = self._fechas[(entrada.tipo, entrada.id_recurso)]
+                fechas[entrada.cuando] -= 1
+                if fechas[entrada.cuando] <= 0:
+                    del fechas[entrada.cuando]
+        return entradas
+
+    def cargar(self, registro: str, entradas: List[Entrada]):
+        """
+        Registra entradas sin verificar choques (construcción inicial del índice)
+        """
+        with self._lock:
+            self._quitar(registro)
+            self._agregar(registro, entradas)
+
+    def reservar(self, registro: str, entradas: List[Entrada]) -> List[Entrada]:
+        """
+        Sustituye atómicamente las entradas de un registro, o lanza ConflictoHorarioError si chocan
+        Regresa las entradas anteriores para poder restaurarlas si la escritura en BD falla
+        """
+        with self._lock:
+            choques = self.conflictos(entradas, excluir=registro)
+            if choques:
+                raise ConflictoHorarioError(describir_conflicto(*choques[0]))
+            anteriores = self._quitar(registro)
+            self._agregar(registro, entradas)
+        _notificar()
+        return anteriores
+
+    def liberar(self, registro: str) -> List[Entrada]:
+        with self._lock:
+            anteriores = self._quitar(registro)
+        _notificar()
+        return anteriores
+
+
+def describir_conflicto(entrada: Entrada, registro: str) -> str:
+    if isinstance(entrada.cuando, date):
+        cuando = f"el {entrada.cuando.isoformat()}"
+    else:
+        cuando = f"el {NOMBRES_DIA.get(entrada.cuando, entrada.cuando)}"
+    inicio = slots.primer_bit(entrada.mascara)
+    fin = entrada.mascara.bit_length()
+    tipo, _, id_registro = registro.partition(":")
+    sujeto, ocupado = ETIQUETAS[entrada.tipo]
+    return (
+        f"{sujeto} {entrada.id_recurso} ya está {ocupado} {cuando} de "
+        f"{slots.hora_de_slot(inicio).strftime('%H:%M')} a {slots.hora_de_slot(fin).strftime('%H:%M')} "
+        f"({tipo} {id_registro})"
+    )
+
+
+def registro_clase(id_horario_clase: str) -> str:
+    return f"clase:{id_horario_clase}"
+
+
+def registro_aula(id_examen_aula: str) -> str:
+    return f"aplicacion:{id_examen_aula}"
+
+
+def registro_sinodal(id_examen_sinodal: str) -> str:
+    return f"sinodal:{id_examen_sinodal}"
+
+
+def registro_grupo(id_examen_grupo: str) -> str:
+    return f"examen:{id_examen_grupo}"
+
+
+def construir_indice(db: Session, id_periodo: str) -> IndiceOcupacion:
+    """
+    Construye el índice de un periodo con cuatro consultas por conjunto
+    """
+    indice = IndiceOcupacion(id_periodo)
+    rechazado = EstadoSolicitud.RECHAZADO.value
+
+    for fila in HorarioRepository(db).get_ocupacion_por_periodo(id_periodo):
+        indice.cargar(registro_clase(fila.id_horario_clase), entradas_clase(
+            fila.id_aula, fila.id_profesor, fila.id_grupo, fila.dia_semana, fila.hora_inicio, fila.hora_fin
+        ))
+    for fila in AsignacionAulaRepository(db).get_ocupacion_por_periodo(id_periodo):
+        if fila.estado != rechazado:
+            indice.cargar(registro_aula(fila.id_examen_aula), entradas_examen(
+                [(AULA, fila.id_aula), (PROFESOR, fila.id_profesor_aplicador)],
+                fila.id_horario, fila.fecha_examen, fila.hora_inicio, fila.hora_fin
+            ))
+    for fila in AsignacionSinodalRepository(db).get_ocupacion_por_periodo(id_periodo):
+        if fila.estado != rechazado:
+            indice.cargar(registro_sinodal(fila.id_examen_sinodal), entradas_examen(
+                [(PROFESOR, fila.id_profesor)],
+                fila.id_horario, fila.fecha_examen, fila.hora_inicio, fila.hora_fin
+            ))
+    for fila in GrupoExamenRepository(db).get_ocupacion_por_periodo(id_periodo):
+        if fila.estado != rechazado:
+            indice.cargar(registro_grupo(fila.id_examen_grupo), entradas_examen(
+                [(GRUPO, fila.id_grupo)],
+                fila.id_horario, fila.fecha_examen, fila.hora_inicio, fila.hora_fin
+            ))
+    return indice
+
+
+_indices: Dict[str, IndiceOcupacion] = {}
+_indices_lock = threading.Lock()
+
+
+def get_indice(db: Session, id_periodo: str) -> IndiceOcupacion:
+    """
+    Índice del periodo, construyéndolo si no existe o si ya expiró
+    """
+    with _indices_lock:
+        indice = _indices.get(id_periodo)
+        if indice is not None and reloj.monotonic() - indice.creado < MAX_EDAD_INDICE:
+            return indice
+        indice = construir_indice(db, id_periodo)
+        _indices[id_periodo] = indice
+        return indice
+
+
+def liberar(registro: str, id_periodo: Optional[str] = None):
+    """
+    Quita un registro de los índices ya construidos (de todos, o solo del periodo indicado)
+    """
+    with _indices_lock:
+        if id_periodo is None:
+            indices = list(_indices.values())
+        else:
+            indices = [_indices[id_periodo]] if id_periodo in _indices else []
+    for indice in indices:
+        indice.liberar(registro)
+    # Aunque no haya índices construidos, la fila ya no ocupa nada
+    _notificar()
+
+
+@contextmanager
+def reserva(indice: IndiceOcupacion, registro: str, entradas: List[Entrada]):
+    """
+    Reserva las entradas en el índice durante una escritura y las revierte si la escritura falla
+    """
+    anteriores = indice.reservar(registro, entradas)
+    try:
+        yield
+    except Exception:
+        indice.cargar(registro, anteriores)
+        raise
+    _notificar()
+
+
+def invalidar_indice(id_periodo: Optional[str] = None):
+    """
+    Descarta el índice de un periodo (o todos) para que se reconstruya en el siguiente uso
+    """
+    with _indices_lock:
+        if id_periodo is None:
+            _indices.clear()
+        else:
+            _indices.pop(id_periodo, None)
+    _notificar()
+
+
+class ReservaLote:
+    """
+    Reservas de varias filas de un lote que se confirman juntas o se revierten juntas
+    """
+
+    def __init__(self):
+        self._hechas: List[Tuple[IndiceOcupacion, str, List[Entrada]]] = []
+
+    def reservar(self, indice: IndiceOcupacion, registro: str, entradas: List[Entrada]):
+        """
+        Reserva como IndiceOcupacion.reservar (ConflictoHorarioError si choca) y recuerda cómo deshacerlo
+        Las filas anteriores del mismo lote ya cuentan, así que también se detectan choques entre ellas
+        """
+        anteriores = indice.reservar(registro, entradas)
+        self._hechas.append((indice, registro, anteriores))
+
+    def revertir(self):
+        for indice, registro, anteriores in reversed(self._hechas):
+            indice.cargar(registro, anteriores)
+        self._hechas.clear()
+
+    def confirmar(self):
+        """
+        Se llama después de guardar el lote en BD: las reservas se quedan y se avisa del cambio
+        """
+        self._hechas.clear()
+        _notificar()
+
+
+def get_examen(db: Session, id_horario: Optional[str]):
+    """
+    Solicitud de examen de una asignación, o None si no existe
+    """
+    if not id_horario:
+        return None
+    return SolicitudRepository(db).get_by_id(id_horario)
+
+
+def get_examenes(db: Session, ids_horario) -> Dict[str, object]:
+    """
+    Solicitudes de examen de varias filas en una sola consulta, por id_horario
+    """
+    return SolicitudRepository(db).get_many(i for i in ids_horario if i)
+
+
+def reservar_examenes_lote(db: Session, reservas: ReservaLote, filas: Dict[int, Tuple[str, Optional[str], list]],
+                           errores: Dict[int, str]):
+    """
+    Reserva en lote los recursos de exámenes; filas es {indice: (registro, id_horario, recursos)}
+    Los choques se anotan en `errores` por fila en lugar de interrumpir el lote
+    """
+    examenes = get_examenes(db, {id_horario for _, id_horario, _ in filas.values()})
+    for i, (registro, id_horario, recursos) in filas.items():
+        solicitud = examenes.get(id_horario)
+        if solicitud is None or solicitud.id_periodo is None:
+            continue
+        try:
+            reservas.reservar(get_indice(db, solicitud.id_periodo), registro,
+                              entradas_de_solicitud(solicitud, recursos))
+        except ConflictoHorarioError as e:
+            errores[i] = str(e)
+
+
+def entradas_de_solicitud(solicitud, recursos: List[Tuple[str, Optional[str]]]) -> List[Entrada]:
+    """
+    Entradas de ocupación de un examen; las solicitudes rechazadas no ocupan recursos
+    """
+    if solicitud is None or solicitud.estado == EstadoSolicitud.RECHAZADO.value:
+        return []
+    return entradas_examen(recursos, solicitud.id_horario, solicitud.fecha_examen,
+                           solicitud.hora_inicio, solicitud.hora_fin)
+
+
+def reserva_examen(db: Session, registro: str, id_horario: Optional[str], recursos: List[Tuple[str, Optional[str]]]):
+    """
+    Reserva (ver `reserva`) los recursos de un examen en el índice del periodo de su solicitud
+    """
+    solicitud = get_examen(db, id_horario)
+    if solicitud is None or solicitud.id_periodo is None:
+        return nullcontext()
+    indice = get_indice(db, solicitud.id_periodo)
+    return reserva(indice, registro, entradas_de_solicitud(solicitud, recursos))
@@ -0,0 +1,129 @@
+"""
+Modelo discreto de franjas horarias
+
+Cada día se divide en franjas de SLOT_MINUTOS minutos y la ocupación de un recurso
+durante un día se representa como un entero: el bit i encendido indica que la
+franja i está ocupada. Así, detectar un choque es un AND entre dos enteros.
+"""
+from datetime import date, time, timedelta
+from typing import Iterable, List, Tuple
+
+SLOT_MINUTOS = 30
+SLOTS_POR_DIA = 24 * 60 // SLOT_MINUTOS
+MASCARA_DIA = (1 << SLOTS_POR_DIA) - 1
+
+# Días de la semana con la misma numeración que HorarioClase.dia_semana (1 = lunes)
+DIAS_HABILES = (1, 2, 3, 4, 5)
+
+
+def slot_de(hora: time) -> int:
+    """
+    Franja en la que comienza una hora (redondeando hacia abajo)
+    """
+    return (hora.hour * 60 + hora.minute) // SLOT_MINUTOS
+
+
+def slot_fin(hora: time) -> int:
+    """
+    Primera franja libre después de una hora de fin (redondeando hacia arriba)
+    """
+    minutos = hora.hour * 60 + hora.minute + (1 if hora.second or hora.microsecond else 0)
+    return -(-minutos // SLOT_MINUTOS)
+
+
+def hora_de_slot(slot: int) -> time:
+    """
+    Hora en la que comienza una franja; la franja final del día se reporta como 23:59:59
+    """
+    if slot >= SLOTS_POR_DIA:
+        return time(23, 59, 59)
+    minutos = slot * SLOT_MINUTOS
+    return time(minutos // 60, minutos % 60)
+
+
+def duracion_slots(hora_inicio: time, hora_fin: time) -> int:
+    """
+    Número de franjas que cubre el intervalo [hora_inicio, hora_fin)
+    """
+    return max(slot_fin(hora_fin) - slot_de(hora_inicio), 0)
+
+
+def mascara(hora_inicio: time, hora_fin: time) -> int:
+    """
+    Máscara de bits de las franjas cubiertas por [hora_inicio, hora_fin)
+    Un intervalo vacío o invertido produce 0
+    """
+    inicio = slot_de(hora_inicio)
+    fin = slot_fin(hora_fin)
+    if fin <= inicio:
+        return 0
+    return ((1 << (fin - inicio)) - 1) << inicio
+
+
+def mascara_slots(inicio: int, duracion: int) -> int:
+    """
+    Máscara de `duracion` franjas consecutivas a partir de la franja `inicio`
+    """
+    return ((1 << duracion) - 1) << inicio
+
+
+def inicios_libres(ocupado: int, duracion: int, permitido: int = MASCARA_DIA) -> int:
+    """
+    Máscara de las franjas donde puede comenzar un bloque de `duracion` franjas
+    sin tocar `ocupado` y sin salir de `permitido`
+    """
+    if duracion <= 0:
+        return 0
+    libre = permitido & ~ocupado
+    inicios = libre
+    paso = 1
+    # Erosión por duplicación: tras cada iteración `inicios` garantiza `paso` franjas libres
+    while paso < duracion:
+        desplazamiento = min(paso, duracion - paso)
+        inicios &= inicios >> desplazamiento
+        paso += desplazamiento
+    return inicios
+
+
+def primer_bit(valor: int) -> int:
+    """
+    Índice del bit encendido menos significativo, -1 si no hay ninguno
+    """
+    return (valor & -valor).bit_length() - 1
+
+
+def bits(valor: int) -> Iterable[int]:
+    """
+    Itera los índices de los bits encendidos en orden ascendente
+    """
+    while valor:
+        menor = valor & -valor
+        yield menor.bit_length() - 1
+        valor ^= menor
+
+
+def tramos(valor: int) -> List[Tuple[int, int]]:
+    """
+    Tramos de bits encendidos consecutivos como pares (primera franja, número de franjas)
+    """
+    resultado = []
+    while valor:
+        inicio = primer_bit(valor)
+        largo = primer_bit(~(valor >> inicio))
+        resultado.append((inicio, largo))
+        valor &= ~mascara_slots(inicio, largo)
+    return resultado
+
+
+def fechas_en_rango(inicio: date, fin: date, dias_semana: Iterable[int] = DIAS_HABILES) -> List[date]:
+    """
+    Fechas entre inicio y fin (inclusive) cuyo día de la semana está en dias_semana
+    """
+    permitidos = set(dias_semana)
+    fechas = []
+    actual = inicio
+    while actual <= fin:
+        if actual.isoweekday() in permitidos:
+            fechas.append(actual)
+        actual += timedelta(days=1)
+    return fechas
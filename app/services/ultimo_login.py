@@ -0,0 +1,118 @@
+"""
+Buffer de escritura diferida (write-behind) para Usuario.last_login
+
+Cada login exitoso solo anota la fecha en memoria; un hilo en segundo plano guarda lo
+acumulado con un solo UPDATE por lotes cada INTERVALO_ULTIMO_LOGIN segundos, o antes si se
+juntan MAX_PENDIENTES_ULTIMO_LOGIN usuarios. Así un login ya no abre una transacción de
+escritura. Al apagar la aplicación se guarda lo pendiente; si el proceso muere, se pierden a
+lo más las fechas de los últimos INTERVALO_ULTIMO_LOGIN segundos.
+"""
+import logging
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+from app.database import SessionLocal
+from app.repositories.UsuarioRepository import UsuarioRepository
+
+INTERVALO_ULTIMO_LOGIN = 5
+MAX_PENDIENTES_ULTIMO_LOGIN = 500
+
+logger = logging.getLogger(__name__)
+
+
+def _guardar(ultimos: Dict[str, datetime]):
+    db = SessionLocal()
+    try:
+        UsuarioRepository(db).update_last_login(ultimos)
+    finally:
+        db.close()
+
+
+class BufferUltimoLogin:
+    def __init__(
+            self,
+            guardar: Callable[[Dict[str, datetime]], None] = _guardar,
+            intervalo: float = INTERVALO_ULTIMO_LOGIN,
+            max_pendientes: int = MAX_PENDIENTES_ULTIMO_LOGIN
+    ):
+        self.guardar = guardar
+        self.intervalo = intervalo
+        self.max_pendientes = max_pendientes
+        self._pendientes: Dict[str, datetime] = {}
+        self._lock = threading.Lock()
+        self._guardando = threading.Lock()
+        self._despertar = threading.Event()
+        self._detener = threading.Event()
+        self._hilo: Optional[threading.Thread] = None
+
+    def registrar(self, id_usuario: str, cuando: datetime):
+        """
+        Anota el último login de un usuario; si ya tenía uno pendiente se queda el más reciente
+        """
+        with self._lock:
+            anterior = self._pendientes.get(id_usuario)
+            if anterior is None or cuando > anterior:
+                self._pendientes[id_usuario] = cuando
+            lleno = len(self._pendientes) >= self.max_pendientes
+        if lleno:
+            if self._hilo is not None and self._hilo.is_alive():
+                self._despertar.set()
+            else:
+                self.vaciar()
+
+    def vaciar(self) -> int:
+        """
+        Guarda lo pendiente con un solo UPDATE; si falla, lo regresa al buffer para reintentar
+        """
+        with self._guardando:
+            with self._lock:
+                lote, self._pendientes = self._pendientes, {}
+            if not lote:
+                return 0
+            try:
+                self.guardar(lote)
+            except Exception:
+                logger.exception("No se pudo guardar last_login de %d usuarios", len(lote))
+                with self._lock:
+                    for id_usuario, cuando in lote.items():
+                        actual = self._pendientes.get(id_usuario)
+                        if actual is None or cuando > actual:
+                            self._pendientes[id_usuario] = cuando
+                return 0
+            return len(lote)
+
+    def pendientes(self) -> int:
+        with self._lock:
+            return len(self._pendientes)
+
+    def iniciar(self):
+        if self._hilo is not None and self._hilo.is_alive():
+            return
+        self._detener.clear()
+        self._hilo = threading.Thread(target=self._ciclo, name="ultimo-login", daemon=True)
+        self._hilo.start()
+
+    def detener(self):
+        """
+        Detiene el hilo y guarda lo que quede pendiente
+        """
+        self._detener.set()
+        self._despertar.set()
+        if self._hilo is not None:
+            self._hilo.join()
+            self._hilo = None
+        self.vaciar()
+
+    def _ciclo(self):
+        while not self._detener.is_set():
+            self._despertar.wait(self.intervalo)
+            self._despertar.clear()
+            self.vaciar()
+
+
+buffer = BufferUltimoLogin()
+
+
+def registrar(id_usuario: str, cuando: datetime):
+    buffer.registrar(id_usuario, cuando)
\ No newline at end of file
@@ -0,0 +1,135 @@
+"""
+Vistas materializadas de estadísticas (ESTADISTICAS_MATERIALIZADAS=true, solo PostgreSQL)
+
+Las cifras de GET /estadisticas se leen de vistas materializadas en lugar de calcularse en
+cada petición. Un listener del engine anota qué tablas escribe cada conexión; cuando una
+transacción que tocó alguna de TABLAS_ESTADISTICAS se confirma, se pide un refresco. Un hilo
+en segundo plano espera INTERVALO_REFRESCO_ESTADISTICAS segundos para juntar las escrituras
+seguidas (un lote o una importación refrescan una sola vez) y luego refresca todas las vistas
+con REFRESH ... CONCURRENTLY. Las cifras pueden ir hasta ese intervalo atrás de los datos.
+Como las vistas viven en la base de datos, todos los workers ven el refresco de cualquiera.
+"""
+import logging
+import threading
+from typing import Callable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql.dml import UpdateBase
+
+from app.database import SessionReportes
+from app.repositories.EstadisticaRepository import TABLAS_ESTADISTICAS, EstadisticaRepository
+
+INTERVALO_REFRESCO_ESTADISTICAS = 10
+
+logger = logging.getLogger(__name__)
+
+_CLAVE_PENDIENTE = "estadisticas_pendientes"
+
+
+def _refrescar():
+    db = SessionReportes()
+    try:
+        EstadisticaRepository(db, materializadas=True).refrescar_vistas()
+    finally:
+        db.close()
+
+
+class RefrescoEstadisticas:
+    def __init__(self, refrescar: Callable[[], None] = _refrescar, intervalo: float = INTERVALO_REFRESCO_ESTADISTICAS):
+        self.refrescar = refrescar
+        self.intervalo = intervalo
+        self._pendiente = threading.Event()
+        self._detener = threading.Event()
+        self._hilo: Optional[threading.Thread] = None
+
+    def marcar(self):
+        self._pendiente.set()
+
+    def pendiente(self) -> bool:
+        return self._pendiente.is_set()
+
+    def refrescar_ahora(self) -> bool:
+        """
+        Refresca si hay escrituras pendientes; si falla, queda pendiente para el siguiente ciclo
+        """
+        if not self._pendiente.is_set():
+            return False
+        self._pendiente.clear()
+        try:
+            self.refrescar()
+        except Exception:
+            logger.exception("No se pudieron refrescar las vistas de estadísticas")
+            self._pendiente.set()
+            return False
+        return True
+
+    def iniciar(self):
+        if self._hilo is not None and self._hilo.is_alive():
+            return
+        self._detener.clear()
+        self._hilo = threading.Thread(target=self._ciclo, name="refresco-estadisticas", daemon=True)
+        self._hilo.start()
+
+    def detener(self):
+        """
+        Detiene el hilo y hace el refresco que haya quedado pendiente
+        """
+        pendiente = self._pendiente.is_set()
+        self._detener.set()
+        self._pendiente.set()
+        if self._hilo is not None:
+            self._hilo.join()
+            self._hilo = None
+        if not pendiente:
+            self._pendiente.clear()
+        self.refrescar_ahora()
+
+    def _ciclo(self):
+        while not self._detener.is_set():
+            self._pendiente.wait()
+            # Junta las escrituras que sigan llegando antes de refrescar
+            if self._detener.wait(self.intervalo):
+                return
+            self.refrescar_ahora()
+
+
+refresco = RefrescoEstadisticas()
+
+
+def _despues_de_ejecutar(conexion, sentencia, *args):
+    if isinstance(sentencia, UpdateBase) and getattr(sentencia.table, "name", None) in TABLAS_ESTADISTICAS:
+        conexion.info[_CLAVE_PENDIENTE] = True
+
+
+def _al_confirmar(conexion):
+    if conexion.info.pop(_CLAVE_PENDIENTE, False):
+        refresco.marcar()
+
+
+def _al_revertir(conexion):
+    conexion.info.pop(_CLAVE_PENDIENTE, None)
+
+
+def instalar(engine: Engine):
+    """
+    Crea las vistas que falten, empieza a vigilar las escrituras del engine y arranca el hilo
+    """
+    db = SessionReportes()
+    try:
+        EstadisticaRepository(db).crear_vistas()
+    finally:
+        db.close()
+    if not event.contains(engine, "after_execute", _despues_de_ejecutar):
+        event.listen(engine, "after_execute", _despues_de_ejecutar)
+        event.listen(engine, "commit", _al_confirmar)
+        event.listen(engine, "rollback", _al_revertir)
+    refresco.iniciar()
+
+
+def desinstalar(engine: Engine):
+    if event.contains(engine, "after_execute", _despues_de_ejecutar):
+        event.remove(engine, "after_execute", _despues_de_ejecutar)
+        event.remove(engine, "commit", _al_confirmar)
+        event.remove(engine, "rollback", _al_revertir)
+    refresco.detener()
\ No newline at end of file
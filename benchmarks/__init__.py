@@ -0,0 +1,4 @@
+"""
+Suite de benchmarks: generador de datos sintéticos, microbenchmarks de repositorios y
+latencia/rendimiento de endpoints. Uso: python -m benchmarks --help
+"""
\ No newline at end of file
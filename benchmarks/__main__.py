@@ -0,0 +1,210 @@
+"""
+Uso:
+    python -m benchmarks correr [--db URL] [--escala 1.0] [--semilla N] [--salida resultados.json]
+    python -m benchmarks comparar base.json nuevo.json [--umbral 10]
+
+`correr` genera los datos si la base de datos está vacía (por omisión un archivo SQLite en el
+directorio temporal, que se reutiliza en las siguientes corridas), mide los repositorios y los
+endpoints y escribe un JSON. `comparar` muestra la diferencia de p50 y de sentencias SQL entre
+dos corridas y termina con código 1 si algo empeoró más que el umbral.
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+from typing import Any, Dict, List
+
+# La configuración de la aplicación exige los datos de conexión aunque aquí se use otro engine
+for variable in ("DB_HOST", "DB_USER", "DB_PASSWORD", "DB_NAME"):
+    os.environ.setdefault(variable, "benchmark")
+
+from sqlalchemy import create_engine, event  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app import instrumentacion  # noqa: E402
+from benchmarks import endpoints, generador, muestras, repositorios  # noqa: E402
+from benchmarks.medicion import TIEMPO_POR_PRUEBA  # noqa: E402
+
+VERSION_FORMATO = 1
+BASE_DATOS_DEFAULT = "sqlite:///" + os.path.join(tempfile.gettempdir(), "benchmark_examenes.sqlite3")
+UMBRAL_REGRESION = 10.0
+
+
+def crear_engine(url: str):
+    if not url.startswith("sqlite"):
+        return create_engine(url, pool_pre_ping=True)
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+
+    # pysqlite abre y cierra transacciones por su cuenta y rompe los SAVEPOINT con que se
+    # revierten las escrituras medidas; se le quita ese control y el BEGIN lo emite SQLAlchemy
+    @event.listens_for(engine, "connect")
+    def _sin_transaccion_implicita(conexion_dbapi, registro):
+        conexion_dbapi.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin(conexion):
+        conexion.exec_driver_sql("BEGIN")
+
+    return engine
+
+
+def _commit_git() -> Any:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                check=True).stdout.strip()
+        sucio = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True,
+                               text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f"{commit}-sucio" if sucio else commit
+
+
+def _version_servidor(engine) -> str:
+    with engine.connect() as conexion:
+        info = conexion.dialect.server_version_info
+    return f"{engine.dialect.name} {'.'.join(str(parte) for parte in info or ())}".strip()
+
+
+def correr(args) -> int:
+    engine = crear_engine(args.db)
+    instrumentacion.instalar(engine)
+    filtro = (lambda nombre: re.search(args.solo, nombre) is not None) if args.solo else (lambda nombre: True)
+
+    filas = generador.contar_filas(engine) if not args.recrear else {}
+    if not any(filas.values()):
+        print(f"Generando datos (escala {args.escala}, semilla {args.semilla})...", file=sys.stderr)
+        filas = generador.generar(engine, args.escala, args.semilla, recrear=args.recrear,
+                                  avance=lambda tabla, n: print(f"  {tabla}: {n}", file=sys.stderr))
+    else:
+        print("Usando los datos que ya tiene la base de datos", file=sys.stderr)
+
+    fabrica_sesiones = sessionmaker(bind=engine, autoflush=False)
+    db = fabrica_sesiones()
+    try:
+        valores = muestras.elegir(db)
+    finally:
+        db.close()
+
+    def avance(nombre: str):
+        print(f"  {nombre}", file=sys.stderr)
+
+    resultado: Dict[str, Any] = {
+        "formato": VERSION_FORMATO,
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "commit": _commit_git(),
+        "python": platform.python_version(),
+        "base_datos": _version_servidor(engine),
+        "filas": filas,
+        "tiempo_por_prueba": args.tiempo,
+        "muestras": {nombre: str(valor) for nombre, valor in valores.items()},
+    }
+    if not args.sin_repositorios:
+        print("Repositorios:", file=sys.stderr)
+        resultado["repositorios"], omitidos_repositorios = repositorios.ejecutar(
+            engine, valores, args.tiempo, filtro, avance)
+    else:
+        omitidos_repositorios = {}
+    if not args.sin_endpoints:
+        print("Endpoints:", file=sys.stderr)
+        resultado["endpoints"], omitidos_endpoints = endpoints.ejecutar(
+            fabrica_sesiones, valores, args.tiempo, args.concurrencia, filtro, avance)
+    else:
+        omitidos_endpoints = {}
+    resultado["omitidos"] = {**omitidos_repositorios, **omitidos_endpoints}
+
+    texto = json.dumps(resultado, indent=2, ensure_ascii=False)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            archivo.write(texto + "\n")
+        print(f"Resultados en {args.salida}", file=sys.stderr)
+    else:
+        print(texto)
+    for nombre, motivo in resultado["omitidos"].items():
+        print(f"  omitido {nombre}: {motivo}", file=sys.stderr)
+    return 0
+
+
+def _cambio(antes: float, despues: float) -> float:
+    return 100.0 * (despues - antes) / antes if antes else 0.0
+
+
+def comparar(args) -> int:
+    with open(args.base, encoding="utf-8") as archivo:
+        base = json.load(archivo)
+    with open(args.nuevo, encoding="utf-8") as archivo:
+        nuevo = json.load(archivo)
+    if base.get("filas") != nuevo.get("filas") or base.get("base_datos") != nuevo.get("base_datos"):
+        print("Aviso: las corridas no usan los mismos datos o el mismo motor; la comparación es orientativa")
+
+    regresiones: List[str] = []
+    for seccion in ("repositorios", "endpoints"):
+        antes, despues = base.get(seccion, {}), nuevo.get(seccion, {})
+        comunes = sorted(set(antes) & set(despues),
+                         key=lambda nombre: -_cambio(antes[nombre]["p50_ms"], despues[nombre]["p50_ms"]))
+        if not comunes:
+            continue
+        print(f"\n{seccion}")
+        print(f"  {'p50 antes':>11} {'p50 ahora':>11} {'cambio':>8} {'SQL':>7}  nombre")
+        for nombre in comunes:
+            a, d = antes[nombre], despues[nombre]
+            cambio = _cambio(a["p50_ms"], d["p50_ms"])
+            consultas = str(d["consultas"])
+            if a["consultas"] != d["consultas"]:
+                consultas = f"{a['consultas']}→{d['consultas']}"
+            marca = ""
+            if cambio > args.umbral or d["consultas"] > a["consultas"]:
+                marca = "  ← regresión"
+                regresiones.append(f"{seccion}: {nombre}")
+            print(f"  {a['p50_ms']:>9.3f}ms {d['p50_ms']:>9.3f}ms {cambio:>+7.1f}% {consultas:>7}  {nombre}{marca}")
+        for nombre in sorted(set(despues) - set(antes)):
+            d = despues[nombre]
+            print(f"  {'':>11} {d['p50_ms']:>9.3f}ms {'nueva':>8} {d['consultas']:>7}  {nombre}")
+        solo_antes = len(set(antes) - set(despues))
+        if solo_antes:
+            print(f"  ({solo_antes} pruebas solo en {args.base})")
+
+    if regresiones:
+        print(f"\n{len(regresiones)} regresiones (más de {args.umbral}% en p50 o más sentencias SQL)")
+        return 1
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmarks de la API de exámenes")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    parser_correr = comandos.add_parser("correr", help="Genera los datos si hace falta y mide")
+    parser_correr.add_argument("--db", default=BASE_DATOS_DEFAULT,
+                               help="URL de SQLAlchemy; usar una base de datos dedicada a las pruebas")
+    parser_correr.add_argument("--escala", type=float, default=1.0, help="Multiplica el tamaño de los datos")
+    parser_correr.add_argument("--semilla", type=int, default=generador.SEMILLA)
+    parser_correr.add_argument("--recrear", action="store_true",
+                               help="Borrar las tablas y generar los datos de nuevo")
+    parser_correr.add_argument("--tiempo", type=float, default=TIEMPO_POR_PRUEBA,
+                               help="Segundos de medición por prueba")
+    parser_correr.add_argument("--concurrencia", type=int, default=endpoints.CONCURRENCIA,
+                               help="Peticiones simultáneas en la prueba de carga de los endpoints")
+    parser_correr.add_argument("--solo", help="Expresión regular: medir solo las pruebas cuyo nombre coincida")
+    parser_correr.add_argument("--sin-repositorios", action="store_true")
+    parser_correr.add_argument("--sin-endpoints", action="store_true")
+    parser_correr.add_argument("--salida", help="Archivo JSON de resultados (por omisión, la salida estándar)")
+    parser_correr.set_defaults(funcion=correr)
+
+    parser_comparar = comandos.add_parser("comparar", help="Compara dos archivos de resultados")
+    parser_comparar.add_argument("base")
+    parser_comparar.add_argument("nuevo")
+    parser_comparar.add_argument("--umbral", type=float, default=UMBRAL_REGRESION,
+                                 help="Porcentaje de aumento de p50 que cuenta como regresión")
+    parser_comparar.set_defaults(funcion=comparar)
+
+    args = parser.parse_args()
+    return args.funcion(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
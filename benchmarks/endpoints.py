@@ -0,0 +1,175 @@
+"""
+Latencia y rendimiento de los endpoints a través de la aplicación ASGI completa
+
+Las peticiones pasan por todos los middlewares, la validación y la serialización, sin red de
+por medio (httpx con ASGITransport) y sin el evento de arranque: la aplicación usa el engine
+de la prueba en lugar del de la configuración. Cada endpoint se mide dos veces:
+
+- en serie, para la latencia (p50/p95) y las sentencias SQL por petición (X-DB-Queries);
+- con `concurrencia` peticiones a la vez durante `tiempo` segundos, para las peticiones por
+  segundo y la latencia bajo carga (los endpoints síncronos compiten por el threadpool y el pool
+  de conexiones, como en producción).
+"""
+import asyncio
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+from sqlalchemy.orm import sessionmaker
+
+from app.database import get_db, get_db_reportes
+from app.instrumentacion import HEADER_CONSULTAS
+from app.main import app
+
+from benchmarks.generador import CONTRASENA_BENCHMARK
+from benchmarks.medicion import CALENTAMIENTO, MAX_REPETICIONES, MIN_REPETICIONES, resumir
+
+PREFIJO = "/api/v1"
+CONCURRENCIA = 8
+
+# (método, ruta con {parámetros} de benchmarks.muestras, cuerpo JSON)
+ENDPOINTS: List[Tuple[str, str, Optional[Dict[str, Any]]]] = [
+    ("GET", "/carreras/", None),
+    ("GET", "/carreras/{id_carrera}", None),
+    ("GET", "/profesores/activos", None),
+    ("GET", "/profesores/{id_profesor}", None),
+    ("GET", "/profesores/{id_profesor}/agenda?desde={desde}&hasta={hasta}", None),
+    ("GET", "/aulas/disponibles?capacidad_minima={capacidad_minima}", None),
+    ("GET", "/aulas/disponibles?fecha={fecha}&hora_inicio=09:00&hora_fin=11:00&capacidad_minima={capacidad_minima}"
+            "&periodo={id_periodo}", None),
+    ("GET", "/grupos/carrera/{id_carrera}", None),
+    ("GET", "/grupos/{id_grupo}/completo", None),
+    ("GET", "/horarios/", None),
+    ("GET", "/horarios/{id_horario_clase}", None),
+    ("GET", "/horarios/{id_horario_clase}/completo", None),
+    ("GET", "/horarios/profesor/{id_profesor}", None),
+    ("GET", "/horarios/grupo/{id_grupo}", None),
+    ("GET", "/horarios/export?id_periodo={id_periodo}", None),
+    ("GET", "/solicitudes/", None),
+    ("GET", "/solicitudes/{id_horario}", None),
+    ("GET", "/solicitudes/estado/1", None),
+    ("GET", "/solicitudes/fecha/{fecha}", None),
+    ("GET", "/solicitudes/periodo/{id_periodo}", None),
+    ("GET", "/grupos-examen/solicitud/{id_horario}", None),
+    ("GET", "/asignaciones-aulas/solicitud/{id_horario}", None),
+    ("GET", "/asignaciones-sinodales/solicitud/{id_horario}", None),
+    ("GET", "/examenes/{id_horario}", None),
+    ("GET", "/examenes/?periodo={id_periodo}", None),
+    ("GET", "/permisos/profesor/{id_profesor}", None),
+    ("GET", "/ventanas/", None),
+    ("GET", "/disponibilidad/?grupos={id_grupo}&ventana={id_ventana}", None),
+    ("GET", "/estadisticas/periodo/{id_periodo}", None),
+    ("POST", "/auth/login", {"user": "{id_usuario}", "password": CONTRASENA_BENCHMARK}),
+]
+
+
+def _aplicacion(fabrica_sesiones: sessionmaker):
+    def get_db_benchmark():
+        db = fabrica_sesiones()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = get_db_benchmark
+    app.dependency_overrides[get_db_reportes] = get_db_benchmark
+    return app
+
+
+def _rellenar(valor: Any, muestras: Dict[str, Any]) -> Any:
+    if isinstance(valor, str):
+        return valor.format(**muestras)
+    if isinstance(valor, dict):
+        return {llave: _rellenar(v, muestras) for llave, v in valor.items()}
+    return valor
+
+
+async def _medir_endpoint(
+        cliente: httpx.AsyncClient,
+        metodo: str,
+        url: str,
+        cuerpo: Optional[Dict[str, Any]],
+        tiempo: float,
+        concurrencia: int
+) -> Dict[str, Any]:
+    async def pedir() -> httpx.Response:
+        respuesta = await cliente.request(metodo, url, json=cuerpo)
+        if respuesta.status_code != 200:
+            raise RuntimeError(f"HTTP {respuesta.status_code}: {respuesta.text[:200]}")
+        return respuesta
+
+    for _ in range(CALENTAMIENTO):
+        respuesta = await pedir()
+    consultas = int(respuesta.headers.get(HEADER_CONSULTAS, 0))
+
+    duraciones: List[float] = []
+    acumulado = 0.0
+    while len(duraciones) < MAX_REPETICIONES and (len(duraciones) < MIN_REPETICIONES or acumulado < tiempo):
+        inicio = perf_counter()
+        await pedir()
+        duraciones.append(perf_counter() - inicio)
+        acumulado += duraciones[-1]
+    resultado = resumir(duraciones)
+    resultado["consultas"] = consultas
+
+    bajo_carga: List[float] = []
+    limite = perf_counter() + tiempo
+
+    async def trabajador():
+        while perf_counter() < limite:
+            inicio = perf_counter()
+            await pedir()
+            bajo_carga.append(perf_counter() - inicio)
+
+    inicio = perf_counter()
+    await asyncio.gather(*(trabajador() for _ in range(concurrencia)))
+    transcurrido = perf_counter() - inicio
+    carga = resumir(bajo_carga)
+    resultado["carga"] = {
+        "concurrencia": concurrencia,
+        "peticiones_s": round(len(bajo_carga) / transcurrido, 1),
+        "p50_ms": carga["p50_ms"],
+        "p95_ms": carga["p95_ms"],
+    }
+    return resultado
+
+
+async def _medir_todos(
+        fabrica_sesiones: sessionmaker,
+        muestras: Dict[str, Any],
+        tiempo: float,
+        concurrencia: int,
+        filtro: Callable[[str], bool],
+        avance: Callable[[str], None]
+) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    resultados: Dict[str, Any] = {}
+    omitidos: Dict[str, str] = {}
+    transporte = httpx.ASGITransport(app=_aplicacion(fabrica_sesiones))
+    async with httpx.AsyncClient(transport=transporte, base_url="http://benchmark") as cliente:
+        for metodo, ruta, cuerpo in ENDPOINTS:
+            nombre = f"{metodo} {ruta}"
+            if not filtro(nombre):
+                continue
+            avance(nombre)
+            try:
+                resultados[nombre] = await _medir_endpoint(
+                    cliente, metodo, PREFIJO + _rellenar(ruta, muestras), _rellenar(cuerpo, muestras),
+                    tiempo, concurrencia
+                )
+            except Exception as e:
+                omitidos[nombre] = f"{type(e).__name__}: {e}".splitlines()[0]
+    return resultados, omitidos
+
+
+def ejecutar(
+        fabrica_sesiones: sessionmaker,
+        muestras: Dict[str, Any],
+        tiempo: float,
+        concurrencia: int = CONCURRENCIA,
+        filtro: Callable[[str], bool] = lambda nombre: True,
+        avance: Callable[[str], None] = lambda nombre: None
+) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """
+    Mide todos los ENDPOINTS; devuelve (resultados por endpoint, omitidos con su motivo)
+    """
+    return asyncio.run(_medir_todos(fabrica_sesiones, muestras, tiempo, concurrencia, filtro, avance))
\ No newline at end of file
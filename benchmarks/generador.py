@@ -0,0 +1,376 @@
+"""
+Generador de un conjunto de datos universitario sintético y reproducible
+
+Sigue el esquema y las convenciones de db/init_database.sql (ids, periodos, tipos de
+evaluación, estados de las solicitudes) a una escala realista. Con escala=1.0:
+
+    50 carreras (las 9 del script más 41 sintéticas), 800 profesores, 600 materias,
+    400 aulas, 2,000 grupos, 60,000 horarios de clase, ~4,000 permisos de sinodal,
+    20,000 solicitudes de examen con sus grupos, aulas, aplicadores y sinodales
+
+La misma semilla y escala producen exactamente los mismos datos. Los horarios de clase no
+se traslapan (ni por grupo, ni por profesor, ni por aula) para que el índice de ocupación
+y las validaciones vean datos válidos; los exámenes sí pueden chocar entre sí, como las
+solicitudes reales antes de calendarizar.
+"""
+import random
+from datetime import date, datetime, time, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple
+
+import bcrypt
+from sqlalchemy import func, insert, inspect, select
+from sqlalchemy.engine import Engine
+
+from app.database import Base
+from app.models.AsignacionAula import AsignacionAula
+from app.models.AsignacionSinodal import AsignacionSinodal
+from app.models.Aula import Aula
+from app.models.Carrera import Carrera
+from app.models.GrupoEscolar import GrupoEscolar
+from app.models.GrupoExamen import GrupoExamen
+from app.models.HorarioClase import HorarioClase
+from app.models.Materia import Materia
+from app.models.PeriodoAcademico import PeriodoAcademico
+from app.models.PermisoSinodal import PermisoSinodal
+from app.models.Profesor import Profesor
+from app.models.SolicitudExamen import SolicitudExamen
+from app.models.TipoEvaluacion import TipoEvaluacion
+from app.models.Usuario import Usuario
+from app.models.VentanaAplicacion import VentanaAplicacion
+
+SEMILLA = 20240601
+TAMANO_LOTE_INSERCION = 5000
+
+# Contraseña de todos los usuarios generados (admin, jefeNNN, servicios001)
+CONTRASENA_BENCHMARK = "bench123"
+
+ESCALA_BASE = {
+    "carreras": 50,
+    "profesores": 800,
+    "materias": 600,
+    "aulas": 400,
+    "grupos": 2000,
+    "horarios": 60000,
+    "permisos_por_profesor": 5,
+    "solicitudes": 20000,
+}
+
+CARRERAS_EJEMPLO = [
+    ("A06LAM01", "Licenciatura en Administración Municipal"),
+    ("A06LAP02", "Licenciatura en Administración Pública"),
+    ("A06LCB03", "Licenciaturas en Ciencias Biomédicas"),
+    ("A06LCE04", "Licenciatura en Ciencias Empresariales"),
+    ("A06LE05", "Licenciatura en Enfermería"),
+    ("A06LI06", "Licenciatura en Informática"),
+    ("A06LM07", "Licenciatura en Medicina"),
+    ("A06LN08", "Licenciatura en Nutrición"),
+    ("A06LO09", "Licenciatura en Odontología"),
+]
+PERIODOS = [
+    ("2024-1", "Enero-Junio 2024"),
+    ("2024-2", "Agosto-Diciembre 2024"),
+    ("2025-1", "Enero-Junio 2025"),
+]
+EVALUACIONES = [
+    ("EVAL001", "Ordinario"),
+    ("EVAL002", "Extraordinario"),
+    ("EVAL003", "Título de Suficiencia"),
+    ("EVAL004", "Regularización"),
+]
+# Proporción de las solicitudes que cae en cada tipo de evaluación
+PESOS_EVALUACION = [0.6, 0.25, 0.1, 0.05]
+# Proporción de solicitudes pendientes, aprobadas y rechazadas (estado 0, 1, 2)
+PESOS_ESTADO = [0.35, 0.5, 0.15]
+
+AREAS = [
+    "Arquitectura", "Biología", "Contaduría", "Derecho", "Economía", "Física", "Matemáticas",
+    "Psicología", "Química", "Sociología", "Ingeniería Civil", "Ingeniería Industrial",
+    "Ingeniería en Sistemas", "Mercadotecnia", "Comunicación", "Diseño Gráfico", "Turismo",
+    "Gastronomía", "Agronomía", "Veterinaria", "Trabajo Social", "Historia", "Filosofía",
+]
+TEMAS = [
+    "Cálculo", "Álgebra Lineal", "Programación", "Base de Datos", "Estadística", "Anatomía",
+    "Fisiología", "Bioquímica", "Contabilidad", "Microeconomía", "Derecho Civil", "Redes",
+    "Sistemas Operativos", "Farmacología", "Nutrición Clínica", "Física", "Química Orgánica",
+    "Metodología", "Ética", "Inglés", "Administración", "Finanzas", "Mercadotecnia", "Dibujo",
+]
+NOMBRES = ["Juan", "María", "Carlos", "Ana", "Luis", "Sofía", "Jorge", "Lucía", "Miguel", "Elena",
+           "Pedro", "Laura", "José", "Carmen", "Raúl", "Patricia", "Diego", "Gabriela", "Andrés", "Rosa"]
+APELLIDOS = ["Pérez", "González", "Rodríguez", "Hernández", "Fernández", "López", "Martínez",
+             "Sánchez", "Torres", "Ramírez", "Flores", "Morales", "Ortiz", "Castillo", "Vargas",
+             "Reyes", "Cruz", "Jiménez", "Ruiz", "Mendoza"]
+TITULOS = ["Dr.", "Dra.", "Mtro.", "Mtra.", "Lic.", "Ing."]
+CAPACIDADES = [(25, 2), (30, 4), (35, 4), (40, 3), (45, 2), (60, 1), (100, 0.3)]
+ROMANOS = ["I", "II", "III", "IV", "V", "VI", "VII", "VIII"]
+
+# Bloques de clase de una hora, de lunes a viernes de 7:00 a 21:00
+DIAS_CLASE = range(1, 6)
+HORAS_CLASE = range(7, 21)
+
+
+class DatosExistentesError(RuntimeError):
+    pass
+
+
+def _cantidad(nombre: str, escala: float) -> int:
+    return max(1, round(ESCALA_BASE[nombre] * escala))
+
+
+def _lotes(filas: Sequence[Dict[str, Any]], tamano: int) -> Iterator[Sequence[Dict[str, Any]]]:
+    for i in range(0, len(filas), tamano):
+        yield filas[i:i + tamano]
+
+
+def _ventanas() -> List[Dict[str, Any]]:
+    """
+    Una ventana de 11 días por periodo y tipo de evaluación: la ordinaria al cierre del
+    semestre (10 de junio o 10 de diciembre) y cada una de las siguientes tres semanas después
+    """
+    ventanas = []
+    for i, (id_periodo, _) in enumerate(PERIODOS):
+        anio, semestre = id_periodo.split("-")
+        cierre = date(int(anio), 6 if semestre == "1" else 12, 10)
+        for j, (id_evaluacion, _) in enumerate(EVALUACIONES):
+            inicio = cierre + timedelta(weeks=3 * j)
+            ventanas.append({
+                "id_ventana": f"VENT{i * len(EVALUACIONES) + j + 1:03d}",
+                "id_periodo": id_periodo,
+                "id_evaluacion": id_evaluacion,
+                "fecha_inicio_examenes": inicio,
+                "fecha_fin_examenes": inicio + timedelta(days=10),
+            })
+    return ventanas
+
+
+def _horarios(
+        rng: random.Random,
+        total: int,
+        grupos: List[str],
+        profesores: List[str],
+        aulas: List[str],
+        materias: List[str]
+) -> List[Dict[str, Any]]:
+    """
+    Reparte `total` clases de una hora entre los periodos y los grupos. Cada grupo elige sus
+    bloques de la semana y en cada bloque los grupos reciben profesores y aulas distintos,
+    así que no hay traslapes; si en un bloque hay más grupos que aulas o profesores, los
+    sobrantes se quedan sin esa clase.
+    """
+    bloques = [(dia, hora) for dia in DIAS_CLASE for hora in HORAS_CLASE]
+    clases_por_grupo = min(len(bloques), max(1, round(total / len(PERIODOS) / len(grupos))))
+    horarios: List[Dict[str, Any]] = []
+    for id_periodo, _ in PERIODOS:
+        por_bloque: Dict[Tuple[int, int], List[Tuple[str, str]]] = {}
+        for id_grupo in grupos:
+            plan = rng.sample(materias, min(len(materias), max(1, clases_por_grupo // 2)))
+            for i, bloque in enumerate(rng.sample(bloques, clases_por_grupo)):
+                por_bloque.setdefault(bloque, []).append((id_grupo, plan[i % len(plan)]))
+        for (dia, hora), clases in sorted(por_bloque.items()):
+            cupo = min(len(clases), len(profesores), len(aulas))
+            for (id_grupo, id_materia), id_profesor, id_aula in zip(
+                    clases[:cupo], rng.sample(profesores, cupo), rng.sample(aulas, cupo)):
+                horarios.append({
+                    "id_horario_clase": f"HOR{len(horarios) + 1:07d}",
+                    "id_periodo": id_periodo,
+                    "id_materia": id_materia,
+                    "id_grupo": id_grupo,
+                    "id_profesor": id_profesor,
+                    "id_aula": id_aula,
+                    "dia_semana": dia,
+                    "hora_inicio": time(hora),
+                    "hora_fin": time(hora + 1),
+                })
+    return horarios[:total]
+
+
+def _examenes(
+        rng: random.Random,
+        total: int,
+        ventanas: List[Dict[str, Any]],
+        grupos: List[str],
+        profesores: List[str],
+        aulas: List[str],
+        materias: List[str]
+) -> Dict[Any, List[Dict[str, Any]]]:
+    """
+    Solicitudes de examen dentro de la ventana de su periodo y evaluación, con 1 a 3 grupos;
+    las aprobadas llevan un aula y un aplicador por grupo y dos sinodales
+    """
+    solicitudes, grupos_examen, aulas_asignadas, sinodales = [], [], [], []
+    por_evaluacion = {id_evaluacion: [v for v in ventanas if v["id_evaluacion"] == id_evaluacion]
+                      for id_evaluacion, _ in EVALUACIONES}
+    for n in range(1, total + 1):
+        id_evaluacion = rng.choices([e[0] for e in EVALUACIONES], PESOS_EVALUACION)[0]
+        ventana = rng.choice(por_evaluacion[id_evaluacion])
+        dias = (ventana["fecha_fin_examenes"] - ventana["fecha_inicio_examenes"]).days
+        fecha = ventana["fecha_inicio_examenes"] + timedelta(days=rng.randint(0, dias))
+        if fecha.weekday() >= 5:
+            fecha -= timedelta(days=fecha.weekday() - 4)
+        hora = rng.randint(8, 17)
+        estado = rng.choices([0, 1, 2], PESOS_ESTADO)[0]
+        id_horario = f"SOL{n:06d}"
+        solicitudes.append({
+            "id_horario": id_horario,
+            "id_periodo": ventana["id_periodo"],
+            "id_evaluacion": id_evaluacion,
+            "id_materia": rng.choice(materias),
+            "fecha_examen": fecha,
+            "hora_inicio": time(hora),
+            "hora_fin": time(hora + 2),
+            "estado": estado,
+            "motivo_rechazo": "Sin aula disponible en el horario solicitado" if estado == 2 else None,
+            "is_manualmente_editado": rng.random() < 0.05,
+        })
+        grupos_solicitud = rng.sample(grupos, min(len(grupos), rng.choices([1, 2, 3], [0.6, 0.3, 0.1])[0]))
+        for id_grupo in grupos_solicitud:
+            grupos_examen.append({
+                "id_examen_grupo": f"EXGR{len(grupos_examen) + 1:07d}",
+                "id_horario": id_horario,
+                "id_grupo": id_grupo,
+            })
+        if estado != 1:
+            continue
+        for id_aula in rng.sample(aulas, min(len(aulas), len(grupos_solicitud))):
+            aulas_asignadas.append({
+                "id_examen_aula": f"ASIG{len(aulas_asignadas) + 1:07d}",
+                "id_horario": id_horario,
+                "id_aula": id_aula,
+                "id_profesor_aplicador": rng.choice(profesores),
+            })
+        for id_profesor in rng.sample(profesores, min(len(profesores), 2)):
+            sinodales.append({
+                "id_examen_sinodal": f"SIN{len(sinodales) + 1:07d}",
+                "id_horario": id_horario,
+                "id_profesor": id_profesor,
+            })
+    return {
+        SolicitudExamen: solicitudes,
+        GrupoExamen: grupos_examen,
+        AsignacionAula: aulas_asignadas,
+        AsignacionSinodal: sinodales,
+    }
+
+
+def construir(escala: float = 1.0, semilla: int = SEMILLA) -> Dict[Any, List[Dict[str, Any]]]:
+    """
+    Filas de cada modelo, en orden de inserción (los catálogos antes que lo que los referencia)
+    """
+    rng = random.Random(semilla)
+
+    n_carreras = _cantidad("carreras", escala)
+    carreras = [{"id_carrera": id_carrera, "nombre_carrera": nombre}
+                for id_carrera, nombre in CARRERAS_EJEMPLO[:n_carreras]]
+    for n in range(len(carreras) + 1, n_carreras + 1):
+        area = AREAS[(n - 1) % len(AREAS)]
+        carreras.append({"id_carrera": f"A06LS{n:02d}", "nombre_carrera": f"Licenciatura en {area} {n}"})
+    ids_carreras = [c["id_carrera"] for c in carreras]
+
+    # Un solo hash: bcrypt es deliberadamente lento y todos comparten la contraseña
+    hash_contrasena = bcrypt.hashpw(CONTRASENA_BENCHMARK.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    creado = datetime(2024, 1, 8, 9, 0)
+    usuarios = [{"id_usuario": "admin", "nombre_usuario": "Administrador del Sistema", "email": None,
+                 "id_carrera": None, "contraseña": hash_contrasena, "rol": "admin", "is_active": True,
+                 "created_at": creado, "last_login": None}]
+    for n, carrera in enumerate(carreras, 1):
+        usuarios.append({"id_usuario": f"jefe{n:03d}", "nombre_usuario": f"Jefe - {carrera['nombre_carrera']}",
+                         "email": f"jefe{n:03d}@example.edu", "id_carrera": carrera["id_carrera"],
+                         "contraseña": hash_contrasena, "rol": "jefe", "is_active": True,
+                         "created_at": creado, "last_login": None})
+    usuarios.append({"id_usuario": "servicios001", "nombre_usuario": "Servicios Escolares", "email": None,
+                     "id_carrera": None, "contraseña": hash_contrasena, "rol": "servicios", "is_active": True,
+                     "created_at": creado, "last_login": None})
+
+    profesores = [{
+        "id_profesor": f"PROF{n:04d}",
+        "nombre_profesor": " ".join(
+            (rng.choice(TITULOS), rng.choice(NOMBRES), rng.choice(APELLIDOS), rng.choice(APELLIDOS))),
+        "is_disable": rng.random() < 0.03,
+    } for n in range(1, _cantidad("profesores", escala) + 1)]
+    activos = [p["id_profesor"] for p in profesores if not p["is_disable"]]
+
+    materias = [{
+        "id_materia": f"MAT{n:04d}",
+        "nombre_materia": f"{TEMAS[(n - 1) % len(TEMAS)]} {ROMANOS[(n - 1) // len(TEMAS) % len(ROMANOS)]}",
+    } for n in range(1, _cantidad("materias", escala) + 1)]
+    ids_materias = [m["id_materia"] for m in materias]
+
+    aulas = []
+    for n in range(1, _cantidad("aulas", escala) + 1):
+        capacidad = rng.choices([c for c, _ in CAPACIDADES], [p for _, p in CAPACIDADES])[0]
+        nombre = "Auditorio" if capacidad >= 100 else "Laboratorio" if capacidad == 25 else "Aula"
+        aulas.append({"id_aula": f"AULA{n:04d}", "nombre_aula": f"{nombre} {n}", "capacidad": capacidad,
+                      "is_disable": rng.random() < 0.02})
+    habilitadas = [a["id_aula"] for a in aulas if not a["is_disable"]]
+
+    grupos = []
+    for n in range(1, _cantidad("grupos", escala) + 1):
+        semestre = rng.randint(1, 9)
+        grupos.append({"id_grupo": f"GRUPO{n:05d}", "nombre_grupo": f"{semestre}{'ABCDEF'[n % 6]}",
+                       "numero_alumnos": rng.randint(15, 45), "id_carrera": rng.choice(ids_carreras)})
+    ids_grupos = [g["id_grupo"] for g in grupos]
+
+    ventanas = _ventanas()
+    horarios = _horarios(rng, _cantidad("horarios", escala), ids_grupos, activos, habilitadas, ids_materias)
+
+    permisos = []
+    for id_profesor in activos:
+        for id_materia in rng.sample(ids_materias, min(len(ids_materias), ESCALA_BASE["permisos_por_profesor"])):
+            permisos.append({"id_regla": f"PERM{len(permisos) + 1:06d}", "id_profesor": id_profesor,
+                             "id_materia": id_materia})
+
+    datos: Dict[Any, List[Dict[str, Any]]] = {
+        Carrera: carreras,
+        Usuario: usuarios,
+        Profesor: profesores,
+        PeriodoAcademico: [{"id_periodo": i, "nombre_periodo": n} for i, n in PERIODOS],
+        Materia: materias,
+        TipoEvaluacion: [{"id_evaluacion": i, "nombre_evaluacion": n} for i, n in EVALUACIONES],
+        Aula: aulas,
+        GrupoEscolar: grupos,
+        VentanaAplicacion: ventanas,
+        HorarioClase: horarios,
+        PermisoSinodal: permisos,
+    }
+    datos.update(_examenes(rng, _cantidad("solicitudes", escala), ventanas, ids_grupos, activos, habilitadas,
+                           ids_materias))
+    return datos
+
+
+def contar_filas(engine: Engine) -> Dict[str, int]:
+    """
+    Filas de cada tabla del modelo; las que todavía no existen cuentan 0 (base de datos nueva)
+    """
+    with engine.connect() as conexion:
+        existentes = set(inspect(conexion).get_table_names())
+        return {tabla.name: conexion.execute(select(func.count()).select_from(tabla)).scalar_one()
+                if tabla.name in existentes else 0
+                for tabla in Base.metadata.sorted_tables}
+
+
+def generar(
+        engine: Engine,
+        escala: float = 1.0,
+        semilla: int = SEMILLA,
+        recrear: bool = False,
+        avance: Callable[[str, int], None] = lambda tabla, filas: None
+) -> Dict[str, int]:
+    """
+    Crea las tablas que falten e inserta el conjunto de datos en una sola transacción, con
+    INSERT de múltiples filas en lotes de TAMANO_LOTE_INSERCION. Si ya hay datos lanza
+    DatosExistentesError, salvo con recrear=True, que borra y vuelve a crear todas las
+    tablas de la aplicación: usar solo con una base de datos dedicada a las pruebas.
+    Devuelve el número de filas de cada tabla.
+    """
+    if recrear:
+        Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    if any(contar_filas(engine).values()):
+        raise DatosExistentesError("La base de datos ya tiene datos; usar una vacía o recrear=True")
+
+    datos = construir(escala, semilla)
+    with engine.begin() as conexion:
+        for modelo, filas in datos.items():
+            for lote in _lotes(filas, TAMANO_LOTE_INSERCION):
+                conexion.execute(insert(modelo), lote)
+            avance(modelo.__tablename__, len(filas))
+    return contar_filas(engine)
\ No newline at end of file
@@ -0,0 +1,71 @@
+"""
+Medición de tiempos: repeticiones adaptativas y percentiles en milisegundos
+"""
+import math
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional
+
+from app.instrumentacion import presupuesto_consultas
+
+CALENTAMIENTO = 3
+MIN_REPETICIONES = 5
+MAX_REPETICIONES = 500
+TIEMPO_POR_PRUEBA = 1.0
+
+
+def percentil(ordenados: List[float], p: float) -> float:
+    return ordenados[max(0, math.ceil(p * len(ordenados)) - 1)]
+
+
+def resumir(duraciones: List[float]) -> Dict[str, Any]:
+    """
+    Estadísticas de una lista de duraciones en segundos, en milisegundos
+    """
+    ordenados = sorted(duraciones)
+    n = len(ordenados)
+    total = sum(ordenados)
+    return {
+        "n": n,
+        "min_ms": round(1000 * ordenados[0], 3),
+        "p50_ms": round(1000 * percentil(ordenados, 0.5), 3),
+        "p95_ms": round(1000 * percentil(ordenados, 0.95), 3),
+        "max_ms": round(1000 * ordenados[-1], 3),
+        "media_ms": round(1000 * total / n, 3),
+        "ops_s": round(n / total, 1) if total else None,
+    }
+
+
+def medir(
+        funcion: Callable[[Any], Any],
+        preparar: Optional[Callable[[], Any]] = None,
+        tiempo: float = TIEMPO_POR_PRUEBA,
+        max_repeticiones: int = MAX_REPETICIONES
+) -> Dict[str, Any]:
+    """
+    Llama a `funcion(preparar())` CALENTAMIENTO veces sin medir y luego la repite hasta
+    juntar `tiempo` segundos (al menos MIN_REPETICIONES, a lo más `max_repeticiones`);
+    `preparar` corre fuera del tiempo medido. Además del resumen de tiempos, reporta las
+    sentencias SQL de una llamada, que no dependen del hardware y delatan los N+1.
+    """
+    preparar = preparar or (lambda: None)
+    for _ in range(CALENTAMIENTO):
+        funcion(preparar())
+
+    argumento = preparar()
+    with presupuesto_consultas() as presupuesto:
+        inicio = perf_counter()
+        funcion(argumento)
+    duraciones = [perf_counter() - inicio]
+
+    acumulado = duraciones[0]
+    while len(duraciones) < max_repeticiones and (len(duraciones) < MIN_REPETICIONES or acumulado < tiempo):
+        argumento = preparar()
+        inicio = perf_counter()
+        funcion(argumento)
+        duracion = perf_counter() - inicio
+        duraciones.append(duracion)
+        acumulado += duracion
+
+    resultado = resumir(duraciones)
+    resultado["consultas"] = presupuesto.consultas
+    return resultado
\ No newline at end of file
@@ -0,0 +1,86 @@
+"""
+Valores de ejemplo para las pruebas, leídos de la base de datos
+
+Se eligen con consultas deterministas (el periodo con más clases, el profesor con más
+clases en ese periodo, ...) en lugar de tomarlos del generador, así que también sirven
+con una base de datos que ya tenía datos.
+"""
+from datetime import timedelta
+from typing import Any, Dict
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.AsignacionAula import AsignacionAula
+from app.models.AsignacionSinodal import AsignacionSinodal
+from app.models.Carrera import Carrera
+from app.models.GrupoEscolar import GrupoEscolar
+from app.models.GrupoExamen import GrupoExamen
+from app.models.HorarioClase import HorarioClase
+from app.models.Materia import Materia
+from app.models.PermisoSinodal import PermisoSinodal
+from app.models.SolicitudExamen import SolicitudExamen
+from app.models.Usuario import Usuario
+from app.models.VentanaAplicacion import VentanaAplicacion
+
+
+class SinDatosError(RuntimeError):
+    pass
+
+
+def _mas_frecuente(db: Session, columna, *condiciones) -> Any:
+    """
+    Valor de `columna` con más filas (el menor, en caso de empate)
+    """
+    consulta = select(columna).where(columna.is_not(None), *condiciones).group_by(columna)
+    return db.execute(consulta.order_by(func.count().desc(), columna).limit(1)).scalar()
+
+
+def _primero(db: Session, columna, *condiciones) -> Any:
+    return db.execute(select(columna).where(*condiciones).order_by(columna).limit(1)).scalar()
+
+
+def elegir(db: Session) -> Dict[str, Any]:
+    """
+    Un valor por cada parámetro que usan los repositorios y los endpoints
+    """
+    id_periodo = _mas_frecuente(db, HorarioClase.id_periodo)
+    if id_periodo is None:
+        raise SinDatosError("La base de datos no tiene horarios de clase; generar los datos primero")
+    en_periodo = HorarioClase.id_periodo == id_periodo
+    id_profesor = _mas_frecuente(db, HorarioClase.id_profesor, en_periodo)
+    id_horario = _mas_frecuente(db, GrupoExamen.id_horario)
+    solicitud = db.execute(
+        select(SolicitudExamen.fecha_examen, SolicitudExamen.id_evaluacion, SolicitudExamen.id_materia)
+        .where(SolicitudExamen.id_horario == id_horario)
+    ).one()
+    id_carrera = _mas_frecuente(db, GrupoEscolar.id_carrera)
+    id_usuario = _primero(db, Usuario.id_usuario, Usuario.id_carrera == id_carrera) or _primero(db, Usuario.id_usuario)
+    id_materia = _mas_frecuente(db, PermisoSinodal.id_materia)
+    return {
+        "id_periodo": id_periodo,
+        "id_profesor": id_profesor,
+        "id_grupo": _mas_frecuente(db, HorarioClase.id_grupo, en_periodo),
+        "id_aula": _mas_frecuente(db, HorarioClase.id_aula, en_periodo),
+        "id_horario_clase": _primero(db, HorarioClase.id_horario_clase, HorarioClase.id_profesor == id_profesor),
+        "id_materia": id_materia,
+        "nombre_materia": _primero(db, Materia.nombre_materia, Materia.id_materia == id_materia),
+        "id_carrera": id_carrera,
+        "nombre_carrera": _primero(db, Carrera.nombre_carrera, Carrera.id_carrera == id_carrera),
+        "id_horario": id_horario,
+        "fecha": solicitud.fecha_examen,
+        # La semana (lunes a domingo) de ese examen, para agendas y búsquedas por rango
+        "desde": solicitud.fecha_examen - timedelta(days=solicitud.fecha_examen.weekday()),
+        "hasta": solicitud.fecha_examen + timedelta(days=6 - solicitud.fecha_examen.weekday()),
+        "id_evaluacion": solicitud.id_evaluacion,
+        "id_ventana": _primero(db, VentanaAplicacion.id_ventana, VentanaAplicacion.id_periodo == id_periodo),
+        "id_regla": _primero(db, PermisoSinodal.id_regla, PermisoSinodal.id_profesor == id_profesor)
+                    or _primero(db, PermisoSinodal.id_regla),
+        "id_examen_grupo": _primero(db, GrupoExamen.id_examen_grupo, GrupoExamen.id_horario == id_horario),
+        "id_examen_aula": _primero(db, AsignacionAula.id_examen_aula),
+        "id_examen_sinodal": _primero(db, AsignacionSinodal.id_examen_sinodal),
+        "id_usuario": id_usuario,
+        "nombre_usuario": _primero(db, Usuario.nombre_usuario, Usuario.id_usuario == id_usuario),
+        "rol": _primero(db, Usuario.rol, Usuario.id_usuario == id_usuario),
+        "capacidad_minima": 40,
+    }
\ No newline at end of file
@@ -0,0 +1,344 @@
+"""
+Microbenchmarks de los métodos de los repositorios
+
+Los métodos se descubren recorriendo app.repositories, así que un método nuevo entra solo a
+la suite; sus argumentos se resuelven por nombre con los valores de benchmarks.muestras.
+Los métodos heredados de BaseRepository se miden una vez, sobre HorarioRepository (la tabla
+más grande). Las escrituras corren dentro de una transacción que se revierte al terminar
+(cada commit del repositorio solo libera un SAVEPOINT), así que no alteran los datos.
+Lo que no se puede medir queda en `omitidos` con el motivo.
+"""
+import importlib
+import inspect
+import itertools
+import pkgutil
+from datetime import datetime, time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import inspect as inspeccionar, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+import app.repositories
+from app.models.AsignacionAula import AsignacionAula
+from app.models.AsignacionSinodal import AsignacionSinodal
+from app.models.GrupoExamen import GrupoExamen
+from app.models.HorarioClase import HorarioClase
+from app.models.SolicitudExamen import SolicitudExamen
+from app.repositories.base_repository import BaseRepository
+from app.repositories.EstadisticaRepository import CONSULTAS, EstadisticaRepository
+from app.repositories.ExamenRepository import ExamenRepository
+from app.repositories.HorarioRepository import TABLA_IMPORTACION, HorarioRepository
+from app.repositories.SolicitudRepository import SolicitudRepository
+from app.repositories.UsuarioRepository import UsuarioRepository
+from app.schemas.EstadoSolicitudSchema import EstadoSolicitud
+from app.schemas.HorarioClaseSchema import HorarioClaseCreate, HorarioClaseUpdate
+
+from benchmarks.medicion import medir
+
+TAMANO_LOTE = 1000
+
+# Métodos que no van a la base de datos o que se miden a través de otro (paginar, con get_all)
+AUXILIARES = {"con_esquema", "consulta", "separar", "paginar", "llave"}
+
+# Parámetros que cambian de significado según el repositorio
+SOBRESCRITOS = {
+    "HorarioRepository": {"id_horario": "id_horario_clase"},
+    "CarreraRepository": {"nombre": "nombre_carrera"},
+    "MateriaRepository": {"nombre": "nombre_materia"},
+}
+
+# Un benchmark por variante, p. ej. EstadisticaRepository.consultar[solicitudes]
+VARIANTES = {
+    "EstadisticaRepository.consultar": [("nombre", nombre) for nombre in CONSULTAS],
+}
+
+SOLO_POSTGRESQL = {"EstadisticaRepository.crear_vistas", "EstadisticaRepository.refrescar_vistas"}
+
+
+class Omitido(Exception):
+    pass
+
+
+def clases_repositorio() -> List[type]:
+    clases = []
+    for modulo in pkgutil.iter_modules(app.repositories.__path__):
+        modulo = importlib.import_module(f"app.repositories.{modulo.name}")
+        for nombre, clase in vars(modulo).items():
+            if inspect.isclass(clase) and nombre.endswith("Repository") and clase.__module__ == modulo.__name__:
+                clases.append(clase)
+    return sorted(clases, key=lambda clase: clase.__name__)
+
+
+def _metodos(clase: type) -> List[str]:
+    return sorted(
+        nombre for nombre, valor in vars(clase).items()
+        if inspect.isfunction(valor) and not nombre.startswith("_") and nombre not in AUXILIARES
+    )
+
+
+def _instancia(clase: type, db: Session) -> Any:
+    if clase is BaseRepository:
+        return HorarioRepository(db)
+    return clase(db)
+
+
+def _consumir(resultado: Any) -> Any:
+    if inspect.isgenerator(resultado):
+        return sum(1 for _ in resultado)
+    return resultado
+
+
+class Contexto:
+    """
+    Valores por nombre de parámetro para un repositorio (los de modelo se leen una sola vez)
+    """
+
+    def __init__(self, db: Session, muestras: Dict[str, Any]):
+        self.db = db
+        self.muestras = dict(muestras, estado=EstadoSolicitud.APROBADO, username=muestras["id_usuario"])
+        self._por_modelo: Dict[type, Dict[str, Any]] = {}
+
+    def _del_modelo(self, modelo: type) -> Dict[str, Any]:
+        if modelo not in self._por_modelo:
+            llave = inspeccionar(modelo).primary_key[0]
+            tabla = modelo.__table__
+            filas = self.db.execute(select(tabla).order_by(llave).limit(TAMANO_LOTE)).mappings().all()
+            if not filas:
+                raise Omitido(f"{tabla.name} no tiene filas")
+            self._por_modelo[modelo] = {
+                "id": filas[0][llave.key],
+                "ids": [fila[llave.key] for fila in filas],
+                "filas": {i: dict(fila) for i, fila in enumerate(filas, 1)},
+                "columnas": [columna.key for columna in tabla.columns],
+            }
+        return self._por_modelo[modelo]
+
+    def argumentos(
+            self,
+            clase_medida: type,
+            repositorio: Any,
+            metodo: Callable,
+            fijos: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        renombres = SOBRESCRITOS.get(type(repositorio).__name__, {}) if clase_medida is not BaseRepository else {}
+        argumentos = dict(fijos)
+        for parametro in inspect.signature(metodo).parameters.values():
+            nombre = renombres.get(parametro.name, parametro.name)
+            if parametro.name in fijos:
+                continue
+            if nombre in self.muestras:
+                argumentos[parametro.name] = self.muestras[nombre]
+                continue
+            modelo = getattr(repositorio, "model", None)
+            if modelo is not None and nombre in ("id", "ids", "filas", "columnas"):
+                argumentos[parametro.name] = self._del_modelo(modelo)[nombre]
+            elif parametro.default is inspect.Parameter.empty:
+                raise Omitido(f"sin valor de ejemplo para el parámetro {parametro.name}")
+        return argumentos
+
+
+def _lecturas(engine: Engine, muestras: Dict[str, Any]) -> Iterator[Tuple[str, Optional[Callable], Any]]:
+    """
+    (nombre, función a medir, motivo de omisión) de cada método de lectura
+    """
+    db = Session(bind=engine)
+    contexto = Contexto(db, muestras)
+    try:
+        for clase in [BaseRepository] + [c for c in clases_repositorio() if c is not BaseRepository]:
+            if clase.__name__.startswith("Async"):
+                for nombre_metodo in _metodos(clase):
+                    yield f"{clase.__name__}.{nombre_metodo}", None, "asíncrono (DB_ASYNC); no se mide"
+                continue
+            repositorio = _instancia(clase, db)
+            for nombre_metodo in _metodos(clase):
+                nombre = f"{clase.__name__}.{nombre_metodo}"
+                if nombre_metodo in ESCRITURAS.get(clase.__name__, {}) or nombre in SOLO_POSTGRESQL:
+                    continue
+                metodo = getattr(repositorio, nombre_metodo)
+                for parametro, valor in VARIANTES.get(nombre, [(None, None)]):
+                    etiqueta = f"{nombre}[{valor}]" if parametro is not None else nombre
+                    try:
+                        argumentos = contexto.argumentos(
+                            clase, repositorio, metodo, {parametro: valor} if parametro is not None else {}
+                        )
+                    except Omitido as e:
+                        yield etiqueta, None, str(e)
+                        continue
+
+                    def llamar(_, metodo=metodo, argumentos=argumentos):
+                        # Una sesión limpia por llamada, como en una petición
+                        db.close()
+                        return _consumir(metodo(**argumentos))
+
+                    yield etiqueta, llamar, None
+    finally:
+        db.close()
+
+
+_secuencia = itertools.count(1)
+
+
+def _nuevo_id(prefijo: str) -> str:
+    return f"{prefijo}{next(_secuencia):08d}"
+
+
+def _fila_horario(base: Dict[str, Any]) -> Dict[str, Any]:
+    # Los repositorios no validan choques; basta con una fila cuyas llaves foráneas existan
+    return dict(base, id_horario_clase=_nuevo_id("BENCH"))
+
+
+def _escrituras_horarios(db: Session, muestras: Dict[str, Any]) -> Dict[str, Tuple[Callable, Callable]]:
+    repositorio = HorarioRepository(db)
+    base = dict(db.execute(
+        select(HorarioClase.__table__).where(HorarioClase.id_horario_clase == muestras["id_horario_clase"])
+    ).mappings().one())
+    ids = list(db.execute(
+        select(HorarioClase.id_horario_clase).order_by(HorarioClase.id_horario_clase).limit(TAMANO_LOTE)
+    ).scalars())
+    dias = itertools.cycle(range(1, 6))
+
+    def lote_nuevo() -> List[Dict[str, Any]]:
+        return [_fila_horario(base) for _ in range(TAMANO_LOTE)]
+
+    def insertado(cuantas: int) -> List[str]:
+        filas = [_fila_horario(base) for _ in range(cuantas)]
+        repositorio.create_many(filas)
+        return [fila["id_horario_clase"] for fila in filas]
+
+    def importacion() -> List[Dict[str, Any]]:
+        if db.get_bind().dialect.name == "postgresql":
+            # La tabla temporal se borra al confirmar; dentro del SAVEPOINT sigue viva
+            db.connection().exec_driver_sql(f"DROP TABLE IF EXISTS {TABLA_IMPORTACION}")
+        return lote_nuevo()
+
+    return {
+        "create": (lambda obj: repositorio.create(obj),
+                   lambda: HorarioClaseCreate(**_fila_horario(base))),
+        "update": (lambda obj: repositorio.update(muestras["id_horario_clase"], obj),
+                   lambda: HorarioClaseUpdate(dia_semana=next(dias))),
+        "delete": (lambda id: repositorio.delete(id), lambda: insertado(1)[0]),
+        "create_many": (repositorio.create_many, lote_nuevo),
+        "update_many": (repositorio.update_many,
+                        lambda: [{"id_horario_clase": id, "dia_semana": next(dias)} for id in ids]),
+        "delete_many": (repositorio.delete_many, lambda: insertado(TAMANO_LOTE)),
+        "importar": (lambda filas: repositorio.importar(filas, set()), importacion),
+    }
+
+
+def _escrituras_solicitudes(db: Session, muestras: Dict[str, Any]) -> Dict[str, Tuple[Callable, Callable]]:
+    repositorio = SolicitudRepository(db)
+    ids = list(db.execute(
+        select(SolicitudExamen.id_horario).where(SolicitudExamen.id_periodo == muestras["id_periodo"])
+        .order_by(SolicitudExamen.id_horario).limit(TAMANO_LOTE)
+    ).scalars())
+    horas = itertools.cycle(range(8, 18))
+
+    def cambios() -> List[Dict[str, Any]]:
+        hora = next(horas)
+        return [{"id_horario": id, "hora_inicio": time(hora), "hora_fin": time(hora + 2)} for id in ids]
+
+    return {"update_horarios": (repositorio.update_horarios, cambios)}
+
+
+def _escrituras_examenes(db: Session, muestras: Dict[str, Any]) -> Dict[str, Tuple[Callable, Callable]]:
+    repositorio = ExamenRepository(db)
+    id_horario = muestras["id_horario"]
+    solicitud = dict(db.execute(
+        select(SolicitudExamen.__table__).where(SolicitudExamen.id_horario == id_horario)
+    ).mappings().one())
+    hijas = [
+        (modelo, [dict(fila) for fila in db.execute(
+            select(modelo.__table__).where(modelo.id_horario == id_horario)
+        ).mappings()])
+        for modelo in (GrupoExamen, AsignacionAula, AsignacionSinodal)
+    ]
+
+    def examen_nuevo() -> Tuple[Dict[str, Any], List[List[Dict[str, Any]]]]:
+        # Una copia del examen de ejemplo con ids nuevos
+        nuevo = _nuevo_id("BENCH")
+        filas = []
+        for modelo, originales in hijas:
+            llave = inspeccionar(modelo).primary_key[0].key
+            filas.append([dict(fila, **{llave: _nuevo_id("BENCH"), "id_horario": nuevo}) for fila in originales])
+        return dict(solicitud, id_horario=nuevo), filas
+
+    return {"create_completo": (lambda examen: repositorio.create_completo(examen[0], *examen[1]), examen_nuevo)}
+
+
+def _escrituras_usuarios(db: Session, muestras: Dict[str, Any]) -> Dict[str, Tuple[Callable, Callable]]:
+    repositorio = UsuarioRepository(db)
+    return {"update_last_login": (repositorio.update_last_login,
+                                  lambda: {muestras["id_usuario"]: datetime.utcnow()})}
+
+
+def _escrituras_estadisticas(db: Session, muestras: Dict[str, Any]) -> Dict[str, Tuple[Callable, Callable]]:
+    repositorio = EstadisticaRepository(db)
+    return {
+        "crear_vistas": (lambda _: repositorio.crear_vistas(), lambda: None),
+        "refrescar_vistas": (lambda _: repositorio.refrescar_vistas(), lambda: None),
+    }
+
+
+ESCRITURAS: Dict[str, Dict[str, Callable]] = {
+    "BaseRepository": dict.fromkeys(
+        ("create", "update", "delete", "create_many", "update_many", "delete_many"), _escrituras_horarios),
+    "HorarioRepository": {"importar": _escrituras_horarios},
+    "SolicitudRepository": {"update_horarios": _escrituras_solicitudes},
+    "ExamenRepository": {"create_completo": _escrituras_examenes},
+    "UsuarioRepository": {"update_last_login": _escrituras_usuarios},
+    "EstadisticaRepository": {"crear_vistas": _escrituras_estadisticas, "refrescar_vistas": _escrituras_estadisticas},
+}
+
+
+def _medir_escritura(engine: Engine, muestras: Dict[str, Any], clase: str, metodo: str, tiempo: float):
+    conexion = engine.connect()
+    transaccion = conexion.begin()
+    db = Session(bind=conexion, join_transaction_mode="create_savepoint")
+    try:
+        funcion, preparar = ESCRITURAS[clase][metodo](db, muestras)[metodo]
+        return medir(funcion, preparar, tiempo=tiempo)
+    finally:
+        db.close()
+        transaccion.rollback()
+        conexion.close()
+
+
+def ejecutar(
+        engine: Engine,
+        muestras: Dict[str, Any],
+        tiempo: float,
+        filtro: Callable[[str], bool] = lambda nombre: True,
+        avance: Callable[[str], None] = lambda nombre: None
+) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """
+    Mide todos los métodos; devuelve (resultados por método, omitidos con su motivo)
+    """
+    resultados: Dict[str, Any] = {}
+    omitidos: Dict[str, str] = {}
+    for nombre, funcion, motivo in _lecturas(engine, muestras):
+        if not filtro(nombre):
+            continue
+        if funcion is None:
+            omitidos[nombre] = motivo
+            continue
+        avance(nombre)
+        try:
+            resultados[nombre] = medir(funcion, tiempo=tiempo)
+        except Exception as e:
+            omitidos[nombre] = f"{type(e).__name__}: {e}".splitlines()[0]
+
+    for clase, metodos in ESCRITURAS.items():
+        for metodo in metodos:
+            nombre = f"{clase}.{metodo}"
+            if not filtro(nombre):
+                continue
+            if nombre in SOLO_POSTGRESQL and engine.dialect.name != "postgresql":
+                omitidos[nombre] = "solo en PostgreSQL"
+                continue
+            avance(nombre)
+            try:
+                resultados[nombre] = _medir_escritura(engine, muestras, clase, metodo, tiempo)
+            except Exception as e:
+                omitidos[nombre] = f"{type(e).__name__}: {e}".splitlines()[0]
+    return resultados, omitidos
\ No newline at end of file
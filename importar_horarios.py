@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Importa horarios de clase desde un CSV (las mismas columnas que GET /horarios/export)
+Es el mismo proceso que POST /api/v1/horarios/import, sin pasar por la API
+
+Uso: python importar_horarios.py archivo.csv [--parcial]
+"""
+import argparse
+import sys
+
+from app.database import SessionLocal
+from app.repositories.HorarioRepository import HorarioRepository
+from app.services.HorarioService import HorarioService
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Importa horarios de clase desde un CSV")
+    parser.add_argument("archivo", help="CSV con encabezado: id_horario_clase, id_periodo, id_materia, ...")
+    parser.add_argument("--parcial", action="store_true",
+                        help="Escribir solo las filas válidas en lugar de rechazar todo el archivo")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        with open(args.archivo, encoding="utf-8-sig", newline="") as archivo:
+            resultado = HorarioService(HorarioRepository(db)).importar_csv(archivo, parcial=args.parcial)
+    except (OSError, ValueError) as e:
+        print(f"✗ {e}", file=sys.stderr)
+        return 2
+    finally:
+        db.close()
+
+    for error in resultado.errores:
+        print(f"  línea {error.linea} ({error.id or 'sin id'}): {error.error}")
+    if resultado.fallidos > len(resultado.errores):
+        print(f"  ... y {resultado.fallidos - len(resultado.errores)} errores más")
+    estado = "✓ Importado" if resultado.aplicado else "✗ No se importó nada"
+    print(f"{estado}: {resultado.total} filas, {resultado.creados} creadas, "
+          f"{resultado.actualizados} actualizadas, {resultado.fallidos} con error")
+    return 0 if resultado.aplicado else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
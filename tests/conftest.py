@@ -0,0 +1,34 @@
+"""
+Base de datos SQLite en memoria para las pruebas
+Ejecuta: python -m pytest tests
+"""
+import os
+
+os.environ.setdefault("DB_HOST", "localhost")
+os.environ.setdefault("DB_USER", "prueba")
+os.environ.setdefault("DB_PASSWORD", "prueba")
+os.environ.setdefault("DB_NAME", "prueba")
+
+import importlib
+import pkgutil
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.models
+from app.database import Base
+
+for modulo in pkgutil.iter_modules(app.models.__path__):
+    importlib.import_module(f"app.models.{modulo.name}")
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    sesion = sessionmaker(bind=engine)()
+    yield sesion
+    sesion.close()
+    engine.dispose()
\ No newline at end of file
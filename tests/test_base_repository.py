@@ -0,0 +1,19 @@
+"""
+Pruebas de las escrituras de una fila de BaseRepository
+"""
+from app.models.Usuario import Usuario
+from app.repositories.UsuarioRepository import UsuarioRepository
+from app.schemas.UsuarioSchema import UsuarioUpdate
+
+
+def test_update_vacio_busca_por_la_llave_del_modelo(db):
+    # La llave de usuarios es id_usuario, no id_<tabla>
+    db.add(Usuario(id_usuario="admin", nombre_usuario="Admin", contraseña="x", rol="admin"))
+    db.commit()
+    repository = UsuarioRepository(db)
+
+    usuario = repository.update("admin", UsuarioUpdate())
+    assert usuario is not None
+    assert usuario.id_usuario == "admin"
+    assert usuario.nombre_usuario == "Admin"
+    assert repository.update("nope", UsuarioUpdate()) is None
\ No newline at end of file
@@ -0,0 +1,57 @@
+"""
+Pruebas del buffer de last_login
+"""
+from datetime import datetime
+
+import pytest
+
+from app.models.Usuario import Usuario
+from app.repositories.UsuarioRepository import UsuarioRepository
+from app.services.ultimo_login import BufferUltimoLogin
+
+
+@pytest.fixture(autouse=True)
+def usuarios(db):
+    db.add_all([
+        Usuario(id_usuario=id_usuario, nombre_usuario=id_usuario, contraseña="x", rol="admin")
+        for id_usuario in ("u1", "u2", "u3")
+    ])
+    db.commit()
+
+
+def _buffer(db) -> BufferUltimoLogin:
+    return BufferUltimoLogin(guardar=lambda lote: UsuarioRepository(db).update_last_login(lote))
+
+
+def test_vaciar_guarda_los_pendientes(db):
+    buffer = _buffer(db)
+    cuando = datetime(2024, 6, 3, 9, 30)
+    buffer.registrar("u1", cuando)
+    buffer.registrar("u2", cuando)
+
+    assert buffer.vaciar() == 2
+    assert buffer.pendientes() == 0
+    db.expire_all()
+    assert db.get(Usuario, "u1").last_login == cuando
+    assert db.get(Usuario, "u2").last_login == cuando
+    assert db.get(Usuario, "u3").last_login is None
+
+
+def test_usuario_borrado_antes_de_vaciar_no_detiene_el_lote(db):
+    buffer = _buffer(db)
+    cuando = datetime(2024, 6, 3, 9, 30)
+    for id_usuario in ("u1", "u2", "u3"):
+        buffer.registrar(id_usuario, cuando)
+    db.delete(db.get(Usuario, "u2"))
+    db.commit()
+
+    assert buffer.vaciar() == 3
+    assert buffer.pendientes() == 0
+    db.expire_all()
+    assert db.get(Usuario, "u1").last_login == cuando
+    assert db.get(Usuario, "u3").last_login == cuando
+
+    buffer.registrar("u1", datetime(2024, 6, 4, 8, 0))
+    assert buffer.vaciar() == 1
+    db.expire_all()
+    assert db.get(Usuario, "u1").last_login == datetime(2024, 6, 4, 8, 0)